@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Backup Store for GPT-Cursor Runner.
+
+Provides content-addressed, compressed file backups with a per-file version
+index, so patch backups are deduplicated, live in one directory and can be
+looked up by patch ID or time without scanning the working tree.
+"""
+
+import os
+import gzip
+import hashlib
+import sqlite3
+import tempfile
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+_EXTENSIONS = {CODEC_GZIP: ".gz", CODEC_ZSTD: ".zst"}
+
+
+def content_hash(data: bytes) -> str:
+    """Content address used for stored objects."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class BackupStore:
+    """Deduplicating backup store.
+
+    Layout under ``root``::
+
+        objects/ab/ab12...ef.zst   compressed file contents, named by blake2b hash
+        index.db                   SQLite: objects (with refcounts) and versions
+
+    Every backup adds a row to ``versions`` (target file, hash, time) linked
+    to the patch IDs it was taken for; identical content is stored once and
+    reference-counted. Pruning versions decrements refcounts and ``gc``
+    removes unreferenced objects.
+    """
+
+    def __init__(self, root: str = "data/backups", codec: Optional[str] = None):
+        self.root = root
+        self.codec = codec or (CODEC_ZSTD if zstandard else CODEC_GZIP)
+        if self.codec == CODEC_ZSTD and zstandard is None:
+            logger.warning("zstandard not installed; backup store using gzip")
+            self.codec = CODEC_GZIP
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.root, "index.db"), check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "hash TEXT PRIMARY KEY, codec TEXT, size INTEGER, stored_size INTEGER, "
+            "refcount INTEGER NOT NULL DEFAULT 0, created REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS versions ("
+            "version_id INTEGER PRIMARY KEY AUTOINCREMENT, target_file TEXT NOT NULL, "
+            "hash TEXT NOT NULL, created REAL NOT NULL, reason TEXT)"
+        )
+        # A batch backs a file up once for several patches
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS version_patches ("
+            "version_id INTEGER NOT NULL, patch_id TEXT NOT NULL, PRIMARY KEY (patch_id, version_id))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS versions_target ON versions(target_file, created)")
+        conn.execute("CREATE INDEX IF NOT EXISTS objects_unreferenced ON objects(refcount) WHERE refcount <= 0")
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _key(target_file: str) -> str:
+        return os.path.realpath(target_file)
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest + _EXTENSIONS[codec])
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(blob: bytes, codec: str) -> bytes:
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this backup")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    def _put_object(self, conn: sqlite3.Connection, data: bytes) -> str:
+        """Store content if new and take a reference to it."""
+        digest = content_hash(data)
+        row = conn.execute("SELECT codec FROM objects WHERE hash = ?", (digest,)).fetchone()
+        if row is None or not os.path.exists(self._object_path(digest, row["codec"])):
+            blob = self._compress(data)
+            path = self._object_path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            conn.execute(
+                "INSERT INTO objects (hash, codec, size, stored_size, refcount, created) "
+                "VALUES (?, ?, ?, ?, 0, ?) ON CONFLICT(hash) DO UPDATE SET "
+                "codec = excluded.codec, stored_size = excluded.stored_size",
+                (digest, self.codec, len(data), len(blob), time.time()),
+            )
+        conn.execute("UPDATE objects SET refcount = refcount + 1 WHERE hash = ?", (digest,))
+        return digest
+
+    def object_path(self, version: Dict[str, Any]) -> str:
+        """Path of the compressed object holding a version's content."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT codec FROM objects WHERE hash = ?", (version["hash"],)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown backup object: {version['hash']}")
+        return self._object_path(version["hash"], row["codec"])
+
+    def read(self, digest: str) -> bytes:
+        """Content of a stored object."""
+        with self._lock:
+            row = self._connect().execute("SELECT codec FROM objects WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown backup object: {digest}")
+        with open(self._object_path(digest, row["codec"]), "rb") as f:
+            return self._decompress(f.read(), row["codec"])
+
+    # ------------------------------------------------------------------
+    # Versions
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _version(row: sqlite3.Row) -> Dict[str, Any]:
+        version = dict(row)
+        version["timestamp"] = datetime.fromtimestamp(version["created"])
+        return version
+
+    def save(self, target_file: str, patch_ids: Optional[List[str]] = None,
+             reason: str = "patch") -> Dict[str, Any]:
+        """Back up the current content of ``target_file`` as a new version."""
+        with open(target_file, "rb") as f:
+            data = f.read()
+        with self._lock:
+            conn = self._connect()
+            try:
+                digest = self._put_object(conn, data)
+                cursor = conn.execute(
+                    "INSERT INTO versions (target_file, hash, created, reason) VALUES (?, ?, ?, ?)",
+                    (self._key(target_file), digest, time.time(), reason),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO version_patches (version_id, patch_id) VALUES (?, ?)",
+                    [(cursor.lastrowid, patch_id) for patch_id in (patch_ids or []) if patch_id],
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            row = conn.execute(
+                "SELECT v.*, o.size FROM versions v JOIN objects o ON o.hash = v.hash WHERE version_id = ?",
+                (cursor.lastrowid,),
+            ).fetchone()
+        return self._version(row)
+
+    def restore(self, version: Dict[str, Any], target_file: Optional[str] = None) -> str:
+        """Write a version's content back to its file (atomically); returns the path."""
+        target_file = target_file or version["target_file"]
+        data = self.read(version["hash"])
+        directory = os.path.dirname(os.path.abspath(target_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(target_file)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(target_file):
+                os.chmod(tmp_path, os.stat(target_file).st_mode & 0o7777)
+            os.replace(tmp_path, target_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return target_file
+
+    def _query(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT v.*, o.size FROM versions v JOIN objects o ON o.hash = v.hash " + sql, params
+            ).fetchall()
+        return [self._version(row) for row in rows]
+
+    def versions(self, target_file: str, limit: Optional[int] = None,
+                 reason: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Versions of a file, newest first."""
+        sql = "WHERE v.target_file = ?"
+        params: tuple = (self._key(target_file),)
+        if reason:
+            sql += " AND v.reason = ?"
+            params += (reason,)
+        sql += " ORDER BY v.created DESC, v.version_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return self._query(sql, params)
+
+    def latest(self, target_file: str, reason: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent version of a file."""
+        versions = self.versions(target_file, limit=1, reason=reason)
+        return versions[0] if versions else None
+
+    def find_by_patch(self, patch_id: str, target_file: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent version saved before ``patch_id`` was applied."""
+        sql = ("WHERE v.version_id IN (SELECT version_id FROM version_patches WHERE patch_id = ?) "
+               "AND v.reason = 'patch'")
+        params: tuple = (patch_id,)
+        if target_file:
+            sql += " AND v.target_file = ?"
+            params += (self._key(target_file),)
+        found = self._query(sql + " ORDER BY v.created DESC, v.version_id DESC LIMIT 1", params)
+        return found[0] if found else None
+
+    def patch_ids(self, version_id: int) -> List[str]:
+        """IDs of the patches a version was saved before (one batch shares a version)."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT patch_id FROM version_patches WHERE version_id = ? ORDER BY patch_id",
+                (version_id,),
+            ).fetchall()
+        return [row["patch_id"] for row in rows]
+
+    def closest(self, target_file: str, timestamp: datetime) -> Optional[Dict[str, Any]]:
+        """Version of a file closest in time to ``timestamp``."""
+        found = self._query(
+            "WHERE v.target_file = ? ORDER BY ABS(v.created - ?) LIMIT 1",
+            (self._key(target_file), timestamp.timestamp()),
+        )
+        return found[0] if found else None
+
+    def get(self, version_id: int) -> Optional[Dict[str, Any]]:
+        """Version by ID."""
+        found = self._query("WHERE v.version_id = ?", (version_id,))
+        return found[0] if found else None
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+    def prune(self, before: datetime, keep_latest: int = 1) -> int:
+        """Drop versions older than ``before``, keeping each file's newest ``keep_latest``."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT version_id, hash FROM ("
+                    "  SELECT version_id, hash, created, ROW_NUMBER() OVER ("
+                    "    PARTITION BY target_file ORDER BY created DESC, version_id DESC) AS rank"
+                    "  FROM versions"
+                    ") WHERE created < ? AND rank > ?",
+                    (before.timestamp(), keep_latest),
+                ).fetchall()
+                for row in rows:
+                    conn.execute("DELETE FROM versions WHERE version_id = ?", (row["version_id"],))
+                    conn.execute("DELETE FROM version_patches WHERE version_id = ?", (row["version_id"],))
+                    conn.execute("UPDATE objects SET refcount = refcount - 1 WHERE hash = ?", (row["hash"],))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return len(rows)
+
+    def gc(self) -> Dict[str, int]:
+        """Delete objects no version references; returns counts."""
+        result = {"objects_removed": 0, "bytes_freed": 0}
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT hash, codec, stored_size FROM objects WHERE refcount <= 0"
+            ).fetchall()
+            for row in rows:
+                try:
+                    os.remove(self._object_path(row["hash"], row["codec"]))
+                except FileNotFoundError:
+                    pass
+                conn.execute("DELETE FROM objects WHERE hash = ? AND refcount <= 0", (row["hash"],))
+                result["objects_removed"] += 1
+                result["bytes_freed"] += row["stored_size"] or 0
+            conn.commit()
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics."""
+        with self._lock:
+            conn = self._connect()
+            objects, logical, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM objects"
+            ).fetchone()
+            versions, files = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT target_file) FROM versions"
+            ).fetchone()
+        return {
+            "root": self.root,
+            "codec": self.codec,
+            "objects": objects,
+            "versions": versions,
+            "files": files,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+        }
+
+
+_backup_store: Optional[BackupStore] = None
+_backup_store_lock = threading.Lock()
+
+
+def get_backup_store() -> BackupStore:
+    """Get the global backup store (``BACKUP_STORE_DIR``, default ``data/backups``)."""
+    global _backup_store
+    with _backup_store_lock:
+        if _backup_store is None:
+            _backup_store = BackupStore(
+                os.getenv("BACKUP_STORE_DIR", "data/backups"),
+                codec=os.getenv("BACKUP_COMPRESSION") or None,
+            )
+        return _backup_store
@@ -16,6 +16,8 @@ from enum import Enum
 import logging
 import functools
 
+from .scheduler import get_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,6 +89,9 @@ class ErrorHandlerConfig:
 
 class ErrorHandler:
     """Comprehensive error handling system."""
+
+    # Seconds between stopping the service and starting it again
+    RESTART_DELAY = 2.0
     
     def __init__(self, config: ErrorHandlerConfig = None):
         self.config = config or ErrorHandlerConfig()
@@ -94,8 +99,6 @@ class ErrorHandler:
         self.error_handlers: Dict[ErrorType, List[Callable]] = {}
         self.recovery_strategies: Dict[ErrorType, RecoveryAction] = {}
         self._lock = threading.Lock()
-        self._cleanup_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         
         # Register default error handlers
         self._register_default_handlers()
@@ -127,30 +130,18 @@ class ErrorHandler:
         self.recovery_strategies[ErrorType.UNKNOWN] = RecoveryAction.ESCALATE
     
     def start(self):
-        """Start the error handler cleanup thread."""
-        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-            self._stop_event.clear()
-            self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-            self._cleanup_thread.start()
-            logger.info("Error handler started")
+        """Schedule error handler cleanup on the shared scheduler."""
+        get_scheduler().add_job("error_handler", self._cleanup_cycle, 3600)  # Run every hour
+        logger.info("Error handler started")
     
     def stop(self):
-        """Stop the error handler cleanup thread."""
-        self._stop_event.set()
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        """Remove error handler cleanup from the shared scheduler."""
+        if get_scheduler().remove_job("error_handler"):
             logger.info("Error handler stopped")
     
-    def _cleanup_loop(self):
-        """Background loop for error cleanup."""
-        while not self._stop_event.is_set():
-            try:
-                self._cleanup_old_errors()
-            except Exception as e:
-                logger.error(f"Error in error handler cleanup loop: {e}")
-            
-            # Wait before next cleanup cycle
-            self._stop_event.wait(3600)  # Run every hour
+    def _cleanup_cycle(self):
+        """Run one cycle of error cleanup."""
+        self._cleanup_old_errors()
     
     def _cleanup_old_errors(self):
         """Clean up old error records."""
@@ -344,9 +335,13 @@ class ErrorHandler:
         if self.config.exponential_backoff:
             delay *= (2 ** error_record.retry_count)
         
-        time.sleep(delay)
+        # Wait on the scheduler rather than in the caller's thread
+        get_scheduler().call_later(delay, lambda: self._retry_due(error_record),
+                                   name=f"retry_{error_record.error_id}")
+    
+    def _retry_due(self, error_record: ErrorRecord):
+        """Count a retry once its backoff has elapsed."""
         error_record.retry_count += 1
-        
         logger.info(f"Retrying operation for error {error_record.error_id} (attempt {error_record.retry_count})")
     
     def _fallback_operation(self, error_record: ErrorRecord):
@@ -358,7 +353,15 @@ class ErrorHandler:
         try:
             import subprocess
             subprocess.run(['pkill', '-f', 'python3.*main.py'])
-            time.sleep(2)
+            get_scheduler().call_later(self.RESTART_DELAY, lambda: self._start_service(error_record),
+                                       name=f"restart_{error_record.error_id}")
+        except Exception as e:
+            logger.error(f"Failed to restart service for error {error_record.error_id}: {e}")
+    
+    def _start_service(self, error_record: ErrorRecord):
+        """Second half of ``_restart_service``, run ``RESTART_DELAY`` seconds later."""
+        try:
+            import subprocess
             subprocess.Popen(['python3', '-m', 'gpt_cursor_runner.main'])
             logger.info(f"Restarted service for error {error_record.error_id}")
         except Exception as e:
@@ -465,11 +468,17 @@ class ErrorHandler:
 
 
 # Global error handler instance
-error_handler = ErrorHandler()
+_error_handler: Optional[ErrorHandler] = None
+_error_handler_lock = threading.Lock()
+
 
 def get_error_handler() -> ErrorHandler:
-    """Get the global error handler instance."""
-    return error_handler
+    """Get the global error handler instance, creating it on first use."""
+    global _error_handler
+    with _error_handler_lock:
+        if _error_handler is None:
+            _error_handler = ErrorHandler()
+        return _error_handler
 
 
 def handle_errors(func: Callable) -> Callable:
@@ -479,6 +488,6 @@ def handle_errors(func: Callable) -> Callable:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            error_handler.handle_error(e, context=f"{func.__module__}.{func.__name__}")
+            get_error_handler().handle_error(e, context=f"{func.__module__}.{func.__name__}")
             raise
     return wrapper 
\ No newline at end of file
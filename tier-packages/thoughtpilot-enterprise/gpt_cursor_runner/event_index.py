@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Event Index for GPT-Cursor Runner.
+
+Provides secondary indexes over the recent-event window so event queries
+cost time proportional to the number of matching events, plus cursor-based
+pagination for incremental polling.
+"""
+
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Tuple
+
+# Event fields that get a secondary index
+INDEXED_FIELDS = ("type", "event_type", "patch_id", "target_file")
+# Pseudo-field holding the hour bucket ("YYYY-MM-DDTHH") of each event
+TIME_BUCKET = "hour"
+
+
+def time_bucket(timestamp: str) -> str:
+    """Hour bucket key for an ISO timestamp."""
+    return (timestamp or "")[:13]
+
+
+class EventIndex:
+    """Secondary indexes over the most recent ``capacity`` events.
+
+    Each index maps a field value to a deque of event sequence numbers in
+    ascending order. Events leave the window oldest-first, so eviction only
+    ever pops from the left of each posting list.
+
+    The index is attached to an ``EventStore`` as a listener and is kept
+    current from the store's write path.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._events: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._by_id: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[Any, deque]] = {
+            field: {} for field in INDEXED_FIELDS + (TIME_BUCKET,)
+        }
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Store listener hooks
+    # ------------------------------------------------------------------
+    def on_append(self, event: Dict[str, Any]):
+        """Index a newly stored event."""
+        with self._lock:
+            self._add(event)
+
+    def on_reload(self, events: List[Dict[str, Any]]):
+        """Rebuild the index from the store's ring after open or compaction."""
+        with self._lock:
+            self._events.clear()
+            self._by_id.clear()
+            for index in self._indexes.values():
+                index.clear()
+            for event in events[-self.capacity:] if self.capacity else []:
+                self._add(event)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def _keys(self, event: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        keys = []
+        for field in INDEXED_FIELDS:
+            value = event.get(field)
+            if value is not None and value != "":
+                keys.append((field, value))
+        keys.append((TIME_BUCKET, time_bucket(event.get("timestamp", ""))))
+        return keys
+
+    def _add(self, event: Dict[str, Any]):
+        seq = event.get("seq")
+        if seq is None or seq in self._events:
+            return
+        self._events[seq] = event
+        if event.get("id"):
+            self._by_id[event["id"]] = seq
+        for field, value in self._keys(event):
+            self._indexes[field].setdefault(value, deque()).append(seq)
+        while len(self._events) > self.capacity:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        seq, event = self._events.popitem(last=False)
+        if self._by_id.get(event.get("id")) == seq:
+            del self._by_id[event["id"]]
+        for field, value in self._keys(event):
+            postings = self._indexes[field].get(value)
+            if postings and postings[0] == seq:
+                postings.popleft()
+                if not postings:
+                    del self._indexes[field][value]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _candidates(self, filters: Dict[str, Any], since: Optional[str]) -> Optional[List[deque]]:
+        """Posting lists to scan, or None to scan the whole window."""
+        smallest = None
+        for field, value in filters.items():
+            postings = self._indexes[field].get(value)
+            if not postings:
+                return []
+            if smallest is None or len(postings) < len(smallest):
+                smallest = postings
+
+        if since:
+            start = time_bucket(since)
+            buckets = [p for key, p in self._indexes[TIME_BUCKET].items() if key >= start]
+            if smallest is None or sum(len(p) for p in buckets) < len(smallest):
+                return buckets
+
+        return None if smallest is None else [smallest]
+
+    def _matches(self, event: Dict[str, Any], filters: Dict[str, Any], since: Optional[str]) -> bool:
+        if since and event.get("timestamp", "") < since:
+            return False
+        return all(event.get(field) == value for field, value in filters.items())
+
+    def query(self, limit: int = 50, after: Optional[str] = None,
+              since: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """Query events by indexed fields.
+
+        Without ``after`` the newest ``limit`` matches are returned. With
+        ``after=<event id>`` the oldest ``limit`` matches newer than that event
+        are returned, so a poller can walk forward page by page. Results are
+        always oldest first; ``next_cursor`` is the id to pass as ``after`` on
+        the next call.
+
+        A cursor the index doesn't hold (it fell out of the window, or came
+        from another store) can't be placed, so the newest ``limit`` matches
+        are returned instead with ``cursor_reset`` set; the caller should
+        replace what it has rather than append.
+        """
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Unindexed event fields: {', '.join(sorted(unknown))}")
+        filters = {k: v for k, v in filters.items() if v is not None and v != ""}
+
+        with self._lock:
+            cursor_reset = bool(after) and after not in self._by_id
+            if cursor_reset:
+                after = None
+            after_seq = self._by_id[after] if after else 0
+
+            candidates = self._candidates(filters, since)
+            sources = [self._events] if candidates is None else candidates
+
+            # Walk newest-first; time buckets are disjoint and in time order,
+            # so walking them in reverse keeps the overall order.
+            matched: List[int] = []
+            for postings in reversed(sources):
+                for seq in reversed(postings):
+                    if seq <= after_seq or (not after and len(matched) >= limit):
+                        break
+                    if self._matches(self._events[seq], filters, since):
+                        matched.append(seq)
+
+            matched.sort()
+            if limit <= 0:
+                page = []
+            elif after:
+                page = matched[:limit]
+            else:
+                page = matched[-limit:]
+            events = [self._events[seq] for seq in page]
+
+        next_cursor = events[-1].get("id") if events else after
+        return {
+            "events": events,
+            "count": len(events),
+            "next_cursor": next_cursor,
+            "cursor_reset": cursor_reset,
+        }
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """Number of windowed events per value of an indexed field."""
+        with self._lock:
+            return {value: len(postings) for value, postings in self._indexes[field].items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size statistics."""
+        with self._lock:
+            return {
+                "window_events": len(self._events),
+                "capacity": self.capacity,
+                "index_keys": {field: len(index) for field, index in self._indexes.items()},
+            }
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Forwarding Client for GPT-Cursor Runner.
+
+Provides a pooled, keep-alive HTTP client for forwarding patches to the local
+Ghost Runner, with jittered exponential backoff and a per-URL circuit
+breaker.
+"""
+
+import os
+import random
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is short-circuited by an open breaker."""
+
+
+@dataclass
+class ForwardingConfig:
+    """Configuration for the forwarding client."""
+    pool_size: int = 10
+    timeout: float = 5.0
+    retries: int = 2
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "ForwardingConfig":
+        return cls(
+            pool_size=int(os.getenv("FORWARD_POOL_SIZE", cls.pool_size)),
+            timeout=float(os.getenv("FORWARD_TIMEOUT", cls.timeout)),
+            retries=int(os.getenv("FORWARD_RETRIES", cls.retries)),
+            backoff_base=float(os.getenv("FORWARD_BACKOFF_BASE", cls.backoff_base)),
+            backoff_max=float(os.getenv("FORWARD_BACKOFF_MAX", cls.backoff_max)),
+            failure_threshold=int(os.getenv("FORWARD_CIRCUIT_THRESHOLD", cls.failure_threshold)),
+            reset_timeout=float(os.getenv("FORWARD_CIRCUIT_RESET", cls.reset_timeout)),
+        )
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    requests fail fast for ``reset_timeout`` seconds; then a single probe is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self.short_circuited = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CIRCUIT_HALF_OPEN
+            if self.state == CIRCUIT_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != CIRCUIT_OPEN:
+                    self.opens += 1
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == CIRCUIT_OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": round(retry_in, 1),
+            }
+
+
+class ForwardingClient:
+    """HTTP client with a shared connection pool and per-URL breakers."""
+
+    def __init__(self, config: ForwardingConfig = None):
+        self.config = config or ForwardingConfig()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.config.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapter = adapter
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "short_circuited": 0}
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        with self._lock:
+            if url not in self._breakers:
+                self._breakers[url] = CircuitBreaker(self.config.failure_threshold, self.config.reset_timeout)
+            return self._breakers[url]
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt."""
+        return random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * (2 ** attempt)))
+
+    def post(self, url: str, data: Any = None, headers: Optional[Dict[str, str]] = None,
+             retries: Optional[int] = None) -> requests.Response:
+        """POST with retries on connection errors and 5xx responses.
+
+        Returns the last response (which may be a 4xx/5xx); raises
+        ``CircuitOpenError`` when the breaker for ``url`` is open and the
+        last ``requests`` exception when every attempt failed to connect.
+        """
+        breaker = self.breaker(url)
+        retries = self.config.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                self._count("short_circuited")
+                raise CircuitOpenError(f"Circuit open for {url}")
+            self._count("requests")
+            if attempt:
+                self._count("retries")
+            try:
+                response = self.session.post(url, data=data, headers=headers, timeout=self.config.timeout)
+            except requests.RequestException as e:
+                breaker.record_failure()
+                logger.warning(f"POST {url} failed (attempt {attempt + 1}): {e}")
+                if attempt == retries:
+                    self._count("failed")
+                    raise
+            else:
+                if response.status_code < 500:
+                    # 4xx is the caller's problem, not the target's health
+                    breaker.record_success()
+                    self._count("succeeded" if response.ok else "failed")
+                    return response
+                breaker.record_failure()
+                logger.warning(f"POST {url} returned {response.status_code} (attempt {attempt + 1})")
+                if attempt == retries:
+                    self._count("failed")
+                    return response
+            time.sleep(self.backoff(attempt))
+        raise CircuitOpenError(f"Circuit open for {url}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        pools = {}
+        manager = self._adapter.poolmanager
+        for key in manager.pools.keys():
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            # The queue is pre-filled with None placeholders for unopened slots
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": idle,
+            }
+        with self._lock:
+            stats = dict(self._stats)
+            breakers = {url: breaker.get_stats() for url, breaker in self._breakers.items()}
+        return {
+            "requests": stats,
+            "pool": {"max_size": self.config.pool_size, "hosts": pools},
+            "circuits": breakers,
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_forwarding_client: Optional[ForwardingClient] = None
+_forwarding_client_lock = threading.Lock()
+
+
+def get_forwarding_client() -> ForwardingClient:
+    """Get the global forwarding client."""
+    global _forwarding_client
+    with _forwarding_client_lock:
+        if _forwarding_client is None:
+            _forwarding_client = ForwardingClient(ForwardingConfig.from_env())
+        return _forwarding_client
@@ -5,14 +5,15 @@ Health Aggregation Module for GHOST 2.0.
 Collects and aggregates health metrics from various system components.
 """
 
-import os
-import psutil
 import threading
 from datetime import datetime
 from typing import Dict, Optional, Any
 from dataclasses import dataclass, asdict
 import logging
 
+from .scheduler import get_scheduler
+from .metrics_sampler import get_metrics_sampler
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,78 +46,27 @@ class HealthAggregator:
         self.last_aggregation: Optional[datetime] = None
         self.aggregation_interval: int = 30  # seconds
         self._lock = threading.Lock()
-        self._stop_event = threading.Event()
-        self._aggregation_thread: Optional[threading.Thread] = None
         
     def start(self):
-        """Start the health aggregation background thread."""
-        if self._aggregation_thread is None or not self._aggregation_thread.is_alive():
-            self._stop_event.clear()
-            self._aggregation_thread = threading.Thread(target=self._aggregation_loop, daemon=True)
-            self._aggregation_thread.start()
-            logger.info("Health aggregator started")
+        """Schedule health aggregation on the shared scheduler."""
+        get_scheduler().add_job("health_aggregator", self._aggregation_cycle, self.aggregation_interval)
+        logger.info("Health aggregator started")
     
     def stop(self):
-        """Stop the health aggregation background thread."""
-        self._stop_event.set()
-        if self._aggregation_thread and self._aggregation_thread.is_alive():
-            self._aggregation_thread.join(timeout=5)
+        """Remove health aggregation from the shared scheduler."""
+        if get_scheduler().remove_job("health_aggregator"):
             logger.info("Health aggregator stopped")
     
-    def _aggregation_loop(self):
-        """Background loop for health aggregation."""
-        while not self._stop_event.is_set():
-            try:
-                self._collect_system_metrics()
-                self._aggregate_health()
-                self.last_aggregation = datetime.now()
-            except Exception as e:
-                logger.error(f"Error in health aggregation loop: {e}")
-            
-            # Wait for next aggregation cycle
-            self._stop_event.wait(self.aggregation_interval)
+    def _aggregation_cycle(self):
+        """Run one cycle of health aggregation."""
+        self._collect_system_metrics()
+        self._aggregate_health()
+        self.last_aggregation = datetime.now()
     
     def _collect_system_metrics(self):
-        """Collect system-level metrics."""
+        """Collect system-level metrics from the shared sampler."""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            
-            # Memory metrics
-            memory = psutil.virtual_memory()
-            
-            # Disk metrics
-            disk = psutil.disk_usage('/')
-            
-            # Network metrics
-            network = psutil.net_io_counters()
-            
-            self.system_metrics = {
-                'cpu': {
-                    'percent': cpu_percent,
-                    'count': cpu_count,
-                    'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else None
-                },
-                'memory': {
-                    'total': memory.total,
-                    'available': memory.available,
-                    'percent': memory.percent,
-                    'used': memory.used
-                },
-                'disk': {
-                    'total': disk.total,
-                    'used': disk.used,
-                    'free': disk.free,
-                    'percent': (disk.used / disk.total) * 100
-                },
-                'network': {
-                    'bytes_sent': network.bytes_sent,
-                    'bytes_recv': network.bytes_recv,
-                    'packets_sent': network.packets_sent,
-                    'packets_recv': network.packets_recv
-                }
-            }
+            self.system_metrics = get_metrics_sampler().get_snapshot().to_dict()
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
             self.system_metrics = {'error': str(e)}
@@ -188,8 +138,14 @@ class HealthAggregator:
         return result
 
 # Global health aggregator instance
-health_aggregator = HealthAggregator()
+_health_aggregator: Optional[HealthAggregator] = None
+_health_aggregator_lock = threading.Lock()
+
 
 def get_health_aggregator() -> HealthAggregator:
-    """Get the global health aggregator instance."""
-    return health_aggregator 
\ No newline at end of file
+    """Get the global health aggregator instance, creating it on first use."""
+    global _health_aggregator
+    with _health_aggregator_lock:
+        if _health_aggregator is None:
+            _health_aggregator = HealthAggregator()
+        return _health_aggregator
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Patch Outbox for GPT-Cursor Runner.
+
+Provides a durable SQLite outbox for patches accepted by the webhook and a
+background dispatcher that delivers them to the local Ghost Runner with
+retries, per-file ordering and dead-lettering.
+"""
+
+import os
+import json
+import random
+import sqlite3
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
+
+import requests
+
+from .forwarding_client import CircuitOpenError, get_forwarding_client
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_IN_FLIGHT = "in_flight"
+STATUS_DELIVERED = "delivered"
+STATUS_DEAD = "dead"
+
+_PUBLIC_COLUMNS = (
+    "id", "patch_id", "target_file", "filepath", "status", "attempts",
+    "next_attempt", "last_error", "created", "updated", "delivered_at",
+)
+
+
+class PatchOutbox:
+    """SQLite outbox of patches waiting to be delivered.
+
+    Entries for the same target file are delivered strictly in the order they
+    were accepted: only the oldest undelivered entry of each file is ever
+    claimable. Dead-lettered entries no longer hold back later ones.
+    """
+
+    def __init__(self, db_path: str = "data/outbox.db"):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, patch_id TEXT NOT NULL, target_file TEXT, "
+            "filepath TEXT, payload BLOB NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL, last_error TEXT, "
+            "created REAL NOT NULL, updated REAL NOT NULL, delivered_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS outbox_patch ON outbox(patch_id, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS outbox_file ON outbox(target_file, status, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS outbox_ready ON outbox(status, next_attempt)")
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> Dict[str, Any]:
+        record = {column: row[column] for column in _PUBLIC_COLUMNS}
+        for column in ("next_attempt", "created", "updated", "delivered_at"):
+            if record[column]:
+                record[column] = datetime.fromtimestamp(record[column]).isoformat()
+        return record
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def enqueue(self, patch_id: str, target_file: str, payload: bytes,
+                filepath: Optional[str] = None) -> Dict[str, Any]:
+        """Durably record a patch for delivery; returns the outbox record."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "INSERT INTO outbox (patch_id, target_file, filepath, payload, status, attempts, "
+                "next_attempt, created, updated) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (patch_id, target_file or "", filepath, payload, STATUS_PENDING, now, now, now),
+            )
+            conn.commit()
+            row = conn.execute("SELECT * FROM outbox WHERE id = ?", (cursor.lastrowid,)).fetchone()
+        return self._record(row)
+
+    def status(self, patch_id: str) -> Optional[Dict[str, Any]]:
+        """Delivery record of the most recent submission of a patch."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT * FROM outbox WHERE patch_id = ? ORDER BY id DESC LIMIT 1", (patch_id,)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    # ------------------------------------------------------------------
+    # Dispatcher side
+    # ------------------------------------------------------------------
+    def recover(self) -> int:
+        """Return entries left in flight by a previous process to pending."""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE outbox SET status = ?, updated = ? WHERE status = ?",
+                (STATUS_PENDING, time.time(), STATUS_IN_FLIGHT),
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def claim(self, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Mark up to ``limit`` deliverable entries in flight and return them."""
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT * FROM outbox o WHERE o.status = ? AND o.next_attempt <= ? AND o.id = ("
+                "  SELECT MIN(id) FROM outbox WHERE target_file = o.target_file AND status IN (?, ?)"
+                ") ORDER BY o.next_attempt, o.id LIMIT ?",
+                (STATUS_PENDING, now, STATUS_PENDING, STATUS_IN_FLIGHT, limit),
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE outbox SET status = ?, updated = ? WHERE id = ?",
+                    [(STATUS_IN_FLIGHT, now, row["id"]) for row in rows],
+                )
+                conn.commit()
+        claimed = []
+        for row in rows:
+            entry = dict(row)
+            entry["status"] = STATUS_IN_FLIGHT
+            claimed.append(entry)
+        return claimed
+
+    def next_due(self) -> Optional[float]:
+        """Earliest ``next_attempt`` among pending entries."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE status = ?", (STATUS_PENDING,)
+            ).fetchone()
+        return row[0]
+
+    def _update(self, entry_id: int, **fields):
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(f"UPDATE outbox SET {assignments} WHERE id = ?", (*fields.values(), entry_id))
+            conn.commit()
+
+    def mark_delivered(self, entry_id: int, attempts: int):
+        self._update(entry_id, status=STATUS_DELIVERED, attempts=attempts,
+                     delivered_at=time.time(), last_error=None)
+
+    def mark_retry(self, entry_id: int, attempts: int, error: str, next_attempt: float):
+        self._update(entry_id, status=STATUS_PENDING, attempts=attempts,
+                     last_error=error, next_attempt=next_attempt)
+
+    def mark_dead(self, entry_id: int, attempts: int, error: str):
+        self._update(entry_id, status=STATUS_DEAD, attempts=attempts, last_error=error)
+
+    def requeue(self, entry_id: int) -> bool:
+        """Give a dead-lettered entry a fresh set of attempts."""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt = ?, updated = ? "
+                "WHERE id = ? AND status = ?",
+                (STATUS_PENDING, time.time(), time.time(), entry_id, STATUS_DEAD),
+            )
+            conn.commit()
+        return cursor.rowcount > 0
+
+    def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT * FROM outbox WHERE status = ? ORDER BY id DESC LIMIT ?", (STATUS_DEAD, limit)
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def purge_delivered(self, older_than_seconds: float) -> int:
+        """Delete delivered entries older than the given age."""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND delivered_at < ?",
+                (STATUS_DELIVERED, time.time() - older_than_seconds),
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+            oldest = conn.execute(
+                "SELECT MIN(created) FROM outbox WHERE status IN (?, ?)", (STATUS_PENDING, STATUS_IN_FLIGHT)
+            ).fetchone()[0]
+        return {
+            "counts": {status: counts.get(status, 0)
+                       for status in (STATUS_PENDING, STATUS_IN_FLIGHT, STATUS_DELIVERED, STATUS_DEAD)},
+            "oldest_pending_age": round(max(0.0, time.time() - oldest), 1) if oldest else 0.0,
+        }
+
+
+class OutboxDispatcher:
+    """Background delivery of outbox entries to the Ghost Runner.
+
+    Failed deliveries are rescheduled with jittered exponential backoff
+    instead of sleeping in a request thread; after ``max_attempts`` (or on a
+    4xx response) an entry is dead-lettered. Entries for different files are
+    delivered concurrently by up to ``workers`` threads. When idle the
+    dispatcher re-checks the outbox every ``poll_interval`` seconds, which is
+    how it picks up entries enqueued by other processes.
+    """
+
+    def __init__(self, outbox: PatchOutbox, url: str, workers: int = 2, max_attempts: int = 8,
+                 backoff_base: float = 1.0, backoff_max: float = 300.0,
+                 delivered_retention: float = 7 * 24 * 3600, poll_interval: float = 30.0):
+        self.outbox = outbox
+        self.url = url
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.delivered_retention = delivered_retention
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.Semaphore(workers)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the dispatcher thread (idempotent)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            recovered = self.outbox.recover()
+            if recovered:
+                logger.info(f"Outbox recovered {recovered} in-flight entries")
+            self._stop_event.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="outbox-deliver")
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="outbox-dispatcher")
+            self._thread.start()
+            logger.info("Outbox dispatcher started")
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if self._executor:
+            self._executor.shutdown(wait=True)
+        self._thread = None
+        logger.info("Outbox dispatcher stopped")
+
+    def wake(self):
+        """Check for deliverable entries now."""
+        self._wake.set()
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def _loop(self):
+        last_purge = 0.0
+        while not self._stop_event.is_set():
+            try:
+                claimed = self._dispatch_ready()
+                if time.time() - last_purge > 3600:
+                    self.outbox.purge_delivered(self.delivered_retention)
+                    last_purge = time.time()
+                if claimed:
+                    continue
+                due = self.outbox.next_due()
+                wait = self.poll_interval if due is None else min(self.poll_interval, max(0.05, due - time.time()))
+            except Exception as e:
+                logger.error(f"Outbox dispatcher error: {e}")
+                wait = 5.0
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def _dispatch_ready(self) -> int:
+        free = 0
+        while self._slots.acquire(blocking=False):
+            free += 1
+        if not free:
+            # All workers busy; a finishing delivery wakes the loop
+            return 0
+        entries = self.outbox.claim(free)
+        for _ in range(free - len(entries)):
+            self._slots.release()
+        for entry in entries:
+            self._executor.submit(self._deliver_and_release, entry)
+        return len(entries)
+
+    def _deliver_and_release(self, entry: Dict[str, Any]):
+        try:
+            self.deliver(entry)
+        except Exception as e:
+            logger.error(f"Outbox delivery of {entry.get('patch_id')} crashed: {e}")
+            self.outbox.mark_retry(entry["id"], entry["attempts"] + 1, str(e), self._next_attempt(entry["attempts"]))
+        finally:
+            self._slots.release()
+            self._wake.set()
+
+    def _next_attempt(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+        return time.time() + random.uniform(delay / 2, delay)
+
+    def deliver(self, entry: Dict[str, Any]):
+        """Attempt one delivery and record its outcome."""
+        attempts = entry["attempts"] + 1
+        try:
+            response = get_forwarding_client().post(
+                self.url,
+                data=entry["payload"],
+                headers={"Content-Type": "application/json"},
+                retries=0,
+            )
+        except CircuitOpenError as e:
+            # Not attempted: wait for the breaker without spending an attempt
+            breaker = get_forwarding_client().breaker(self.url).get_stats()
+            self.outbox.mark_retry(entry["id"], entry["attempts"], str(e),
+                                   time.time() + max(1.0, breaker["retry_in_seconds"]))
+            return
+        except requests.RequestException as e:
+            self._failed(entry, attempts, f"Connection error: {e}")
+            return
+
+        if response.ok:
+            self.outbox.mark_delivered(entry["id"], attempts)
+            logger.info(f"Delivered {entry['patch_id']} to local runner (attempt {attempts})")
+            _log_delivery_event("outbox_delivered", entry, attempts)
+        elif response.status_code < 500:
+            error = f"Rejected with {response.status_code}: {response.text[:500]}"
+            self.outbox.mark_dead(entry["id"], attempts, error)
+            _log_delivery_event("outbox_dead_letter", entry, attempts, error)
+        else:
+            self._failed(entry, attempts, f"HTTP {response.status_code}: {response.text[:500]}")
+
+    def _failed(self, entry: Dict[str, Any], attempts: int, error: str):
+        if attempts >= self.max_attempts:
+            self.outbox.mark_dead(entry["id"], attempts, error)
+            _log_delivery_event("outbox_dead_letter", entry, attempts, error)
+        else:
+            self.outbox.mark_retry(entry["id"], attempts, error, self._next_attempt(attempts))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.outbox.get_stats(), running=self.is_running(), url=self.url,
+                    workers=self.workers, max_attempts=self.max_attempts)
+
+
+def _log_delivery_event(event_type: str, entry: Dict[str, Any], attempts: int, error: str = ""):
+    try:
+        from .event_logger import event_logger
+        event_logger.log_system_event(
+            event_type,
+            {"patch_id": entry["patch_id"], "target_file": entry["target_file"],
+             "attempts": attempts, "error": error},
+        )
+    except Exception:
+        pass
+
+
+_outbox: Optional[PatchOutbox] = None
+_dispatcher: Optional[OutboxDispatcher] = None
+_outbox_lock = threading.Lock()
+_local_dispatch = True
+
+
+def get_patch_outbox() -> PatchOutbox:
+    """Get the global outbox (``OUTBOX_DB``, default ``data/outbox.db``)."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = PatchOutbox(os.getenv("OUTBOX_DB", "data/outbox.db"))
+        return _outbox
+
+
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    """Get the global dispatcher (not started)."""
+    global _dispatcher
+    outbox = get_patch_outbox()
+    with _outbox_lock:
+        if _dispatcher is None:
+            _dispatcher = OutboxDispatcher(
+                outbox,
+                os.getenv("LOCAL_GHOST_URL", "http://localhost:5053/patch"),
+                workers=int(os.getenv("OUTBOX_WORKERS", "2")),
+                max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8")),
+                backoff_base=float(os.getenv("OUTBOX_BACKOFF_BASE", "1.0")),
+                backoff_max=float(os.getenv("OUTBOX_BACKOFF_MAX", "300")),
+                poll_interval=float(os.getenv("OUTBOX_POLL_INTERVAL", "30")),
+            )
+        return _dispatcher
+
+
+def set_local_dispatch(enabled: bool):
+    """Choose whether ``enqueue_patch`` starts a dispatcher in this process.
+
+    Server workers that do not own delivery turn this off; their entries are
+    picked up by the owning process's dispatcher on its next poll.
+    """
+    global _local_dispatch
+    _local_dispatch = enabled
+
+
+def enqueue_patch(patch_id: str, target_file: str, payload: Union[bytes, Dict[str, Any]],
+                  filepath: Optional[str] = None) -> Dict[str, Any]:
+    """Commit a patch to the outbox and make sure a dispatcher will deliver it.
+
+    ``payload`` is sent to the runner as-is when given as bytes.
+    """
+    if not isinstance(payload, (bytes, bytearray)):
+        payload = json.dumps(payload).encode("utf-8")
+    record = get_patch_outbox().enqueue(patch_id, target_file, bytes(payload), filepath)
+    if _local_dispatch:
+        dispatcher = get_outbox_dispatcher()
+        dispatcher.start()
+        dispatcher.wake()
+    return record
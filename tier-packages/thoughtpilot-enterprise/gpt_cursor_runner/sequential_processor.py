@@ -5,16 +5,23 @@ Sequential Processor Module for GHOST 2.0.
 Handles ordered processing of requests with dependencies and workflow management.
 """
 
+import itertools
+import os
+import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable, Set
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import logging
 from queue import PriorityQueue, Empty
 import uuid
 
+from .scheduler import get_scheduler
+from .worker_pool import ElasticWorkerPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,16 +85,71 @@ class WorkflowDefinition:
     retry_policy: Dict[str, Any] = field(default_factory=dict)
 
 
+_FINISHED_STAGES = (ProcessingStage.COMPLETED, ProcessingStage.FAILED, ProcessingStage.CANCELLED)
+
+
+def _topological_order(steps: List[ProcessingStep]) -> Dict[str, int]:
+    """Position of each step in a dependency-respecting order (ties keep list order).
+    
+    Raises ValueError for unknown dependencies or dependency cycles.
+    """
+    steps_by_id = {step.step_id: step for step in steps}
+    for step in steps:
+        for dep_id in step.dependencies:
+            if dep_id not in steps_by_id:
+                raise ValueError(f"Step {step.step_id} depends on unknown step {dep_id}")
+    order: Dict[str, int] = {}
+    remaining = [step.step_id for step in steps]
+    while remaining:
+        ready = [step_id for step_id in remaining
+                 if all(dep_id in order for dep_id in steps_by_id[step_id].dependencies)]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(remaining)}")
+        for step_id in ready:
+            order[step_id] = len(order)
+        remaining = [step_id for step_id in remaining if step_id not in order]
+    return order
+
+
+class _WorkflowRun:
+    """Scheduling state of one request's step DAG, guarded by ``cond``."""
+    
+    def __init__(self, request: SequentialRequest, workflow: WorkflowDefinition, order: Dict[str, int]):
+        self.request = request
+        self.workflow = workflow
+        self.order = order
+        self.steps = {step.step_id: step for step in request.steps}
+        self.pending: Set[str] = set(self.steps)
+        # Dispatched steps, including those waiting out a retry backoff
+        self.in_flight: Set[str] = set()
+        self.deadline = time.monotonic() + workflow.timeout
+        self.finished = False
+        self.cond = threading.Condition()
+
+
 class SequentialProcessor:
     """Handles sequential processing of requests with dependencies."""
     
-    def __init__(self, max_workers: int = 2):
-        self.max_workers = max_workers
+    def __init__(self, min_workers: int = 1, max_workers: int = 8,
+                 worker_idle_timeout: float = 30.0, step_workers: int = 8):
+        self.step_workers = step_workers
+        # Runs the steps of all requests; request workers only coordinate
+        self._step_executor: Optional[ThreadPoolExecutor] = None
         self.workflows: Dict[str, WorkflowDefinition] = {}
         self.active_requests: Dict[str, SequentialRequest] = {}
         self.completed_requests: Dict[str, SequentialRequest] = {}
+        # Entries are (priority, seq, request); seq keeps equal priorities FIFO
         self.request_queue: PriorityQueue = PriorityQueue()
-        self.workers: List[threading.Thread] = []
+        self._seq = itertools.count()
+        self.pool = ElasticWorkerPool(
+            "sequential-worker",
+            fetch=self._next_request,
+            process=self._run_request,
+            depth=self.request_queue.qsize,
+            min_workers=min_workers,
+            max_workers=max_workers,
+            idle_timeout=worker_idle_timeout
+        )
         self._stop_event = threading.Event()
         self._lock = threading.Lock()
         self._stats = {
@@ -112,7 +174,8 @@ class SequentialProcessor:
                     step_id="validate_request",
                     name="Validate Request",
                     handler=self._validate_webhook_request,
-                    timeout=10
+                    timeout=10,
+                    max_retries=0
                 ),
                 ProcessingStep(
                     step_id="log_request",
@@ -125,14 +188,15 @@ class SequentialProcessor:
                     step_id="process_webhook",
                     name="Process Webhook",
                     handler=self._process_webhook,
-                    dependencies=["validate_request", "log_request"],
+                    dependencies=["validate_request"],
                     timeout=60
                 ),
                 ProcessingStep(
                     step_id="update_metrics",
                     name="Update Metrics",
                     handler=self._update_webhook_metrics,
-                    dependencies=["process_webhook"],
+                    dependencies=["log_request", "process_webhook"],
+                    dependency_type=DependencyType.OPTIONAL,
                     timeout=5
                 )
             ],
@@ -149,7 +213,8 @@ class SequentialProcessor:
                     step_id="validate_patch",
                     name="Validate Patch",
                     handler=self._validate_patch,
-                    timeout=15
+                    timeout=15,
+                    max_retries=0
                 ),
                 ProcessingStep(
                     step_id="backup_current",
@@ -177,6 +242,7 @@ class SequentialProcessor:
                     name="Update Status",
                     handler=self._update_patch_status,
                     dependencies=["verify_patch"],
+                    dependency_type=DependencyType.OPTIONAL,
                     timeout=5
                 )
             ],
@@ -189,38 +255,48 @@ class SequentialProcessor:
     
     def start(self):
         """Start the sequential processor workers."""
-        if not self.workers:
-            self._stop_event.clear()
-            for i in range(self.max_workers):
-                worker = threading.Thread(target=self._worker_loop, daemon=True, name=f"sequential-worker-{i}")
-                worker.start()
-                self.workers.append(worker)
-            logger.info(f"Sequential processor started with {self.max_workers} workers")
+        self._stop_event.clear()
+        if self._step_executor is None:
+            self._step_executor = ThreadPoolExecutor(max_workers=self.step_workers,
+                                                     thread_name_prefix="sequential-step")
+        self.pool.start()
+        logger.info(f"Sequential processor started with {self.pool.min_workers}-{self.pool.max_workers} workers")
     
     def stop(self):
         """Stop the sequential processor workers."""
         self._stop_event.set()
-        for worker in self.workers:
-            if worker.is_alive():
-                worker.join(timeout=5)
-        self.workers.clear()
+        self.pool.stop()
+        if self._step_executor is not None:
+            self._step_executor.shutdown(wait=False, cancel_futures=True)
+            self._step_executor = None
         logger.info("Sequential processor stopped")
     
-    def _worker_loop(self):
-        """Worker thread loop for processing sequential requests."""
-        while not self._stop_event.is_set():
-            try:
-                # Get request from queue with timeout
-                priority, request = self.request_queue.get(timeout=1)
-                self._process_sequential_request(request)
-                self.request_queue.task_done()
-            except Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error in sequential worker loop: {e}")
+    def _next_request(self, timeout: float) -> Optional[SequentialRequest]:
+        """The next queued request, or None if none arrived within ``timeout``."""
+        try:
+            _, _, request = self.request_queue.get(timeout=timeout)
+            return request
+        except Empty:
+            return None
+    
+    def _run_request(self, request: SequentialRequest):
+        try:
+            self._process_sequential_request(request)
+        finally:
+            self.request_queue.task_done()
     
     def _process_sequential_request(self, request: SequentialRequest):
-        """Process a sequential request through its workflow."""
+        """Run a request's step DAG to completion.
+        
+        Steps run on the step executor as soon as their dependencies allow
+        (see ``_dependency_state``), lowest ``priority`` first among those
+        ready at once, so independent steps overlap. A step that fails is
+        retried after a backoff scheduled on the shared scheduler; one that
+        overruns its ``timeout`` fails without a retry, since its attempt
+        may still be running. The request fails if any step fails or is
+        cancelled, or if the workflow's ``timeout`` passes first.
+        """
+        run: Optional[_WorkflowRun] = None
         try:
             with self._lock:
                 request.status = ProcessingStage.VALIDATING
@@ -231,104 +307,235 @@ class SequentialProcessor:
             if not workflow:
                 raise ValueError(f"Unknown workflow: {request.workflow_name}")
             
-            # Process steps in order
-            for step in request.steps:
-                if self._stop_event.is_set():
-                    break
-                
-                # Check dependencies
-                if not self._check_dependencies(request, step):
-                    continue
-                
-                # Process step
-                self._process_step(request, step)
-                
-                # Update request status
-                with self._lock:
-                    request.results[step.step_id] = step.metadata.get('result')
+            run = _WorkflowRun(request, workflow, _topological_order(request.steps))
+            with self._lock:
+                request.status = ProcessingStage.PROCESSING
+            
+            with run.cond:
+                while True:
+                    if self._stop_event.is_set():
+                        self._abort_run(run, "Sequential processor stopped")
+                        break
+                    now = time.monotonic()
+                    if now >= run.deadline:
+                        self._abort_run(run, f"Workflow timed out after {workflow.timeout}s")
+                        break
+                    self._expire_steps(run, now)
+                    self._schedule_ready_steps(run)
+                    if not run.pending and not run.in_flight:
+                        break
+                    run.cond.wait(self._next_wakeup(run, now))
+                run.finished = True
             
-            # Mark as completed
+            failed = dict(request.errors)
             with self._lock:
-                request.status = ProcessingStage.COMPLETED
                 request.completed_at = datetime.now()
                 self.completed_requests[request.request_id] = request
-                del self.active_requests[request.request_id]
-                self._stats['completed_requests'] += 1
-                self._update_average_processing_time(request)
+                self.active_requests.pop(request.request_id, None)
+                if failed:
+                    request.status = (ProcessingStage.CANCELLED if self._stop_event.is_set()
+                                      else ProcessingStage.FAILED)
+                    self._stats['failed_requests'] += 1
+                else:
+                    request.status = ProcessingStage.COMPLETED
+                    self._stats['completed_requests'] += 1
+                    self._update_average_processing_time(request)
             
-            logger.info(f"Sequential request {request.request_id} completed")
+            if failed:
+                logger.error(f"Sequential request {request.request_id} failed: {failed}")
+            else:
+                logger.info(f"Sequential request {request.request_id} completed")
             
         except Exception as e:
+            if run is not None:
+                with run.cond:
+                    run.finished = True
             with self._lock:
                 request.status = ProcessingStage.FAILED
                 request.errors['workflow'] = str(e)
+                request.completed_at = datetime.now()
+                self.completed_requests[request.request_id] = request
+                self.active_requests.pop(request.request_id, None)
                 self._stats['failed_requests'] += 1
             logger.error(f"Sequential request {request.request_id} failed: {e}")
     
-    def _check_dependencies(self, request: SequentialRequest, step: ProcessingStep) -> bool:
-        """Check if step dependencies are satisfied."""
-        if not step.dependencies:
-            return True
-        
-        for dep_id in step.dependencies:
-            if dep_id not in request.results:
-                return False
+    def _dependency_state(self, run: '_WorkflowRun', step: ProcessingStep) -> str:
+        """Whether a pending step is 'ready', must 'wait', or is 'blocked' by its dependencies.
         
-        return True
+        REQUIRED steps run once every dependency completed and are blocked
+        if one failed or was cancelled. OPTIONAL steps run once every
+        dependency has finished, whatever the outcome. PARALLEL steps don't
+        wait for their dependencies at all.
+        """
+        if step.dependency_type == DependencyType.PARALLEL:
+            return 'ready'
+        statuses = [run.steps[dep_id].metadata.get('status') for dep_id in step.dependencies]
+        if step.dependency_type == DependencyType.REQUIRED:
+            if any(status in (ProcessingStage.FAILED, ProcessingStage.CANCELLED) for status in statuses):
+                return 'blocked'
+            return 'ready' if all(status == ProcessingStage.COMPLETED for status in statuses) else 'wait'
+        return 'ready' if all(status in _FINISHED_STAGES for status in statuses) else 'wait'
     
-    def _process_step(self, request: SequentialRequest, step: ProcessingStep):
-        """Process a single step."""
-        start_time = time.time()
-        
-        try:
-            # Update step status
+    def _schedule_ready_steps(self, run: '_WorkflowRun'):
+        """Cancel blocked steps and dispatch ready ones; call with ``run.cond`` held."""
+        progressed = True
+        while progressed:
+            progressed = False
+            ready = []
+            for step_id in list(run.pending):
+                step = run.steps[step_id]
+                state = self._dependency_state(run, step)
+                if state == 'blocked':
+                    failed = [dep_id for dep_id in step.dependencies
+                              if run.steps[dep_id].metadata.get('status') != ProcessingStage.COMPLETED]
+                    self._finish_step(run, step, ProcessingStage.CANCELLED,
+                                      error=f"Required dependency failed: {', '.join(failed)}")
+                    progressed = True
+                elif state == 'ready':
+                    ready.append(step)
+            for step in sorted(ready, key=lambda s: (s.priority, run.order[s.step_id])):
+                run.pending.discard(step.step_id)
+                run.in_flight.add(step.step_id)
+                self._dispatch_step(run, step)
+    
+    def _dispatch_step(self, run: '_WorkflowRun', step: ProcessingStep):
+        """Hand a step's next attempt to the step executor."""
+        with run.cond:
+            if run.finished or step.step_id not in run.in_flight:
+                return
+            attempt = step.metadata.get('attempts', 0) + 1
+            step.metadata['attempts'] = attempt
+            step.metadata['status'] = ProcessingStage.PENDING
+            step.metadata.pop('deadline', None)
+            executor = self._step_executor
+            try:
+                if executor is None:
+                    raise RuntimeError("Sequential processor stopped")
+                executor.submit(self._execute_step, run, step, attempt)
+            except RuntimeError as e:
+                self._finish_step(run, step, ProcessingStage.FAILED, error=str(e))
+    
+    def _execute_step(self, run: '_WorkflowRun', step: ProcessingStep, attempt: int):
+        """Run one attempt of a step on the step executor."""
+        request = run.request
+        with run.cond:
+            if run.finished or step.metadata.get('attempts') != attempt:
+                return
             step.metadata['status'] = ProcessingStage.PROCESSING
             step.metadata['started_at'] = datetime.now()
-            
-            # Execute step handler
-            result = step.handler(request.data, request.results)
-            
-            # Update step result
-            step.metadata['result'] = result
-            step.metadata['status'] = ProcessingStage.COMPLETED
-            step.metadata['processing_time'] = time.time() - start_time
-            
-            logger.info(f"Step {step.step_id} completed in {step.metadata['processing_time']:.2f}s")
-            
+            step.metadata['deadline'] = time.monotonic() + step.timeout
+            with self._lock:
+                results = dict(request.results)
+        
+        start_time = time.time()
+        error: Optional[Exception] = None
+        result = None
+        try:
+            result = step.handler(request.data, results)
+            if isinstance(result, dict) and result.get('status') == 'error':
+                raise RuntimeError(result.get('error') or "Step handler reported an error")
         except Exception as e:
-            step.metadata['status'] = ProcessingStage.FAILED
-            step.metadata['error'] = str(e)
-            step.metadata['processing_time'] = time.time() - start_time
-            
-            # Handle retries
-            if step.retry_count < step.max_retries:
+            error = e
+        processing_time = time.time() - start_time
+        
+        with run.cond:
+            if run.finished or step.metadata.get('attempts') != attempt \
+                    or step.metadata.get('status') != ProcessingStage.PROCESSING:
+                # Timed out or cancelled while running; this attempt no longer counts
+                return
+            step.metadata['processing_time'] = processing_time
+            if error is None:
+                self._finish_step(run, step, ProcessingStage.COMPLETED, result=result)
+                logger.info(f"Step {step.step_id} completed in {processing_time:.2f}s")
+            elif step.retry_count < step.max_retries:
                 step.retry_count += 1
-                logger.warning(f"Step {step.step_id} failed, retrying ({step.retry_count}/{step.max_retries})")
-                time.sleep(1)  # Brief delay before retry
-                self._process_step(request, step)  # Recursive retry
+                step.metadata['status'] = ProcessingStage.PENDING
+                step.metadata['error'] = str(error)
+                step.metadata.pop('deadline', None)
+                delay = self._retry_delay(run.workflow, step.retry_count)
+                logger.warning(f"Step {step.step_id} failed, retry {step.retry_count}/{step.max_retries} in {delay:.1f}s: {error}")
+                get_scheduler().call_later(delay, lambda: self._dispatch_step(run, step),
+                                           name=f"retry:{request.request_id}:{step.step_id}")
+            else:
+                logger.error(f"Step {step.step_id} failed after {step.retry_count} retries: {error}")
+                self._finish_step(run, step, ProcessingStage.FAILED, error=str(error))
+    
+    def _finish_step(self, run: '_WorkflowRun', step: ProcessingStep, status: ProcessingStage,
+                     result: Any = None, error: Optional[str] = None):
+        """Record a step's final outcome; call with ``run.cond`` held."""
+        step.metadata['status'] = status
+        step.metadata.pop('deadline', None)
+        run.pending.discard(step.step_id)
+        run.in_flight.discard(step.step_id)
+        with self._lock:
+            if status == ProcessingStage.COMPLETED:
+                step.metadata['result'] = result
+                run.request.results[step.step_id] = result
             else:
-                logger.error(f"Step {step.step_id} failed after {step.max_retries} retries: {e}")
-                raise
+                step.metadata['error'] = error
+                run.request.errors[step.step_id] = error
+        run.cond.notify_all()
+    
+    def _expire_steps(self, run: '_WorkflowRun', now: float):
+        """Fail running steps that overran their timeout; call with ``run.cond`` held."""
+        for step_id in list(run.in_flight):
+            step = run.steps[step_id]
+            deadline = step.metadata.get('deadline')
+            if deadline is not None and now >= deadline:
+                logger.error(f"Step {step_id} timed out after {step.timeout}s")
+                self._finish_step(run, step, ProcessingStage.FAILED,
+                                  error=f"Timed out after {step.timeout}s")
+    
+    def _abort_run(self, run: '_WorkflowRun', reason: str):
+        """Cancel every unfinished step of a run; call with ``run.cond`` held."""
+        for step_id in list(run.pending) + list(run.in_flight):
+            self._finish_step(run, run.steps[step_id], ProcessingStage.CANCELLED, error=reason)
+    
+    def _next_wakeup(self, run: '_WorkflowRun', now: float) -> float:
+        """Seconds until the earliest step or workflow deadline."""
+        deadlines = [run.deadline] + [run.steps[step_id].metadata['deadline'] for step_id in run.in_flight
+                                      if run.steps[step_id].metadata.get('deadline') is not None]
+        # Wake at least once a second to notice stop requests
+        return max(0.0, min(min(deadlines) - now, 1.0))
+    
+    def _retry_delay(self, workflow: WorkflowDefinition, attempt: int) -> float:
+        """Backoff before retry ``attempt`` of a step, from the workflow's ``retry_policy``."""
+        base = workflow.retry_policy.get('backoff_base', 1.0)
+        delay = min(workflow.retry_policy.get('backoff_max', 30.0), base * (2 ** (attempt - 1)))
+        return random.uniform(delay / 2, delay)
     
     def submit_request(self, workflow_name: str, data: Dict[str, Any], 
                       priority: int = 1) -> str:
-        """Submit a sequential processing request."""
+        """Submit a sequential processing request.
+        
+        Raises ValueError for an unknown or invalid workflow or a non-integer priority.
+        """
+        if isinstance(priority, bool):
+            raise ValueError("priority must be an integer")
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid priority: {priority!r}")
         request_id = f"{workflow_name}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
         
         workflow = self.workflows.get(workflow_name)
         if not workflow:
             raise ValueError(f"Unknown workflow: {workflow_name}")
         
+        _topological_order(workflow.steps)
+        
         request = SequentialRequest(
             request_id=request_id,
             workflow_name=workflow_name,
-            steps=workflow.steps.copy(),
+            # Each request tracks its own step state and retry counts
+            steps=[replace(step, retry_count=0, metadata={}) for step in workflow.steps],
             data=data,
             created_at=datetime.now()
         )
         
         try:
-            self.request_queue.put((priority, request), timeout=5)
+            self.request_queue.put((priority, next(self._seq), request), timeout=5)
+            self.pool.maybe_grow()
             with self._lock:
                 self._stats['total_requests'] += 1
             logger.info(f"Submitted sequential request {request_id} for workflow {workflow_name}")
@@ -356,7 +563,16 @@ class SequentialProcessor:
                 'started_at': request.started_at.isoformat() if request.started_at else None,
                 'completed_at': request.completed_at.isoformat() if request.completed_at else None,
                 'results': request.results,
-                'errors': request.errors
+                'errors': request.errors,
+                'steps': {
+                    step.step_id: {
+                        'status': step.metadata.get('status', ProcessingStage.PENDING).value,
+                        'attempts': step.metadata.get('attempts', 0),
+                        'processing_time': step.metadata.get('processing_time'),
+                        'error': step.metadata.get('error')
+                    }
+                    for step in request.steps
+                }
             }
     
     def get_stats(self) -> Dict[str, Any]:
@@ -366,7 +582,9 @@ class SequentialProcessor:
             stats['active_requests'] = len(self.active_requests)
             stats['completed_requests_count'] = len(self.completed_requests)
             stats['available_workflows'] = list(self.workflows.keys())
-            return stats
+        stats['queue_size'] = self.request_queue.qsize()
+        stats['worker_pool'] = self.pool.get_stats()
+        return stats
     
     def _update_average_processing_time(self, request: SequentialRequest):
         """Update average processing time."""
@@ -400,7 +618,8 @@ class SequentialProcessor:
     
     def _update_webhook_metrics(self, data: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
         """Update webhook processing metrics."""
-        return {"metrics_updated": True, "timestamp": datetime.now().isoformat()}
+        return {"metrics_updated": True, "processed": "process_webhook" in results,
+                "timestamp": datetime.now().isoformat()}
     
     def _validate_patch(self, data: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
         """Validate patch data."""
@@ -427,12 +646,30 @@ class SequentialProcessor:
     
     def _update_patch_status(self, data: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
         """Update patch status."""
-        return {"status_updated": True, "final_status": "completed"}
+        final_status = "completed" if "verify_patch" in results else "failed"
+        return {"status_updated": True, "final_status": final_status}
 
 
 # Global sequential processor instance
-sequential_processor = SequentialProcessor()
+_sequential_processor: Optional[SequentialProcessor] = None
+_sequential_processor_lock = threading.Lock()
+
 
 def get_sequential_processor() -> SequentialProcessor:
-    """Get the global sequential processor instance."""
-    return sequential_processor 
\ No newline at end of file
+    """Get the global sequential processor instance, creating it on first use.
+    
+    It runs ``SEQUENTIAL_WORKERS_MIN``-``SEQUENTIAL_WORKERS_MAX`` workers
+    (default 1-8); extra workers exit after ``SEQUENTIAL_WORKER_IDLE_TIMEOUT``
+    idle seconds (default 30). Steps run on ``SEQUENTIAL_STEP_WORKERS``
+    threads (default 8).
+    """
+    global _sequential_processor
+    with _sequential_processor_lock:
+        if _sequential_processor is None:
+            _sequential_processor = SequentialProcessor(
+                min_workers=int(os.getenv("SEQUENTIAL_WORKERS_MIN", "1")),
+                max_workers=int(os.getenv("SEQUENTIAL_WORKERS_MAX", "8")),
+                worker_idle_timeout=float(os.getenv("SEQUENTIAL_WORKER_IDLE_TIMEOUT", "30")),
+                step_workers=int(os.getenv("SEQUENTIAL_STEP_WORKERS", "8"))
+            )
+        return _sequential_processor
@@ -7,20 +7,16 @@ Handles incoming webhook requests from GPT and other sources.
 
 import os
 import json
+import time
 import datetime
 import traceback
-import requests
-import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from flask import request, jsonify
 
-# Import notification system
-try:
-    from .slack_proxy import create_slack_proxy
-    slack_proxy = create_slack_proxy()
-except ImportError:
-    slack_proxy = None
+from .patch_outbox import enqueue_patch
+from .patch_catalog import get_patch_catalog
+from .structured_logging import REQUEST_LOGGER, get_request_logging
 
 # Import event logger
 try:
@@ -28,40 +24,8 @@ try:
 except ImportError:
     event_logger = None  # type: ignore
 
-# Forwarding configuration
-LOCAL_GHOST_URL = os.getenv("LOCAL_GHOST_URL", "http://localhost:5053/patch")
-RETRY_COUNT = 2
-
-
-def forward_to_local_runner(patch_path: str, patch_id: str) -> bool:
-    """Forward the saved patch JSON to the local Ghost Runner."""
-    try:
-        with open(patch_path, "rb") as f:
-            payload = f.read()
-        
-        for attempt in range(RETRY_COUNT + 1):
-            try:
-                r = requests.post(
-                    LOCAL_GHOST_URL, 
-                    headers={"Content-Type": "application/json"}, 
-                    data=payload, 
-                    timeout=5
-                )
-                if r.ok:
-                    print(f"[WEBHOOK] ✅ Forwarded {patch_id} to local runner (attempt {attempt + 1})")
-                    return True
-                else:
-                    print(f"[WEBHOOK] ⚠️  Local forward failed {r.status_code}: {r.text}")
-            except Exception as e:
-                print(f"[WEBHOOK] ⚠️  Local forward error (attempt {attempt + 1}): {e}")
-            
-            if attempt < RETRY_COUNT:
-                time.sleep(1)
-        
-        return False
-    except Exception as e:
-        print(f"[WEBHOOK] ❌ Forwarding setup error: {e}")
-        return False
+# Configured (JSON, sampled, queued) on first use by get_request_logging()
+logger = logging.getLogger(REQUEST_LOGGER)
 
 
 def get_patches_directory() -> str:
@@ -104,20 +68,26 @@ def validate_webhook_payload(payload: Dict[str, Any]) -> bool:
     return True
 
 
-def process_hybrid_block(block_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a GPT hybrid block and save it as a patch."""
+def process_hybrid_block(block_data: Dict[str, Any], raw_body: Optional[bytes] = None) -> Dict[str, Any]:
+    """Process a GPT hybrid block and save it as a patch.
+
+    ``raw_body`` is the request body ``block_data`` was parsed from; when
+    given, those exact bytes are saved and forwarded instead of
+    re-serializing the parsed block.
+    """
     try:
-        # Enhanced logging for all requests
-        print(f"[WEBHOOK] 🔍 Processing hybrid block at {datetime.datetime.utcnow()}")
-        print(f"[WEBHOOK] 📦 Payload: {json.dumps(block_data, indent=2)}")
-        
         # Validate required fields
         validate_webhook_payload(block_data)
         
         patch_id = block_data.get("id", "")
         target_file = block_data.get("target_file", "")
         
-        print(f"[WEBHOOK] ✅ Validation passed for patch_id: {patch_id}")
+        body = raw_body if raw_body is not None else json.dumps(block_data, indent=2).encode("utf-8")
+        logger.debug(
+            "Hybrid block validated",
+            extra={"route": "/webhook", "patch_id": patch_id, "target_file": target_file,
+                   "payload": get_request_logging().payload(body)},
+        )
         
         # Create timestamp and sanitize filename
         timestamp = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S")
@@ -128,16 +98,13 @@ def process_hybrid_block(block_data: Dict[str, Any]) -> Dict[str, Any]:
         patch_dir = get_patches_directory()
         full_path = os.path.join(patch_dir, filename)
         
-        print(f"[WEBHOOK] 📁 Saving to: {full_path}")
-        
         # Ensure directory exists
         os.makedirs(patch_dir, exist_ok=True)
         
         # Save the patch file
-        with open(full_path, "w") as f:
-            json.dump(block_data, f, indent=2)
-        
-        print(f"[WEBHOOK] ✅ Patch saved successfully to {full_path}")
+        with open(full_path, "wb") as f:
+            f.write(body)
+        get_patch_catalog(patch_dir).invalidate()
         
         # Log success to event logger if available
         if event_logger:
@@ -151,22 +118,25 @@ def process_hybrid_block(block_data: Dict[str, Any]) -> Dict[str, Any]:
                 }
             )
         
-        # Forward to local Ghost Runner
-        forwarded = forward_to_local_runner(full_path, patch_id)
+        # Commit to the outbox; the dispatcher forwards it to the Ghost Runner
+        delivery = enqueue_patch(patch_id, target_file, body, full_path)
         
-        print(f"[WEBHOOK] ✅ Processing completed successfully for {patch_id}")
+        logger.debug("Patch saved and queued", extra={"route": "/webhook", "patch_id": patch_id, "filepath": full_path})
         
         return {
             "success": True,
             "patch_id": patch_id,
             "filepath": full_path,
-            "message": f"Patch saved to {filename} and forwarded to Ghost Runner",
-            "forwarded": forwarded
+            "message": f"Patch saved to {filename} and queued for Ghost Runner",
+            "delivery": {
+                "status": delivery["status"],
+                "status_url": f"/api/patches/{patch_id}/delivery",
+            },
         }
         
     except ValueError as validation_error:
         error_msg = f"Validation error: {str(validation_error)}"
-        print(f"[WEBHOOK] ❌ {error_msg}")
+        logger.warning(error_msg, extra={"route": "/webhook", "patch_id": block_data.get("id")})
         if event_logger:
             event_logger.log_system_event(
                 "webhook_validation_error",
@@ -176,8 +146,7 @@ def process_hybrid_block(block_data: Dict[str, Any]) -> Dict[str, Any]:
         
     except Exception as e:
         error_msg = f"Processing error: {str(e)}"
-        print(f"[WEBHOOK] ❌ {error_msg}")
-        print(f"[WEBHOOK] 🔍 Traceback: {traceback.format_exc()}")
+        logger.error(error_msg, exc_info=True, extra={"route": "/webhook", "patch_id": block_data.get("id")})
         
         if event_logger:
             event_logger.log_system_event(
@@ -194,18 +163,14 @@ def process_hybrid_block(block_data: Dict[str, Any]) -> Dict[str, Any]:
 def process_summary(summary_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process a summary and save it."""
     try:
-        print(f"[WEBHOOK] 📝 Processing summary at {datetime.datetime.utcnow()}")
-        print(f"[WEBHOOK] 📦 Summary data: {json.dumps(summary_data, indent=2)}")
-        
         # Validate summary data
         if not isinstance(summary_data, dict):
             raise ValueError("Summary data must be a dictionary")
         
         summary_id = summary_data.get("id", "unknown")
-        print(f"[WEBHOOK] ✅ Summary validation passed for: {summary_id}")
         
         # Save summary (implementation would go here)
-        print(f"[WEBHOOK] ✅ Summary processing completed for {summary_id}")
+        logger.info("Summary processed", extra={"route": "/api/summaries", "summary_id": summary_id})
         
         return {
             "success": True,
@@ -215,65 +180,54 @@ def process_summary(summary_data: Dict[str, Any]) -> Dict[str, Any]:
         
     except Exception as e:
         error_msg = f"Summary processing error: {str(e)}"
-        print(f"[WEBHOOK] ❌ {error_msg}")
-        print(f"[WEBHOOK] 🔍 Traceback: {traceback.format_exc()}")
+        logger.error(error_msg, exc_info=True, extra={"route": "/api/summaries"})
         raise
 
 
-def handle_webhook_post() -> tuple:
-    """Handle POST requests to the webhook endpoint with enhanced logging and error handling."""
+def process_webhook_request(
+    raw_body: bytes,
+    headers: Any,
+    remote_ip: Optional[str],
+    context: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], int, int, str]:
+    """Process a raw webhook body for the Flask and ASGI routes.
+
+    Returns (body, status, log level, log message). The payload excerpt and
+    patch ID are added to ``context`` so the caller's request log carries them.
+    """
+    request_log = get_request_logging()
+    if context is None:
+        context = {"route": "/webhook", "remote_ip": remote_ip}
+
     try:
-        # Log incoming request
-        print(f"[WEBHOOK] 🚀 POST request received at {datetime.datetime.utcnow()}")
-        print(f"[WEBHOOK] 📋 Headers: {dict(request.headers)}")
-        print(f"[WEBHOOK] 🌐 Remote IP: {request.remote_addr}")
-        user_agent = request.headers.get('User-Agent', 'Unknown')
-        print(f"[WEBHOOK] 👤 User Agent: {user_agent}")
-        
-        # Parse JSON payload
+        # Parse JSON payload, keeping the raw body for the patch file and forwarding
         try:
-            payload = request.get_json(force=True)
-            print("[WEBHOOK] 📦 Payload parsed successfully")
+            payload = json.loads(raw_body)
         except Exception as json_error:
             error_msg = f"JSON parsing error: {str(json_error)}"
-            print(f"[WEBHOOK] ❌ {error_msg}")
-            return jsonify({
-                "status": "error",
-                "message": error_msg
-            }), 400
-        
+            return {"status": "error", "message": error_msg}, 400, logging.WARNING, error_msg
+
+        context["payload"] = request_log.payload(raw_body)
+
         # Validate payload structure
         if not isinstance(payload, dict):
             error_msg = "Payload must be a JSON object"
-            print(f"[WEBHOOK] ❌ {error_msg}")
-            return jsonify({
-                "status": "error",
-                "message": error_msg
-            }), 400
-        
+            return {"status": "error", "message": error_msg}, 400, logging.WARNING, error_msg
+
+        context["patch_id"] = payload.get("id")
+
         # Process the payload
-        result = process_hybrid_block(payload)
-        
-        print("[WEBHOOK] ✅ Request processed successfully")
-        
-        return jsonify({
-            "status": "success",
-            "result": result
-        }), 200
-        
+        result = process_hybrid_block(payload, raw_body=raw_body)
+        return {"status": "accepted", "result": result}, 202, logging.INFO, "Webhook request handled"
+
     except ValueError as validation_error:
         error_msg = f"Validation error: {str(validation_error)}"
-        print(f"[WEBHOOK] ❌ {error_msg}")
-        return jsonify({
-            "status": "error",
-            "message": error_msg
-        }), 400
-        
+        return {"status": "error", "message": error_msg}, 400, logging.WARNING, error_msg
+
     except Exception as e:
         error_msg = f"Internal server error: {str(e)}"
-        print(f"[WEBHOOK] ❌ {error_msg}")
-        print(f"[WEBHOOK] 🔍 Full traceback: {traceback.format_exc()}")
-        
+        logger.error(error_msg, exc_info=True, extra=context)
+
         # Log to event logger if available
         if event_logger:
             event_logger.log_system_event(
@@ -281,12 +235,37 @@ def handle_webhook_post() -> tuple:
                 {
                     "error": error_msg,
                     "traceback": traceback.format_exc(),
-                    "headers": dict(request.headers),
-                    "remote_ip": request.remote_addr
+                    "headers": request_log.headers(headers),
+                    "remote_ip": remote_ip
                 }
             )
-        
-        return jsonify({
+
+        return {
             "status": "error",
             "message": "Internal server error occurred while processing request"
-        }), 500
\ No newline at end of file
+        }, 500, logging.ERROR, "Webhook request failed"
+
+
+def handle_webhook_post() -> tuple:
+    """Handle POST requests to the webhook endpoint with structured logging and error handling."""
+    started = time.perf_counter()
+    context = {
+        "route": "/webhook",
+        "remote_ip": request.remote_addr,
+        "user_agent": request.headers.get("User-Agent", "Unknown"),
+    }
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Webhook request received",
+            extra=dict(context, headers=get_request_logging().headers(request.headers)),
+        )
+
+    body, status, level, message = process_webhook_request(
+        request.get_data(cache=True), request.headers, request.remote_addr, context
+    )
+    logger.log(
+        level,
+        message,
+        extra=dict(context, status=status, duration_ms=round((time.perf_counter() - started) * 1000, 2)),
+    )
+    return jsonify(body), status
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Component Registry for GPT-Cursor Runner.
+
+Provides lazy construction and startup of the runner's subsystems. Each
+component is imported and built on first use, or started in order from the
+startup manifest, and the registry records how long each import, init and
+start took.
+"""
+
+import sys
+import time
+import importlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+
+
+@dataclass
+class ComponentSpec:
+    """How to build and run one subsystem."""
+    name: str
+    label: str
+    module: str
+    accessor: str
+    # Has start()/stop() methods
+    startable: bool = True
+    # Runs once per host (see server.py); others run in every process
+    host_wide: bool = False
+
+
+# Startup manifest, in start order
+STARTUP_MANIFEST = [
+    ComponentSpec("metrics_sampler", "📈 Metrics sampler", "metrics_sampler", "get_metrics_sampler"),
+    ComponentSpec("health_aggregator", "🏥 Health aggregator", "health_aggregator", "get_health_aggregator", host_wide=True),
+    ComponentSpec("resource_monitor", "📊 Resource monitor", "resource_monitor", "get_resource_monitor", host_wide=True),
+    ComponentSpec("process_cleanup", "🧹 Process cleanup", "process_cleanup", "get_process_cleanup", host_wide=True),
+    ComponentSpec("unified_processor", "⚙️  Unified processor", "unified_processor", "get_unified_processor"),
+    ComponentSpec("sequential_processor", "🔄 Sequential processor", "sequential_processor", "get_sequential_processor"),
+    ComponentSpec("outbox_dispatcher", "📮 Outbox dispatcher", "patch_outbox", "get_outbox_dispatcher", host_wide=True),
+    ComponentSpec("error_recovery", "🛠️  Error recovery", "error_recovery", "get_error_recovery", host_wide=True),
+    ComponentSpec("rate_limiter", "🚦 Rate limiter", "rate_limiter", "get_rate_limiter"),
+    ComponentSpec("request_validator", "✅ Request validator", "request_validator", "get_request_validator", startable=False),
+    ComponentSpec("audit_logger", "📝 Audit logger", "audit_logger", "get_audit_logger"),
+    ComponentSpec("server_fixes", "🔧 Server fixes", "server_fixes", "get_server_fixes", host_wide=True),
+    ComponentSpec("error_handler", "🚨 Error handler", "error_handler", "get_error_handler"),
+    ComponentSpec("health_endpoints", "🏥 Health endpoints", "health_endpoints", "get_health_endpoints", host_wide=True),
+    ComponentSpec("cors_manager", "🌐 CORS manager", "cors_config", "get_cors_manager"),
+]
+
+
+class ComponentRegistry:
+    """Builds components on demand and stops started ones in reverse order.
+
+    ``get`` constructs a component the first time it is asked for and, for
+    per-process components, starts it too; host-wide components are only
+    started through ``start`` / ``start_manifest`` so a request served by a
+    non-primary worker never spins up a second copy.
+    """
+
+    def __init__(self, specs: Optional[List[ComponentSpec]] = None, package: str = "gpt_cursor_runner"):
+        self.package = package
+        self.specs: Dict[str, ComponentSpec] = {}
+        self._instances: Dict[str, Any] = {}
+        self._started: List[str] = []
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.RLock()
+        for spec in specs or []:
+            self.register(spec)
+
+    def register(self, spec: ComponentSpec):
+        with self._lock:
+            self.specs[spec.name] = spec
+
+    def _timed(self, name: str, phase: str, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._timings.setdefault(name, {})[f"{phase}_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _build(self, spec: ComponentSpec) -> Any:
+        module_name = f"{self.package}.{spec.module}"
+        if module_name in sys.modules:
+            module = sys.modules[module_name]
+            self._timings.setdefault(spec.name, {})["import_ms"] = 0.0
+        else:
+            module = self._timed(spec.name, "import", importlib.import_module, module_name)
+        return self._timed(spec.name, "init", getattr(module, spec.accessor))
+
+    def get(self, name: str) -> Any:
+        """The component's instance, constructed (and started, if per-process) on first use."""
+        with self._lock:
+            if name not in self._instances:
+                spec = self.specs[name]
+                self._instances[name] = self._build(spec)
+                if spec.startable and not spec.host_wide:
+                    self._start(spec)
+            return self._instances[name]
+
+    def _start(self, spec: ComponentSpec):
+        if spec.name in self._started:
+            return
+        self._timed(spec.name, "start", self._instances[spec.name].start)
+        self._started.append(spec.name)
+
+    def start(self, name: str) -> Any:
+        """Construct and start a component."""
+        with self._lock:
+            spec = self.specs[name]
+            if name not in self._instances:
+                self._instances[name] = self._build(spec)
+            if spec.startable:
+                self._start(spec)
+            return self._instances[name]
+
+    def start_manifest(self, worker: bool = True, host_wide: bool = True):
+        """Start manifest components in order, reporting each one.
+
+        ``worker`` selects the per-process components and ``host_wide`` the
+        once-per-host ones.
+        """
+        for spec in list(self.specs.values()):
+            if not (host_wide if spec.host_wide else worker):
+                continue
+            action, done = ("start", "started") if spec.startable else ("initialize", "initialized")
+            try:
+                self.start(spec.name)
+                print(f"{spec.label} {done}")
+            except Exception as e:
+                print(f"⚠️  {spec.label.split(' ', 1)[1].strip()} failed to {action}: {e}")
+
+    def stop_all(self):
+        """Stop started components, last started first."""
+        while True:
+            with self._lock:
+                if not self._started:
+                    return
+                name = self._started.pop()
+                instance = self._instances[name]
+            try:
+                instance.stop()
+            except Exception as e:
+                print(f"⚠️  Error stopping {name}: {e}")
+
+    def get_profile(self) -> Dict[str, Any]:
+        """Per-component import/init/start timings in milliseconds."""
+        with self._lock:
+            components = {
+                name: dict(self._timings.get(name, {}), started=name in self._started)
+                for name in self.specs
+                if name in self._instances
+            }
+        total = sum(value for timing in components.values() for key, value in timing.items() if key.endswith("_ms"))
+        return {"components": components, "total_ms": round(total, 2)}
+
+
+_registry: Optional[ComponentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ComponentRegistry:
+    """Get the global component registry, loaded with the startup manifest."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ComponentRegistry(STARTUP_MANIFEST)
+        return _registry
+
+
+def get_component(name: str) -> Any:
+    """Shortcut for ``get_registry().get(name)``."""
+    return get_registry().get(name)
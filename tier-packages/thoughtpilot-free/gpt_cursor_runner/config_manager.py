@@ -1,77 +1,231 @@
-""""
-Configuration Manager for GPT-Cursor Runner."""
-Handles .patchrc configuration file and default settings."""
+"""
+Configuration Manager for GPT-Cursor Runner.
 
+Handles .patchrc configuration file and default settings.
+"""
+
+import os
+import copy
 import json
 from pathlib import Path
-from typing import Dict, Any"""
-class ConfigManager import ""Manages configuration settings from .patchrc file.""""
-    DEFAULT_CONFIG = {defaults"
-        {"
-            "auto_confirm" False,dry_run" True,"
-            "backup_files" in True,target_directory" "code",
-        },slack" import {"
-            "rate_limit_per_minute" 10,enable_notifications": True,"
+from typing import Dict, Any, Optional
+
+
+class ConfigManager:
+    """Manages configuration settings from .patchrc file."""
+
+    DEFAULT_CONFIG = {
+        "defaults": {
+            "auto_confirm": False,
+            "dry_run": True,
+            "backup_files": True,
+            "target_directory": "code",
+        },
+        "slack": {
+            "rate_limit_per_minute": 10,
+            "enable_notifications": True,
             "default_channel": "#general",
-        },patches": {"
-            "max_patches_per_day": 100,auto_apply_safe_patches": False,"
-            "require_author_approval": True,backup_retention_days": 30,
-        },"
-        "ui": {show_metrics": True,"
-            "show_preview": True,color_output": True,"
+        },
+        "patches": {
+            "max_patches_per_day": 100,
+            "auto_apply_safe_patches": False,
+            "require_author_approval": True,
+            "backup_retention_days": 30,
+        },
+        "ui": {
+            "show_metrics": True,
+            "show_preview": True,
+            "color_output": True,
             "verbose_logging": False,
-        },integrations": {"
-            "enable_git": True,enable_tests": True,"
-            "enable_backup": True,enable_metrics": True,
-        },"
-        "gpt_slack": {allow_gpt_slack_posts": True,"
-            "gpt_authorized_routes": [/slack/cheatblock","
-                "/slack/help",/slack/dashboard-ping",
-            ],"
-            "default_channel": "#runner-control",rate_limit_per_minute": 5,"
-            "require_approval": False,allowed_actions": ["postMessage", "updateMessage", "deleteMessage"],
         },
-    }"
-    def __init__(self, config_file: str = ".patchrc")
+        "integrations": {
+            "enable_git": True,
+            "enable_tests": True,
+            "enable_backup": True,
+            "enable_metrics": True,
+        },
+        "gpt_slack": {
+            "allow_gpt_slack_posts": True,
+            "gpt_authorized_routes": [
+                "/slack/cheatblock",
+                "/slack/help",
+                "/slack/dashboard-ping",
+            ],
+            "default_channel": "#runner-control",
+            "rate_limit_per_minute": 5,
+            "require_approval": False,
+            "allowed_actions": ["postMessage", "updateMessage", "deleteMessage"],
+        },
+        "logging": {
+            "level": "INFO",
+            "format": "json",
+            "queue_size": 10000,
+            # How request payloads appear in logs: "truncate", "hash" or "omit"
+            "payload_mode": "hash",
+            "max_field_length": 256,
+            # Fraction of sub-warning records kept per route; warnings and
+            # errors are always logged
+            "sample_rates": {"default": 1.0},
+            "redact_headers": [
+                "authorization",
+                "cookie",
+                "x-api-key",
+                "x-slack-signature",
+            ],
+        },
+    }
+
+    # Environment variables overriding the logging section
+    LOGGING_ENV = {
+        "LOG_LEVEL": ("level", str),
+        "LOG_FORMAT": ("format", str),
+        "LOG_QUEUE_SIZE": ("queue_size", int),
+        "LOG_PAYLOAD_MODE": ("payload_mode", str),
+        "LOG_MAX_FIELD_LENGTH": ("max_field_length", int),
+    }
+
+    def __init__(self, config_file: str = ".patchrc"):
         self.config_file = config_file
-        self.config = self.load_config()"
-    def load_config(self) -> Dict[str, Any]         """Load configuration from .patchrc file."""         config_path = Path(self.config_file)          if config_path.exists()
-        """
-            try"
-                with open(config_path, "r") as f import user_config = json.load(f)
+        self.config = self.load_config()
+
+    def load_config(self) -> Dict[str, Any]:
+        """Load configuration from .patchrc file."""
+        config_path = Path(self.config_file)
+
+        if config_path.exists():
+            try:
+                with open(config_path, "r") as f:
+                    user_config = json.load(f)
                 return self._merge_config(self.DEFAULT_CONFIG, user_config)
-            except Exception as e
-        "
-                print(f"Warning Error loading config file
-        {e}")
-        return self.DEFAULT_CONFIG.copy()
-        else
-        # Create default config file
+            except Exception as e:
+                print(f"Warning: Error loading config file: {e}")
+                return copy.deepcopy(self.DEFAULT_CONFIG)
+        else:
+            # Create default config file
             self.save_config(self.DEFAULT_CONFIG)
-            return self.DEFAULT_CONFIG.copy()"
-    def _merge_config(         self, default Dict[str, Any], user Dict[str, Any]     ) -> Dict[str, Any]         """Merge user config with defaults."""         result = default.copy()          def merge_dicts(base
-        Dict[str, Any], override Dict[str, Any]) as for key, value in override.items() in if ( "code",
-            },slack" import {"
-                "rate_limit_per_minute" 10,enable_notifications": True,"
+            return copy.deepcopy(self.DEFAULT_CONFIG)
+
+    def _merge_config(self, default: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge user config with defaults."""
+        result = copy.deepcopy(default)
+
+        def merge_dicts(base: Dict[str, Any], override: Dict[str, Any]):
+            for key, value in override.items():
+                if key in base and isinstance(base[key], dict) and isinstance(value, dict):
+                    merge_dicts(base[key], value)
+                else:
+                    base[key] = value
+
+        merge_dicts(result, user)
+        return result
+
+    def save_config(self, config: Optional[Dict[str, Any]] = None):
+        """Save configuration to .patchrc file."""
+        try:
+            with open(self.config_file, "w") as f:
+                json.dump(config if config is not None else self.config, f, indent=2)
+        except Exception as e:
+            print(f"Warning: Error saving config file: {e}")
+
+    def get(self, key_path: str, default: Any = None) -> Any:
+        """Get a value by dotted path, e.g. ``slack.default_channel``."""
+        value: Any = self.config
+        for key in key_path.split("."):
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    def set(self, key_path: str, value: Any):
+        """Set a value by dotted path and save the file."""
+        keys = key_path.split(".")
+        target = self.config
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+        self.save_config()
+
+    def is_gpt_slack_enabled(self) -> bool:
+        """Whether GPT may post to Slack."""
+        return bool(self.get("gpt_slack.allow_gpt_slack_posts", False))
+
+    def get_gpt_default_channel(self) -> str:
+        """Default Slack channel for GPT posts."""
+        return self.get("gpt_slack.default_channel", "#runner-control")
+
+    def is_route_authorized(self, route: str) -> bool:
+        """Whether GPT may call a Slack route."""
+        return route in self.get("gpt_slack.gpt_authorized_routes", [])
+
+    def get_logging_config(self) -> Dict[str, Any]:
+        """Logging settings from .patchrc, overridden by ``LOG_*`` env vars.
+
+        ``LOG_SAMPLE_RATES`` takes ``route=rate`` pairs separated by commas,
+        e.g. ``/webhook=0.1,default=1``.
+        """
+        logging_config = copy.deepcopy(self.get("logging", self.DEFAULT_CONFIG["logging"]))
+        for env_name, (key, cast) in self.LOGGING_ENV.items():
+            value = os.getenv(env_name)
+            if value:
+                try:
+                    logging_config[key] = cast(value)
+                except ValueError:
+                    print(f"Warning: Ignoring invalid {env_name}={value!r}")
+        sample_rates = os.getenv("LOG_SAMPLE_RATES")
+        if sample_rates:
+            rates = dict(logging_config.get("sample_rates") or {})
+            for pair in sample_rates.split(","):
+                route, _, rate = pair.partition("=")
+                try:
+                    rates[route.strip()] = float(rate)
+                except ValueError:
+                    print(f"Warning: Ignoring invalid sample rate {pair!r}")
+            logging_config["sample_rates"] = rates
+        return logging_config
+
+    def create_sample_config(self):
+        """Create a sample configuration file with comments."""
+        sample_config = {
+            "defaults": {
+                "auto_confirm": False,
+                "dry_run": True,
+                "backup_files": True,
+                "target_directory": "code",
+            },
+            "slack": {
+                "rate_limit_per_minute": 10,
+                "enable_notifications": True,
                 "default_channel": "#general",
-            },patches": {"
-                "max_patches_per_day": 100,auto_apply_safe_patches": False,"
-                "require_author_approval": True,backup_retention_days": 30,
-            },"
-            "ui": {show_metrics": True,"
-                "show_preview": True,color_output": True,"
+            },
+            "patches": {
+                "max_patches_per_day": 100,
+                "auto_apply_safe_patches": False,
+                "require_author_approval": True,
+                "backup_retention_days": 30,
+            },
+            "ui": {
+                "show_metrics": True,
+                "show_preview": True,
+                "color_output": True,
                 "verbose_logging": False,
-            },integrations": {"
-                "enable_git": True,enable_tests": True,"
-                "enable_backup": True,enable_metrics": True,
+            },
+            "integrations": {
+                "enable_git": True,
+                "enable_tests": True,
+                "enable_backup": True,
+                "enable_metrics": True,
+            },
+            "logging": {
+                "level": "INFO",
+                "payload_mode": "hash",
+                "sample_rates": {"default": 1.0, "/webhook": 1.0},
             },
         }
 
-        self.save_config(sample_config)"
-        print(f"✅ Created sample configuration file: {self.config_file}")"
+        self.save_config(sample_config)
+        print(f"✅ Created sample configuration file: {self.config_file}")
         print("📝 Edit this file to customize your settings")
 
 
 # Global instance
 config_manager = ConfigManager()
-"
\ No newline at end of file
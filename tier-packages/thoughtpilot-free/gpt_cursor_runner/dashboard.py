@@ -7,10 +7,11 @@ Provides web dashboard and statistics endpoints.
 
 import os
 import json
-import glob
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any, List
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
+
+from .patch_catalog import get_patch_catalog
 
 # Import dependencies
 try:
@@ -18,11 +19,9 @@ try:
 except ImportError:
     event_logger = None
 
-try:
-    from .slack_proxy import create_slack_proxy
-    slack_proxy = create_slack_proxy()
-except ImportError:
-    slack_proxy = None
+from .slack_proxy import get_slack_proxy
+
+DAY_SECONDS = 24 * 3600
 
 
 def create_dashboard_routes(app: Flask):
@@ -42,10 +41,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting dashboard stats: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/stats"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/stats"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -55,17 +53,19 @@ def create_dashboard_routes(app: Flask):
         """Get recent events."""
         try:
             if event_logger:
-                events = event_logger.get_recent_events(50)
-                return jsonify({"events": events})
+                page = event_logger.query_events(
+                    request.args.get("limit", 50, type=int),
+                    after=request.args.get("after") or None,
+                )
+                return jsonify(page)
             else:
                 return jsonify({"error": "Event logger not available"}), 500
         except Exception as e:
             error_msg = f"Error getting events: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/events"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/events"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -79,10 +79,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting patches: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/patches"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/patches"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -100,10 +99,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting metrics: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/metrics"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/metrics"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -117,10 +115,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting tunnel status: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/tunnels"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/tunnels"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -134,10 +131,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting agent status: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/agents"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/agents"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -151,10 +147,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting queue status: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/queues"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/queues"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -168,10 +163,9 @@ def create_dashboard_routes(app: Flask):
         except Exception as e:
             error_msg = f"Error getting Slack command stats: {str(e)}"
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        error_msg, context="/api/dashboard/slack-commands"
-                    )
+                get_slack_proxy().notify_error(
+                    error_msg, context="/api/dashboard/slack-commands"
+                )
             except Exception:
                 pass
             return jsonify({"error": error_msg}), 500
@@ -189,47 +183,40 @@ def get_dashboard_stats() -> Dict[str, Any]:
     # Event statistics
     if event_logger:
         try:
-            events = event_logger.get_recent_events(1000)
-            event_counts = {}
-            for event in events:
-                event_type = event.get("type", "unknown")
-                event_counts[event_type] = event_counts.get(event_type, 0) + 1
+            counters = event_logger.get_counters()
+            event_counts = counters.breakdown("type", counters.max_window)
             
             stats["events"] = {
-                "total": len(events),
+                "total": sum(event_counts.values()),
                 "by_type": event_counts,
-                "recent_24h": len([e for e in events if is_recent_event(e, 24)]),
-                "recent_7d": len([e for e in events if is_recent_event(e, 7 * 24)]),
+                "recent_1h": counters.count(3600),
+                "recent_24h": counters.count(DAY_SECONDS),
+                "recent_7d": counters.count(7 * DAY_SECONDS),
+                "window_days": counters.max_window // DAY_SECONDS,
             }
         except Exception as e:
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        f"Error getting event stats: {e}", context="get_dashboard_stats"
-                    )
+                get_slack_proxy().notify_error(
+                    f"Error getting event stats: {e}", context="get_dashboard_stats"
+                )
             except Exception:
                 pass
     
     # Slack statistics
     if event_logger:
         try:
-            slack_events = event_logger.get_slack_events(1000)
-            slack_counts = {}
-            for event in slack_events:
-                event_type = event.get("event_type", "unknown")
-                slack_counts[event_type] = slack_counts.get(event_type, 0) + 1
+            counters = event_logger.get_counters()
             
             stats["slack"] = {
-                "total_events": len(slack_events),
-                "by_type": slack_counts,
-                "recent_24h": len([e for e in slack_events if is_recent_event(e, 24)]),
+                "total_events": counters.count(counters.max_window, "type", "slack_event"),
+                "by_type": counters.breakdown("event_type:slack_event", counters.max_window),
+                "recent_24h": counters.count(DAY_SECONDS, "type", "slack_event"),
             }
         except Exception as e:
             try:
-                if slack_proxy:
-                    slack_proxy.notify_error(
-                        f"Error getting Slack stats: {e}", context="get_dashboard_stats"
-                    )
+                get_slack_proxy().notify_error(
+                    f"Error getting Slack stats: {e}", context="get_dashboard_stats"
+                )
             except Exception:
                 pass
     
@@ -242,16 +229,14 @@ def get_recent_patches(limit: int = 20) -> List[Dict[str, Any]]:
     patches_dir = os.getenv("PATCHES_DIRECTORY", "patches")
     
     if os.path.exists(patches_dir):
-        patch_files = glob.glob(os.path.join(patches_dir, "*.json"))
-        patch_files.sort(key=os.path.getmtime, reverse=True)
-        
-        for patch_file in patch_files[:limit]:
+        for entry in get_patch_catalog(patches_dir).entries(limit=limit):
+            patch_file = entry["filepath"]
             try:
                 with open(patch_file, "r") as f:
                     patch_data = json.load(f)
                     patch_data["filepath"] = patch_file
                     patch_data["modified"] = datetime.fromtimestamp(
-                        os.path.getmtime(patch_file)
+                        entry["mtime_ns"] / 1e9
                     ).isoformat()
                     patches.append(patch_data)
             except Exception as e:
@@ -342,18 +327,13 @@ def get_slack_command_stats() -> Dict[str, Any]:
     """Get Slack command statistics."""
     if event_logger:
         try:
-            slack_events = event_logger.get_slack_events(1000)
-            command_counts = {}
-            
-            for event in slack_events:
-                if event.get("event_type") == "slash_command":
-                    command = event.get("command", "unknown")
-                    command_counts[command] = command_counts.get(command, 0) + 1
+            counters = event_logger.get_counters()
+            by_command = counters.breakdown("command", counters.max_window)
             
             return {
-                "total_commands": len([e for e in slack_events if e.get("event_type") == "slash_command"]),
-                "by_command": command_counts,
-                "recent_24h": len([e for e in slack_events if e.get("event_type") == "slash_command" and is_recent_event(e, 24)]),
+                "total_commands": sum(by_command.values()),
+                "by_command": by_command,
+                "recent_24h": counters.count(DAY_SECONDS, "event_type:slack_event", "slash_command"),
             }
         except Exception as e:
             return {"error": f"Error getting Slack command stats: {e}"}
@@ -361,16 +341,6 @@ def get_slack_command_stats() -> Dict[str, Any]:
     return {"error": "Event logger not available"}
 
 
-def is_recent_event(event: Dict[str, Any], hours: int) -> bool:
-    """Check if an event is within the specified hours."""
-    try:
-        event_time = datetime.fromisoformat(event.get("timestamp", ""))
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        return event_time > cutoff_time
-    except Exception:
-        return False
-
-
 # Dashboard HTML template
 DASHBOARD_HTML = """
 <!DOCTYPE html>
@@ -430,23 +400,37 @@ DASHBOARD_HTML = """
                 .catch(error => console.error('Error loading stats:', error));
         }
         
+        let eventsCursor = null;
+        const maxEvents = 50;
+
         function loadEvents() {
-            fetch('/api/dashboard/events')
+            const url = eventsCursor
+                ? `/api/dashboard/events?after=${encodeURIComponent(eventsCursor)}`
+                : '/api/dashboard/events';
+            fetch(url)
                 .then(response => response.json())
                 .then(data => {
                     const eventsDiv = document.getElementById('events');
-                    eventsDiv.innerHTML = '';
+                    if (!eventsCursor || data.cursor_reset) {
+                        eventsDiv.innerHTML = '';
+                    }
                     
                     if (data.events) {
                         data.events.forEach(event => {
-                            eventsDiv.innerHTML += `
+                            eventsDiv.insertAdjacentHTML('beforeend', `
                                 <div class="event">
                                     <div class="timestamp">${event.timestamp}</div>
                                     <div class="type">${event.type}</div>
                                     <div>${JSON.stringify(event, null, 2)}</div>
                                 </div>
-                            `;
+                            `);
                         });
+                        while (eventsDiv.children.length > maxEvents) {
+                            eventsDiv.removeChild(eventsDiv.firstElementChild);
+                        }
+                    }
+                    if (data.next_cursor) {
+                        eventsCursor = data.next_cursor;
                     }
                 })
                 .catch(error => console.error('Error loading events:', error));
@@ -16,6 +16,10 @@ from enum import Enum
 import logging
 import json
 
+from .scheduler import get_scheduler
+from .metrics_sampler import get_metrics_sampler
+from .process_table import get_process_table
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,8 +74,6 @@ class HealthEndpoints:
         self.health_checks: Dict[str, HealthCheck] = {}
         self.health_history: List[HealthResult] = []
         self._lock = threading.Lock()
-        self._health_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         
         # Register default health checks
         self._register_default_checks()
@@ -171,30 +173,18 @@ class HealthEndpoints:
         }
     
     def start(self):
-        """Start the health monitoring background thread."""
-        if self._health_thread is None or not self._health_thread.is_alive():
-            self._stop_event.clear()
-            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
-            self._health_thread.start()
-            logger.info("Health endpoints started")
+        """Schedule health monitoring on the shared scheduler."""
+        get_scheduler().add_job("health_endpoints", self._health_cycle, 30)  # Check every 30 seconds
+        logger.info("Health endpoints started")
     
     def stop(self):
-        """Stop the health monitoring background thread."""
-        self._stop_event.set()
-        if self._health_thread and self._health_thread.is_alive():
-            self._health_thread.join(timeout=5)
+        """Remove health monitoring from the shared scheduler."""
+        if get_scheduler().remove_job("health_endpoints"):
             logger.info("Health endpoints stopped")
     
-    def _health_loop(self):
-        """Background loop for health monitoring."""
-        while not self._stop_event.is_set():
-            try:
-                self._run_health_checks()
-            except Exception as e:
-                logger.error(f"Error in health monitoring loop: {e}")
-            
-            # Wait before next health check cycle
-            self._stop_event.wait(30)  # Check every 30 seconds
+    def _health_cycle(self):
+        """Run one cycle of health monitoring."""
+        self._run_health_checks()
     
     def _run_health_checks(self):
         """Run all health checks."""
@@ -265,36 +255,38 @@ class HealthEndpoints:
     
     def _check_cpu_usage(self) -> Tuple[float, str, Dict[str, Any]]:
         """Check CPU usage."""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        snapshot = get_metrics_sampler().get_snapshot()
+        cpu_percent = snapshot.cpu_percent
         message = f"CPU usage: {cpu_percent:.1f}%"
+        cpu_freq = psutil.cpu_freq()
         details = {
-            'cpu_count': psutil.cpu_count(),
-            'cpu_freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
+            'cpu_count': snapshot.cpu_count,
+            'cpu_freq': cpu_freq._asdict() if cpu_freq else None
         }
         return cpu_percent, message, details
     
     def _check_memory_usage(self) -> Tuple[float, str, Dict[str, Any]]:
         """Check memory usage."""
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
+        memory = get_metrics_sampler().get_snapshot().memory
+        memory_percent = memory['percent']
         message = f"Memory usage: {memory_percent:.1f}%"
         details = {
-            'total': memory.total,
-            'available': memory.available,
-            'used': memory.used,
-            'free': memory.free
+            'total': memory['total'],
+            'available': memory['available'],
+            'used': memory['used'],
+            'free': memory['free']
         }
         return memory_percent, message, details
     
     def _check_disk_usage(self) -> Tuple[float, str, Dict[str, Any]]:
         """Check disk usage."""
-        disk = psutil.disk_usage('/')
-        disk_percent = disk.percent
+        disk = get_metrics_sampler().get_snapshot().disk
+        disk_percent = disk['percent']
         message = f"Disk usage: {disk_percent:.1f}%"
         details = {
-            'total': disk.total,
-            'used': disk.used,
-            'free': disk.free
+            'total': disk['total'],
+            'used': disk['used'],
+            'free': disk['free']
         }
         return disk_percent, message, details
     
@@ -382,13 +374,9 @@ class HealthEndpoints:
     
     def _check_ghost_processes(self) -> Tuple[float, str, Dict[str, Any]]:
         """Check GHOST-related processes."""
-        ghost_processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if 'ghost' in proc.info['name'].lower() or any('ghost' in str(arg).lower() for arg in proc.info['cmdline'] or []):
-                    ghost_processes.append(proc.info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        table = get_process_table().snapshot()
+        matches = table.name_contains('ghost') + table.cmdline_contains('ghost', ignore_case=True)
+        ghost_processes = list({p.pid: p.to_dict() for p in matches}.values())
         
         if ghost_processes:
             return 0.0, f"GHOST processes: {len(ghost_processes)} running", {'processes': ghost_processes}
@@ -397,13 +385,7 @@ class HealthEndpoints:
     
     def _check_python_processes(self) -> Tuple[float, str, Dict[str, Any]]:
         """Check Python processes."""
-        python_processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if 'python' in proc.info['name'].lower():
-                    python_processes.append(proc.info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        python_processes = [p.to_dict() for p in get_process_table().name_contains('python')]
         
         if python_processes:
             return 0.0, f"Python processes: {len(python_processes)} running", {'processes': python_processes}
@@ -511,8 +493,14 @@ class HealthEndpoints:
 
 
 # Global health endpoints instance
-health_endpoints = HealthEndpoints()
+_health_endpoints: Optional[HealthEndpoints] = None
+_health_endpoints_lock = threading.Lock()
+
 
 def get_health_endpoints() -> HealthEndpoints:
-    """Get the global health endpoints instance."""
-    return health_endpoints 
\ No newline at end of file
+    """Get the global health endpoints instance, creating it on first use."""
+    global _health_endpoints
+    with _health_endpoints_lock:
+        if _health_endpoints is None:
+            _health_endpoints = HealthEndpoints()
+        return _health_endpoints
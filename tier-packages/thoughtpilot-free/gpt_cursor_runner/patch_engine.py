@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Patch Engine for GPT-Cursor Runner.
+
+Provides pattern matching for patch application: cached compiled regexes,
+explicit literal/regex modes and single-pass replacement that records match
+counts and spans.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+MODE_LITERAL = "literal"
+MODE_REGEX = "regex"
+PATCH_MODES = (MODE_LITERAL, MODE_REGEX)
+
+# Flags used for regex patches (matches the historical apply_patch behaviour)
+DEFAULT_REGEX_FLAGS = re.DOTALL
+# Spans are reported for at most this many matches
+MAX_REPORTED_SPANS = 100
+
+_REGEX_CHARS = frozenset(r"^$.*+?{}[]()|\\")
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str, flags: int = DEFAULT_REGEX_FLAGS) -> "re.Pattern":
+    """Compile a regex, cached by (pattern, flags)."""
+    return re.compile(pattern, flags)
+
+
+def resolve_mode(patch_info: Dict[str, Any]) -> str:
+    """Matching mode for a patch.
+
+    Uses the explicit ``mode`` field when present; older patches without it
+    fall back to treating any regex metacharacter as a regex.
+    """
+    mode = patch_info.get("mode")
+    if mode:
+        return mode
+    pattern = patch_info.get("pattern") or ""
+    return MODE_REGEX if any(char in _REGEX_CHARS for char in pattern) else MODE_LITERAL
+
+
+@dataclass
+class PatchMatch:
+    """Outcome of matching and replacing a pattern in some content.
+
+    ``edits`` lists every replacement as ``(start, end, new_length)`` in the
+    coordinates of the original content, in order.
+    """
+    mode: str
+    new_content: str
+    edits: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @property
+    def match_count(self) -> int:
+        return len(self.edits)
+
+    @property
+    def matched(self) -> bool:
+        return bool(self.edits)
+
+    @property
+    def spans(self) -> List[Tuple[int, int]]:
+        return [(start, end) for start, end, _ in self.edits[:MAX_REPORTED_SPANS]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "match_count": self.match_count,
+            "match_spans": [list(span) for span in self.spans],
+        }
+
+
+def _replace_literal(content: str, pattern: str, replacement: str) -> PatchMatch:
+    pieces: List[str] = []
+    edits: List[Tuple[int, int, int]] = []
+    position = 0
+    length = len(pattern)
+    while pattern:
+        index = content.find(pattern, position)
+        if index < 0:
+            break
+        edits.append((index, index + length, len(replacement)))
+        pieces.append(content[position:index])
+        pieces.append(replacement)
+        position = index + length
+    if not edits:
+        return PatchMatch(MODE_LITERAL, content)
+    pieces.append(content[position:])
+    return PatchMatch(MODE_LITERAL, "".join(pieces), edits)
+
+
+def _replace_regex(content: str, pattern: str, replacement: str, flags: int) -> PatchMatch:
+    compiled = compile_pattern(pattern, flags)
+    edits: List[Tuple[int, int, int]] = []
+    expand = "\\" in replacement
+
+    def record(match: "re.Match") -> str:
+        text = match.expand(replacement) if expand else replacement
+        edits.append((match.start(), match.end(), len(text)))
+        return text
+
+    new_content, _ = compiled.subn(record, content)
+    return PatchMatch(MODE_REGEX, new_content, edits)
+
+
+def apply_pattern(content: str, pattern: str, replacement: str, mode: str,
+                  flags: int = DEFAULT_REGEX_FLAGS) -> PatchMatch:
+    """Find and replace ``pattern`` in one pass over ``content``.
+
+    Raises ``ValueError`` for an unknown mode and ``re.error`` for an invalid
+    regex.
+    """
+    if mode == MODE_LITERAL:
+        return _replace_literal(content, pattern, replacement)
+    if mode == MODE_REGEX:
+        return _replace_regex(content, pattern, replacement, flags)
+    raise ValueError(f"Unknown patch mode: {mode}")
+
+
+def find_overlap(edits: List[Tuple[int, int, int]],
+                 regions: List[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    """First region touched by any edit, or None.
+
+    ``regions`` are ``(start, end)`` ranges already rewritten, sorted by
+    start. A zero-length region (deleted text) conflicts with an edit that
+    spans across it.
+    """
+    index = 0
+    for start, end, _ in edits:
+        while index < len(regions) and regions[index][1] < start:
+            index += 1
+        probe = index
+        while probe < len(regions) and regions[probe][0] <= end:
+            region_start, region_end = regions[probe]
+            if region_start == region_end:
+                if start < region_start < end:
+                    return region_start, region_end
+            elif start < region_end and region_start < end:
+                return region_start, region_end
+            probe += 1
+    return None
+
+
+def shift_regions(regions: List[Tuple[int, int]],
+                  edits: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """Map rewritten regions through ``edits`` and add the edits' own output.
+
+    Assumes no edit overlaps an existing region (see ``find_overlap``).
+    Returns regions in the new content's coordinates, sorted by start.
+    """
+    shifted: List[Tuple[int, int]] = []
+    delta = 0
+    index = 0
+    for start, end, new_length in edits:
+        while index < len(regions) and regions[index][1] <= start:
+            region_start, region_end = regions[index]
+            shifted.append((region_start + delta, region_end + delta))
+            index += 1
+        shifted.append((start + delta, start + delta + new_length))
+        delta += new_length - (end - start)
+    for region_start, region_end in regions[index:]:
+        shifted.append((region_start + delta, region_end + delta))
+    shifted.sort()
+    return shifted
+
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Patch Pool for GPT-Cursor Runner.
+
+Provides an optional process pool for patch matching so large files and
+pathological regexes run outside the server process, with per-task timeouts
+that kill runaway workers.
+"""
+
+import os
+import threading
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Tuple
+
+from .patch_engine import DEFAULT_REGEX_FLAGS, MODE_REGEX, PatchMatch, apply_pattern, compile_pattern
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_INLINE = "inline"
+EXECUTION_PROCESS = "process"
+EXECUTION_MODES = (EXECUTION_INLINE, EXECUTION_PROCESS)
+
+# Regexes handed to new workers so their compile cache starts warm
+WARM_PATTERNS = 256
+
+
+class PatchTimeout(TimeoutError):
+    """Patch matching exceeded its time budget."""
+
+
+def _warm_worker(patterns):
+    """Worker initializer: pre-compile recently used regexes."""
+    for pattern, flags in patterns:
+        try:
+            compile_pattern(pattern, flags)
+        except Exception:
+            pass
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _context():
+    # forkserver children start from a clean, preloaded server process rather
+    # than forking a threaded Flask process
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class PatchProcessPool:
+    """Process pool that runs ``apply_pattern`` with per-task timeouts.
+
+    A ``ProcessPoolExecutor`` cannot cancel a running task, so on timeout the
+    whole pool is torn down (its processes terminated) and replaced; tasks
+    that were running alongside the timed-out one are retried once on the
+    fresh pool. Workers are spawned eagerly by ``start`` and initialised
+    with the parent's recently used regexes, since compiled patterns cannot
+    be shared between processes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout_ms: int = 10000,
+                 min_bytes: int = 0):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.default_timeout_ms = default_timeout_ms
+        self.min_bytes = min_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._started = False
+        self._lock = threading.Lock()
+        self._patterns: "OrderedDict[Tuple[str, int], None]" = OrderedDict()
+        self._stats = {"tasks": 0, "inline": 0, "timeouts": 0, "restarts": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def _ensure(self) -> Tuple[ProcessPoolExecutor, int]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=_context(),
+                    initializer=_warm_worker,
+                    initargs=(list(self._patterns),),
+                )
+                self._generation += 1
+            return self._executor, self._generation
+
+    def start(self) -> "PatchProcessPool":
+        """Spawn and initialise all workers now instead of on first use."""
+        self._started = True
+        executor, _ = self._ensure()
+        try:
+            for future in [executor.submit(_ready) for _ in range(self.max_workers)]:
+                future.result(timeout=30)
+        except Exception as e:
+            logger.warning(f"Patch pool warm-up failed: {e}")
+        return self
+
+    def _discard(self, generation: int):
+        """Terminate a pool's workers (once) after a timeout or crash."""
+        with self._lock:
+            if self._executor is None or generation != self._generation:
+                return
+            executor, self._executor = self._executor, None
+            self._stats["restarts"] += 1
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+        if self._started:
+            # Keep the replacement pool warm too
+            threading.Thread(target=self.start, daemon=True, name="patch-pool-warmup").start()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._started = False
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+    def _remember(self, pattern: str, flags: int):
+        key = (pattern, flags)
+        with self._lock:
+            self._patterns[key] = None
+            self._patterns.move_to_end(key)
+            while len(self._patterns) > WARM_PATTERNS:
+                self._patterns.popitem(last=False)
+
+    def apply(self, content: str, pattern: str, replacement: str, mode: str,
+              timeout_ms: Optional[int] = None, flags: int = DEFAULT_REGEX_FLAGS) -> PatchMatch:
+        """Run ``apply_pattern`` in a worker; raises ``PatchTimeout`` on timeout."""
+        timeout = (timeout_ms or self.default_timeout_ms) / 1000.0
+        if mode == MODE_REGEX:
+            self._remember(pattern, flags)
+        for attempt in range(2):
+            executor, generation = self._ensure()
+            with self._lock:
+                self._stats["tasks"] += 1
+            try:
+                future = executor.submit(apply_pattern, content, pattern, replacement, mode, flags)
+            except RuntimeError:
+                # Shut down or broken (BrokenProcessPool is a RuntimeError) by
+                # another task's timeout since _ensure; retry once
+                self._discard(generation)
+                if attempt:
+                    with self._lock:
+                        self._stats["errors"] += 1
+                    raise
+                continue
+            try:
+                return future.result(timeout=timeout)
+            except FuturesTimeout:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                self._discard(generation)
+                raise PatchTimeout(f"Patch matching exceeded {int(timeout * 1000)} ms")
+            except BrokenProcessPool:
+                # Torn down under us (another task's timeout); retry once
+                self._discard(generation)
+                if attempt:
+                    with self._lock:
+                        self._stats["errors"] += 1
+                    raise
+        raise BrokenProcessPool("Patch pool unavailable")
+
+    def run(self, content: str, pattern: str, replacement: str, mode: str,
+            timeout_ms: Optional[int] = None) -> PatchMatch:
+        """Use a worker for large content or an explicit timeout, else run inline."""
+        if timeout_ms or len(content) >= self.min_bytes:
+            return self.apply(content, pattern, replacement, mode, timeout_ms)
+        with self._lock:
+            self._stats["inline"] += 1
+        return apply_pattern(content, pattern, replacement, mode)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self._stats,
+                running=self._executor is not None,
+                max_workers=self.max_workers,
+                warm_patterns=len(self._patterns),
+            )
+
+
+_pool: Optional[PatchProcessPool] = None
+_pool_lock = threading.Lock()
+
+
+def execution_mode() -> str:
+    """Configured patch execution mode (``PATCH_EXECUTION_MODE``)."""
+    mode = os.getenv("PATCH_EXECUTION_MODE", EXECUTION_INLINE).lower()
+    return mode if mode in EXECUTION_MODES else EXECUTION_INLINE
+
+
+def get_patch_pool() -> PatchProcessPool:
+    """Get the global patch pool (created on first use, not started)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PatchProcessPool(
+                max_workers=int(os.getenv("PATCH_POOL_WORKERS", "0")) or None,
+                default_timeout_ms=int(os.getenv("PATCH_TIMEOUT_MS", "10000")),
+                min_bytes=int(os.getenv("PATCH_POOL_MIN_BYTES", "65536")),
+            )
+        return _pool
+
+
+def shutdown_patch_pool():
+    """Stop the global patch pool if it was created."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def run_pattern(content: str, pattern: str, replacement: str, mode: str,
+                timeout_ms: Optional[int] = None) -> PatchMatch:
+    """Match and replace, in the pool or inline depending on configuration.
+
+    In process mode, content smaller than ``PATCH_POOL_MIN_BYTES`` still runs
+    inline unless the patch sets its own ``timeout_ms``; timeouts are only
+    enforced for work that runs in the pool.
+    """
+    if execution_mode() == EXECUTION_PROCESS:
+        return get_patch_pool().run(content, pattern, replacement, mode, timeout_ms)
+    return apply_pattern(content, pattern, replacement, mode)
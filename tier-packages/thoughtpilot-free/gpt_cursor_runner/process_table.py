@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Process Table for GPT-Cursor Runner.
+
+Provides one cached snapshot of the system process table for the health,
+cleanup and status probes, refreshed at most once per TTL and indexed by
+process name, so each probe is a lookup instead of another walk of
+``psutil.process_iter`` (or a ``ps``/``pgrep`` fork).
+"""
+
+import os
+import time
+import psutil
+import threading
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProcessInfo:
+    """Information about a process."""
+    pid: int
+    name: str
+    cmdline: List[str]
+    cpu_percent: float
+    memory_percent: float
+    create_time: float
+    status: str
+    parent_pid: Optional[int] = None
+
+    @property
+    def command(self) -> str:
+        """Full command line, or the name for processes without one (as ``ps`` shows them)."""
+        return " ".join(self.cmdline) or self.name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ProcessSnapshot:
+    """An immutable view of the process table at one point in time.
+
+    Name lookups use a prebuilt index; substring queries scan the
+    snapshot once and are memoized, so repeated probes for the same
+    daemon within a TTL cost a dict lookup.
+    """
+
+    def __init__(self, processes: List[ProcessInfo], taken_at: float, duration_ms: float):
+        self.processes = processes
+        self.taken_at = taken_at
+        self.duration_ms = duration_ms
+        self._by_name: Dict[str, List[ProcessInfo]] = {}
+        for process in processes:
+            self._by_name.setdefault(process.name.lower(), []).append(process)
+        self._queries: Dict[Tuple[str, str, bool], List[ProcessInfo]] = {}
+        self._queries_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.processes)
+
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.taken_at
+
+    def by_name(self, name: str) -> List[ProcessInfo]:
+        """Processes whose name is exactly ``name`` (case-insensitive)."""
+        return list(self._by_name.get(name.lower(), []))
+
+    def _query(self, kind: str, text: str, ignore_case: bool) -> List[ProcessInfo]:
+        key = (kind, text, ignore_case)
+        with self._queries_lock:
+            if key in self._queries:
+                return list(self._queries[key])
+        needle = text.lower() if ignore_case else text
+        matches = []
+        for process in self.processes:
+            haystack = process.name if kind == "name" else process.command
+            if needle in (haystack.lower() if ignore_case else haystack):
+                matches.append(process)
+        with self._queries_lock:
+            self._queries[key] = matches
+        return list(matches)
+
+    def name_contains(self, text: str) -> List[ProcessInfo]:
+        """Processes whose name contains ``text`` (case-insensitive)."""
+        return self._query("name", text, True)
+
+    def cmdline_contains(self, text: str, ignore_case: bool = False) -> List[ProcessInfo]:
+        """Processes whose command line contains ``text``, like ``pgrep -f``."""
+        return self._query("cmdline", text, ignore_case)
+
+
+class ProcessTable:
+    """Shares one process-table snapshot between all probes.
+
+    ``snapshot()`` returns the cached snapshot while it is younger than
+    ``ttl`` seconds; otherwise one caller walks the process table while
+    concurrent callers wait for, and then share, that result.
+    """
+
+    ATTRS = ['pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent', 'create_time', 'status', 'ppid']
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._snapshot: Optional[ProcessSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self.refreshes = 0
+
+    def snapshot(self) -> ProcessSnapshot:
+        """The current snapshot, refreshed first if older than the TTL."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age_seconds() < self.ttl:
+            return snapshot
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.age_seconds() >= self.ttl:
+                snapshot = self.refresh()
+            return snapshot
+
+    def refresh(self) -> ProcessSnapshot:
+        """Walk the process table now and publish the result."""
+        started = time.perf_counter()
+        processes = []
+        for proc in psutil.process_iter(self.ATTRS):
+            try:
+                info = proc.info
+                processes.append(ProcessInfo(
+                    pid=info['pid'],
+                    name=info['name'] or '',
+                    cmdline=info['cmdline'] or [],
+                    cpu_percent=info['cpu_percent'] or 0.0,
+                    memory_percent=info['memory_percent'] or 0.0,
+                    create_time=info['create_time'] or 0.0,
+                    status=info['status'] or '',
+                    parent_pid=info['ppid']
+                ))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            except Exception as e:
+                logger.error(f"Error reading process {proc.pid}: {e}")
+        snapshot = ProcessSnapshot(processes, time.monotonic(), (time.perf_counter() - started) * 1000)
+        self._snapshot = snapshot
+        self.refreshes += 1
+        return snapshot
+
+    def by_name(self, name: str) -> List[ProcessInfo]:
+        return self.snapshot().by_name(name)
+
+    def name_contains(self, text: str) -> List[ProcessInfo]:
+        return self.snapshot().name_contains(text)
+
+    def cmdline_contains(self, text: str, ignore_case: bool = False) -> List[ProcessInfo]:
+        return self.snapshot().cmdline_contains(text, ignore_case)
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'ttl': self.ttl,
+            'refreshes': self.refreshes,
+            'processes': len(snapshot) if snapshot else 0,
+            'age_seconds': round(snapshot.age_seconds(), 1) if snapshot else None,
+            'last_refresh_ms': round(snapshot.duration_ms, 2) if snapshot else None
+        }
+
+
+_process_table: Optional[ProcessTable] = None
+_process_table_lock = threading.Lock()
+
+
+def get_process_table() -> ProcessTable:
+    """Get the global process table (``PROCESS_TABLE_TTL``, default 5s)."""
+    global _process_table
+    with _process_table_lock:
+        if _process_table is None:
+            _process_table = ProcessTable(ttl=float(os.getenv("PROCESS_TABLE_TTL", "5")))
+        return _process_table
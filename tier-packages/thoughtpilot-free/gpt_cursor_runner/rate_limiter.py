@@ -14,6 +14,8 @@ from enum import Enum
 import logging
 from collections import defaultdict, deque
 
+from .scheduler import get_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,8 +58,6 @@ class RateLimiter:
         self.rules: Dict[str, RateLimitRule] = {}
         self.counters: Dict[str, Dict[str, deque]] = defaultdict(lambda: defaultdict(deque))
         self._lock = threading.Lock()
-        self._cleanup_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         
         # Register default rate limiting rules
         self._register_default_rules()
@@ -132,30 +132,18 @@ class RateLimiter:
         }
     
     def start(self):
-        """Start the rate limiter cleanup thread."""
-        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-            self._stop_event.clear()
-            self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-            self._cleanup_thread.start()
-            logger.info("Rate limiter started")
+        """Schedule rate limiter cleanup on the shared scheduler."""
+        get_scheduler().add_job("rate_limiter", self._cleanup_cycle, 30)
+        logger.info("Rate limiter started")
     
     def stop(self):
-        """Stop the rate limiter cleanup thread."""
-        self._stop_event.set()
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        """Remove rate limiter cleanup from the shared scheduler."""
+        if get_scheduler().remove_job("rate_limiter"):
             logger.info("Rate limiter stopped")
     
-    def _cleanup_loop(self):
-        """Background loop for cleaning up expired rate limit entries."""
-        while not self._stop_event.is_set():
-            try:
-                self._cleanup_expired_entries()
-            except Exception as e:
-                logger.error(f"Error in rate limiter cleanup loop: {e}")
-            
-            # Wait before next cleanup cycle
-            self._stop_event.wait(30)
+    def _cleanup_cycle(self):
+        """Run one cycle of expired rate limit entry cleanup."""
+        self._cleanup_expired_entries()
     
     def _cleanup_expired_entries(self):
         """Clean up expired rate limit entries."""
@@ -301,8 +289,14 @@ class RateLimiter:
 
 
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
 
 def get_rate_limiter() -> RateLimiter:
-    """Get the global rate limiter instance."""
-    return rate_limiter
\ No newline at end of file
+    """Get the global rate limiter instance, creating it on first use."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
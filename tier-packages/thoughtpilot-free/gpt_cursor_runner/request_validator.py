@@ -7,6 +7,7 @@ Validates incoming requests and ensures data integrity.
 
 import re
 import json
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
@@ -416,8 +417,14 @@ class RequestValidator:
 
 
 # Global request validator instance
-request_validator = RequestValidator()
+_request_validator: Optional[RequestValidator] = None
+_request_validator_lock = threading.Lock()
+
 
 def get_request_validator() -> RequestValidator:
-    """Get the global request validator instance."""
-    return request_validator 
\ No newline at end of file
+    """Get the global request validator instance, creating it on first use."""
+    global _request_validator
+    with _request_validator_lock:
+        if _request_validator is None:
+            _request_validator = RequestValidator()
+        return _request_validator
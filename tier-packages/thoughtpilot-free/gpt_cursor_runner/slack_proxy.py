@@ -7,7 +7,7 @@ Provides Slack integration and communication capabilities.
 
 import os
 import time
-import requests
+import threading
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -26,17 +26,22 @@ class SlackProxy:
         self.channel = os.getenv("SLACK_CHANNEL", "#runner-control")
         self.username = os.getenv("SLACK_USERNAME", "GPT-Cursor Runner")
 
+    def message_payload(self, text: str, attachments: Optional[list] = None) -> dict:
+        """Build the webhook payload for a message."""
+        payload = {
+            "channel": self.channel,
+            "username": self.username,
+            "text": text,
+        }
+        if attachments:
+            payload["attachments"] = attachments
+        return payload
+
     def send_message(self, text: str, attachments: Optional[list] = None) -> bool:
         """Send a message to Slack."""
         try:
-            payload = {
-                "channel": self.channel,
-                "username": self.username,
-                "text": text,
-            }
-            if attachments:
-                payload["attachments"] = attachments
-
+            import requests
+            payload = self.message_payload(text, attachments)
             response = requests.post(self.webhook_url, json=payload, timeout=10)
             return response.status_code == 200
         except Exception as e:
@@ -153,4 +158,17 @@ class SlackProxy:
 
 def create_slack_proxy():
     """Create a Slack proxy instance."""
-    return SlackProxy()
\ No newline at end of file
+    return SlackProxy()
+
+
+_slack_proxy: Optional[SlackProxy] = None
+_slack_proxy_lock = threading.Lock()
+
+
+def get_slack_proxy() -> SlackProxy:
+    """Get the shared Slack proxy, creating it on first use."""
+    global _slack_proxy
+    with _slack_proxy_lock:
+        if _slack_proxy is None:
+            _slack_proxy = SlackProxy()
+        return _slack_proxy
\ No newline at end of file
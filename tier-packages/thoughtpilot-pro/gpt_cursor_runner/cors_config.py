@@ -14,6 +14,8 @@ from enum import Enum
 import logging
 import re
 
+from .scheduler import get_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,14 +58,9 @@ class CorsManager:
         self.config = config or CorsConfig()
         self.request_history: List[Dict[str, Any]] = []
         self._lock = threading.Lock()
-        self._cleanup_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         
         # Initialize default configuration
         self._initialize_default_config()
-        
-        # Start cleanup thread
-        self.start()
     
     def _initialize_default_config(self):
         """Initialize default CORS configuration."""
@@ -108,30 +105,18 @@ class CorsManager:
             self.config.rules = {}
     
     def start(self):
-        """Start the CORS manager cleanup thread."""
-        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-            self._stop_event.clear()
-            self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-            self._cleanup_thread.start()
-            logger.info("CORS manager started")
+        """Schedule CORS manager cleanup on the shared scheduler."""
+        get_scheduler().add_job("cors_manager", self._cleanup_cycle, 3600)  # Run every hour
+        logger.info("CORS manager started")
     
     def stop(self):
-        """Stop the CORS manager cleanup thread."""
-        self._stop_event.set()
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        """Remove CORS manager cleanup from the shared scheduler."""
+        if get_scheduler().remove_job("cors_manager"):
             logger.info("CORS manager stopped")
     
-    def _cleanup_loop(self):
-        """Background loop for CORS cleanup."""
-        while not self._stop_event.is_set():
-            try:
-                self._cleanup_old_requests()
-            except Exception as e:
-                logger.error(f"Error in CORS cleanup loop: {e}")
-            
-            # Wait before next cleanup cycle
-            self._stop_event.wait(3600)  # Run every hour
+    def _cleanup_cycle(self):
+        """Run one cycle of CORS cleanup."""
+        self._cleanup_old_requests()
     
     def _cleanup_old_requests(self):
         """Clean up old request history."""
@@ -357,8 +342,14 @@ class CorsManager:
 
 
 # Global CORS manager instance
-cors_manager = CorsManager()
+_cors_manager: Optional[CorsManager] = None
+_cors_manager_lock = threading.Lock()
+
 
 def get_cors_manager() -> CorsManager:
-    """Get the global CORS manager instance."""
-    return cors_manager 
\ No newline at end of file
+    """Get the global CORS manager instance, creating it on first use."""
+    global _cors_manager
+    with _cors_manager_lock:
+        if _cors_manager is None:
+            _cors_manager = CorsManager()
+        return _cors_manager
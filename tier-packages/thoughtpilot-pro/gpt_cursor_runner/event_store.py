@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+"""
+Event Store for GPT-Cursor Runner.
+
+Append-only, segmented JSONL storage for events with batched fsync,
+segment rollover, compaction and an in-memory ring buffer for reads.
+Several processes may write the same store directory.
+"""
+
+import os
+import json
+import time
+import fcntl
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "store.lock"
+
+
+class ReadOnlyStoreError(RuntimeError):
+    """Raised when writing to a store opened read-only."""
+
+
+@dataclass
+class SegmentInfo:
+    """Metadata for a sealed (read-only) segment."""
+    name: str
+    first_seq: int
+    last_seq: int
+    count: int
+    first_timestamp: str = ""
+    last_timestamp: str = ""
+
+
+class EventStore:
+    """Append-only segmented event log.
+
+    Each event is written as one JSON line to the active segment, so an append
+    costs O(1) regardless of how many events are stored. Segments roll over
+    once they reach ``max_segment_bytes``; sealed segments are tracked in a
+    small manifest so opening the store never has to scan the whole history.
+    The manifest also records the highest sequence number handed out, so
+    numbers are never reused even after compaction removes every event.
+
+    Every process writing the directory (e.g. each server worker) shares
+    one history. Writes, rollover and compaction happen under an exclusive
+    ``flock`` on ``store.lock``, and each append is flushed before the lock
+    is released. Before writing or reading, a process catches up on what
+    the others appended, feeding those events to its ring and listeners as
+    if it had appended them itself. Sequence numbers are therefore unique
+    store-wide. Event ids of the form ``<prefix>_<ms>`` (see
+    ``EventLogger``) are kept strictly increasing across processes, so they
+    stay unique and usable as cursors.
+
+    A ``read_only`` store is for processes that only inspect the log (e.g.
+    the event viewer) while a server writes it: opening it never truncates
+    an apparently torn tail, seals segments or rewrites the manifest, and
+    writes raise ``ReadOnlyStoreError``.
+    """
+
+    def __init__(self, directory: str = "data/events", ring_size: int = 1000,
+                 max_segment_bytes: int = 4 * 1024 * 1024, max_segments: int = 256,
+                 fsync_batch: int = 64, fsync_interval: float = 1.0, read_only: bool = False):
+        self.directory = directory
+        self.read_only = read_only
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.ring: deque = deque(maxlen=ring_size)
+        self.segments: List[SegmentInfo] = []
+        self.last_updated = ""
+        self._lock = threading.RLock()
+        self._lock_fd: Optional[int] = None
+        self._lock_depth = 0
+        self._refreshing = False
+        self._opened = False
+        self._active_name = ""
+        self._active_file = None
+        self._active_bytes = 0
+        self._active_count = 0
+        self._active_first_seq = 0
+        self._active_first_timestamp = ""
+        self._next_seq = 1
+        # Highest seq recorded in the manifest
+        self._manifest_last_seq = 0
+        # Manifest file identity as last read or written; a change means
+        # another process rolled over or compacted
+        self._manifest_stamp = None
+        self._compacted_before = ""
+        self._last_id_ms = 0
+        self._pending_sync = 0
+        self._last_sync = time.time()
+        self._listeners: List[Any] = []
+
+    # ------------------------------------------------------------------
+    # Opening / recovery
+    # ------------------------------------------------------------------
+    def open(self):
+        """Open the store, recovering the active segment and hydrating the ring buffer."""
+        with self._lock:
+            if self._opened:
+                return
+            if self.read_only and not os.path.isdir(self.directory):
+                # Nothing written yet; an empty store
+                self._active_name = self._segment_name(1)
+                self._opened = True
+                self._notify("on_reload", [])
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with self._locked():
+                self._load_segments()
+                self._opened = True
+                self._notify("on_reload", list(self.ring))
+
+    def _load_segments(self):
+        """Load the manifest, recover the active segment and hydrate the ring."""
+        self.segments = self._load_manifest()
+
+        segment_names = self._list_segment_names()
+        sealed_names = {segment.name for segment in self.segments}
+        # Drop manifest entries whose files vanished (e.g. manual cleanup)
+        self.segments = [s for s in self.segments if s.name in segment_names]
+
+        unsealed = [name for name in segment_names if name not in sealed_names]
+        if unsealed:
+            self._active_name = unsealed[-1]
+            # Any other unsealed segment is left over from a crash mid-rollover
+            for name in unsealed[:-1]:
+                self._seal_recovered_segment(name)
+        else:
+            last_number = self._segment_number(segment_names[-1]) if segment_names else 0
+            self._active_name = self._segment_name(last_number + 1)
+
+        self._recover_active_segment()
+        self._hydrate_ring()
+        for event in self.ring:
+            self._note_id(event)
+        if not self.read_only:
+            self._active_file = open(self._segment_path(self._active_name), "ab")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and, for a writer, the store-wide file lock."""
+        with self._lock:
+            if self.read_only:
+                yield
+                return
+            if self._lock_fd is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._lock_fd = os.open(os.path.join(self.directory, LOCK_FILE),
+                                        os.O_RDWR | os.O_CREAT, 0o644)
+            if not self._lock_depth:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if not self._lock_depth:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Other writers
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """Pick up events other processes appended since the last write or read."""
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+
+    def _manifest_file_stamp(self):
+        try:
+            st = os.stat(os.path.join(self.directory, MANIFEST_FILE))
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        """Catch up with other writers; caller holds the lock."""
+        if self.read_only or self._refreshing:
+            return
+        self._refreshing = True
+        try:
+            stamp = self._manifest_file_stamp()
+            if stamp != self._manifest_stamp:
+                self._reload_manifest()
+            self._read_active_tail()
+        finally:
+            self._refreshing = False
+
+    def _reload_manifest(self):
+        """Follow a rollover or compaction done by another process."""
+        previous_cutoff = self._compacted_before
+        segments = self._load_manifest()
+        if self._compacted_before != previous_cutoff:
+            # Segments may have been rewritten under us; start over from disk
+            self._active_file.close()
+            self._load_segments()
+            self._notify("on_compact", self._compacted_before)
+            self._notify("on_reload", list(self.ring))
+            return
+
+        sealed_names = {segment.name for segment in segments}
+        if self._active_name not in sealed_names:
+            self.segments = segments
+            return
+        # Our active segment was sealed: finish it, then read every segment
+        # written after it up to the new active one
+        self._read_active_tail()
+        self.segments = segments
+        names = self._list_segment_names()
+        unsealed = [name for name in names if name not in sealed_names]
+        for segment in segments:
+            if segment.name > self._active_name:
+                for event in self._read_segment(segment.name):
+                    self._accept(event)
+        self._active_file.close()
+        if unsealed:
+            self._active_name = unsealed[-1]
+        else:
+            self._active_name = self._segment_name(self._segment_number(names[-1]) + 1)
+        self._active_file = open(self._segment_path(self._active_name), "ab")
+        self._active_bytes = 0
+        self._active_count = 0
+        self._read_active_tail()
+
+    def _read_active_tail(self):
+        """Accept complete events written past our offset in the active segment.
+
+        Under the file lock no write is in progress, so a partial last line
+        was torn by a crashed writer and is truncated.
+        """
+        path = self._segment_path(self._active_name)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if size <= self._active_bytes:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._active_bytes)
+            data = f.read(size - self._active_bytes)
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                with open(path, "r+b") as f:
+                    f.truncate(self._active_bytes)
+                break
+            self._active_bytes += len(line)
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if not self._active_count:
+                self._active_first_seq = event.get("seq", 0)
+                self._active_first_timestamp = event.get("timestamp", "")
+            self._active_count += 1
+            self._accept(event)
+
+    def _accept(self, event: Dict[str, Any]):
+        """Take in an event another process stored."""
+        self._next_seq = max(self._next_seq, event.get("seq", 0) + 1)
+        self.last_updated = event.get("timestamp", self.last_updated)
+        self._note_id(event)
+        self.ring.append(event)
+        self._notify("on_append", event)
+
+    @staticmethod
+    def _id_ms(event: Dict[str, Any]) -> Optional[int]:
+        prefix, _, ms = str(event.get("id", "")).rpartition("_")
+        return int(ms) if prefix and ms.isdigit() else None
+
+    def _note_id(self, event: Dict[str, Any]):
+        ms = self._id_ms(event)
+        if ms is not None and ms > self._last_id_ms:
+            self._last_id_ms = ms
+
+    def _unique_id(self, event: Dict[str, Any]):
+        """Bump a ``<prefix>_<ms>`` id past every id already stored."""
+        ms = self._id_ms(event)
+        if ms is None:
+            return
+        if ms <= self._last_id_ms:
+            ms = self._last_id_ms + 1
+            event["id"] = f"{str(event['id']).rpartition('_')[0]}_{ms}"
+        self._last_id_ms = ms
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+    def add_listener(self, listener: Any):
+        """Register an object notified of store changes.
+
+        Listeners may define ``on_append(event)``, called after each append;
+        ``on_reload(events)``, called with the ring contents whenever the
+        ring is rebuilt (open, compaction); and ``on_compact(cutoff)``, called
+        with the ISO timestamp before which events were removed. All run
+        under the store lock on the writing thread, so they must be quick.
+        A listener added to an open store is reloaded immediately.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            if self._opened and hasattr(listener, "on_reload"):
+                listener.on_reload(list(self.ring))
+
+    def _notify(self, method: str, *args):
+        for listener in self._listeners:
+            callback = getattr(listener, method, None)
+            if callback is None:
+                continue
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"Event store listener {method} failed: {e}")
+
+    def _segment_name(self, number: int) -> str:
+        return f"{SEGMENT_PREFIX}{number:08d}{SEGMENT_SUFFIX}"
+
+    def _segment_number(self, name: str) -> int:
+        return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _list_segment_names(self) -> List[str]:
+        return sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def _load_manifest(self) -> List[SegmentInfo]:
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            self.last_updated = data.get("last_updated", "")
+            self._manifest_last_seq = data.get("last_seq", 0)
+            self._compacted_before = data.get("compacted_before", "")
+            self._manifest_stamp = self._manifest_file_stamp()
+            return [SegmentInfo(**segment) for segment in data.get("segments", [])]
+        except Exception as e:
+            logger.error(f"Error reading event store manifest, rebuilding: {e}")
+            return []
+
+    def _write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        data = {
+            "segments": [asdict(segment) for segment in self.segments],
+            "last_updated": self.last_updated,
+            "last_seq": max(self._next_seq - 1, self._manifest_last_seq),
+            "compacted_before": self._compacted_before,
+        }
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._manifest_last_seq = data["last_seq"]
+        self._manifest_stamp = self._manifest_file_stamp()
+
+    def _read_segment(self, name: str) -> List[Dict[str, Any]]:
+        """Read all complete events from a segment."""
+        events = []
+        with open(self._segment_path(name), "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+        return events
+
+    def _seal_recovered_segment(self, name: str):
+        events = self._read_segment(name)
+        if not events:
+            if not self.read_only:
+                os.remove(self._segment_path(name))
+            return
+        self.segments.append(self._segment_info(name, events))
+        self.segments.sort(key=lambda segment: segment.name)
+        if not self.read_only:
+            self._write_manifest()
+
+    def _segment_info(self, name: str, events: List[Dict[str, Any]]) -> SegmentInfo:
+        return SegmentInfo(
+            name=name,
+            first_seq=events[0].get("seq", 0),
+            last_seq=events[-1].get("seq", 0),
+            count=len(events),
+            first_timestamp=events[0].get("timestamp", ""),
+            last_timestamp=events[-1].get("timestamp", ""),
+        )
+
+    def _recover_active_segment(self):
+        """Count events in the active segment and drop a torn trailing write.
+
+        A read-only store leaves the tail alone: it may be a write the
+        owning process hasn't finished yet.
+        """
+        path = self._segment_path(self._active_name)
+        self._active_bytes = 0
+        self._active_count = 0
+        self._active_first_seq = 0
+        self._active_first_timestamp = ""
+        last_seq = max(self.segments[-1].last_seq if self.segments else 0, self._manifest_last_seq)
+
+        if os.path.exists(path):
+            valid_bytes = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_bytes += len(line)
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not self._active_count:
+                        self._active_first_seq = event.get("seq", 0)
+                        self._active_first_timestamp = event.get("timestamp", "")
+                    self._active_count += 1
+                    last_seq = max(last_seq, event.get("seq", 0))
+                    self.last_updated = event.get("timestamp", self.last_updated)
+            if not self.read_only and valid_bytes < os.path.getsize(path):
+                with open(path, "r+b") as f:
+                    f.truncate(valid_bytes)
+            self._active_bytes = valid_bytes
+
+        self._next_seq = max(self._next_seq, last_seq + 1)
+
+    def _hydrate_ring(self):
+        """Fill the ring buffer from the newest segments."""
+        wanted = self.ring.maxlen or 0
+        names = [segment.name for segment in self.segments] + [self._active_name]
+        collected: List[Dict[str, Any]] = []
+        for name in reversed(names):
+            if len(collected) >= wanted:
+                break
+            if not os.path.exists(self._segment_path(name)):
+                continue
+            collected = self._read_segment(name) + collected
+        self.ring.clear()
+        self.ring.extend(collected[-wanted:] if wanted else [])
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Append an event, assigning it the next sequence number."""
+        self._check_writable()
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+
+            event["seq"] = self._next_seq
+            self._unique_id(event)
+            data = (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+            if self._active_count and self._active_bytes + len(data) > self.max_segment_bytes:
+                self._rollover()
+
+            self._active_file.write(data)
+            # Other writers read the file directly; nothing may stay buffered
+            self._active_file.flush()
+            self._next_seq += 1
+            self._active_bytes += len(data)
+            if not self._active_count:
+                self._active_first_seq = event["seq"]
+                self._active_first_timestamp = event.get("timestamp", "")
+            self._active_count += 1
+            self.last_updated = event.get("timestamp", "") or datetime.now().isoformat()
+
+            self._pending_sync += 1
+            if (self._pending_sync >= self.fsync_batch
+                    or time.time() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+            self.ring.append(event)
+            self._notify("on_append", event)
+            return event
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ReadOnlyStoreError(f"Event store {self.directory} is open read-only")
+
+    def _sync(self):
+        if self._active_file and self._pending_sync:
+            os.fsync(self._active_file.fileno())
+        self._pending_sync = 0
+        self._last_sync = time.time()
+
+    def _rollover(self):
+        """Seal the active segment and start a new one."""
+        self._sync()
+        self._active_file.close()
+        self.segments.append(SegmentInfo(
+            name=self._active_name,
+            first_seq=self._active_first_seq,
+            last_seq=self._next_seq - 1,
+            count=self._active_count,
+            first_timestamp=self._active_first_timestamp,
+            last_timestamp=self.last_updated,
+        ))
+
+        self._active_name = self._segment_name(self._segment_number(self._active_name) + 1)
+        self._active_file = open(self._segment_path(self._active_name), "ab")
+        self._active_bytes = 0
+        self._active_count = 0
+
+        if len(self.segments) > self.max_segments:
+            self._drop_segments(len(self.segments) - self.max_segments)
+        self._write_manifest()
+
+    def flush(self):
+        """Force buffered events to disk."""
+        with self._locked():
+            if self._opened:
+                self._sync()
+
+    def close(self):
+        """Flush and close the active segment."""
+        with self._locked():
+            if not self._opened:
+                return
+            if not self.read_only:
+                self._refresh()
+                self._sync()
+                self._active_file.close()
+                self._active_file = None
+                self._write_manifest()
+            self._opened = False
+        with self._lock:
+            if self._lock_fd is not None and not self._lock_depth:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+    def _drop_segments(self, count: int):
+        for segment in self.segments[:count]:
+            try:
+                os.remove(self._segment_path(segment.name))
+            except FileNotFoundError:
+                pass
+        self.segments = self.segments[count:]
+
+    def compact(self, before: datetime) -> int:
+        """Remove events older than ``before``; returns the number removed.
+
+        Whole segments are unlinked; only the segment straddling the cutoff
+        is rewritten. The active segment is sealed first so it can be compacted
+        like any other.
+        """
+        self._check_writable()
+        cutoff = before.isoformat()
+        removed = 0
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+            if self._active_count:
+                self._rollover()
+
+            expired = 0
+            for segment in self.segments:
+                if segment.last_timestamp and segment.last_timestamp < cutoff:
+                    expired += 1
+                    removed += segment.count
+                else:
+                    break
+            self._drop_segments(expired)
+
+            if self.segments and self.segments[0].first_timestamp < cutoff:
+                segment = self.segments[0]
+                events = [e for e in self._read_segment(segment.name)
+                          if e.get("timestamp", "") >= cutoff]
+                removed += segment.count - len(events)
+                if events:
+                    self._rewrite_segment(segment.name, events)
+                    self.segments[0] = self._segment_info(segment.name, events)
+                else:
+                    self._drop_segments(1)
+
+            # Tells other writers their segments may have been rewritten
+            self._compacted_before = max(self._compacted_before, cutoff)
+            self._write_manifest()
+            retained = [e for e in self.ring if e.get("timestamp", "") >= cutoff]
+            self.ring.clear()
+            self.ring.extend(retained)
+            self._notify("on_compact", cutoff)
+            self._notify("on_reload", retained)
+        return removed
+
+    def _rewrite_segment(self, name: str, events: List[Dict[str, Any]]):
+        path = self._segment_path(name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for event in events:
+                f.write((json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return the most recent events from the ring buffer, oldest first."""
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+            if limit <= 0:
+                return []
+            events = list(self.ring)
+        return events[-limit:]
+
+    def iter_events(self, after_seq: int = 0, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over every stored event with ``seq > after_seq``, oldest first.
+
+        If ``since`` (an ISO timestamp) is given, only events at or after it
+        are returned and older sealed segments are skipped without reading.
+        """
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+            names = [s.name for s in self.segments
+                     if s.last_seq > after_seq and not (since and s.last_timestamp and s.last_timestamp < since)]
+            names.append(self._active_name)
+            if self.read_only and os.path.isdir(self.directory):
+                # The writer may have rolled over since we opened; pick up newer segments
+                names += [name for name in self._list_segment_names() if name > self._active_name]
+        for name in names:
+            try:
+                events = self._read_segment(name)
+            except FileNotFoundError:
+                continue
+            for event in events:
+                if event.get("seq", 0) > after_seq and not (since and event.get("timestamp", "") < since):
+                    yield event
+
+    def count(self) -> int:
+        """Total number of events currently stored on disk."""
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+            return sum(segment.count for segment in self.segments) + self._active_count
+
+    @property
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._next_seq - 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics."""
+        with self._locked():
+            if not self._opened:
+                self.open()
+            self._refresh()
+            return {
+                "directory": self.directory,
+                "stored_events": self.count(),
+                "segments": len(self.segments) + 1,
+                "active_segment": self._active_name,
+                "active_segment_bytes": self._active_bytes,
+                "ring_size": len(self.ring),
+                "last_seq": self._next_seq - 1,
+                "last_updated": self.last_updated,
+            }
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+    def import_legacy_log(self, legacy_file: str) -> int:
+        """Import events from the old single-file ``event-log.json`` format.
+
+        Only runs against an empty store; the legacy file is renamed afterwards
+        so the import happens once.
+        """
+        if self.read_only or not os.path.exists(legacy_file):
+            return 0
+        with self._locked():
+            if not self._opened:
+                self.open()
+            if self._next_seq > 1:
+                return 0
+            try:
+                with open(legacy_file, "r") as f:
+                    events = json.load(f).get("events", [])
+            except Exception as e:
+                logger.error(f"Error reading legacy event log {legacy_file}: {e}")
+                return 0
+            for event in events:
+                event.pop("seq", None)
+                self.append(event)
+            self._sync()
+            os.replace(legacy_file, f"{legacy_file}.migrated")
+            logger.info(f"Imported {len(events)} events from {legacy_file}")
+            return len(events)
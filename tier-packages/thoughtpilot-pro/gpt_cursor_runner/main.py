@@ -5,9 +5,12 @@ GPT-Cursor Runner Main Application.
 Flask server for handling webhooks and providing API endpoints.
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import sys
-import psutil
 import socket
 from datetime import datetime
 from flask import Flask, request, jsonify
@@ -36,15 +39,8 @@ from gpt_cursor_runner.event_logger import event_logger
 # Import slack proxy for error handling
 from gpt_cursor_runner.slack_proxy import create_slack_proxy
 
-# Import GHOST 2.0 modules
-from gpt_cursor_runner.error_recovery import get_error_recovery
-from gpt_cursor_runner.rate_limiter import get_rate_limiter
-from gpt_cursor_runner.request_validator import get_request_validator
-from gpt_cursor_runner.audit_logger import get_audit_logger
-from gpt_cursor_runner.server_fixes import get_server_fixes
-from gpt_cursor_runner.error_handler import get_error_handler
-from gpt_cursor_runner.health_endpoints import get_health_endpoints
-from gpt_cursor_runner.cors_config import get_cors_manager
+# GHOST 2.0 subsystems are imported and built on first use
+from gpt_cursor_runner.component_registry import get_component, get_registry
 
 # Import dashboard
 try:
@@ -60,6 +56,8 @@ app = Flask(__name__)
 if create_dashboard_routes:
     create_dashboard_routes(app)
 
+_IMPORT_MS = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)
+
 @app.route("/webhook", methods=["POST"])
 def webhook():
     """Handle incoming webhook requests."""
@@ -201,21 +199,35 @@ def slack_test():
 
 @app.route("/events", methods=["GET"])
 def get_events():
-    """Get recent events for UI display."""
+    """Get recent events for UI display.
+
+    Filters: ``type``, ``event_type``, ``patch_id``, ``target_file`` and
+    ``since`` (ISO timestamp). Pass ``after=<event id>`` (e.g. the previous
+    response's ``next_cursor``) to fetch only newer events; if the cursor is
+    no longer known, ``cursor_reset`` is true and the newest events are
+    returned instead.
+    """
     try:
         limit = request.args.get("limit", 50, type=int)
-        event_type = request.args.get("type")
 
         if not event_logger:
             return jsonify({"error": "Event logging not available"}), 500
 
-        events = event_logger.get_recent_events(
-            limit, event_type if isinstance(event_type, str) and event_type else None
+        page = event_logger.query_events(
+            limit,
+            after=request.args.get("after") or None,
+            since=request.args.get("since") or None,
+            type=request.args.get("type") or None,
+            event_type=request.args.get("event_type") or None,
+            patch_id=request.args.get("patch_id") or None,
+            target_file=request.args.get("target_file") or None,
         )
         return jsonify(
             {
-                "events": events,
-                "count": len(events),
+                "events": page["events"],
+                "count": page["count"],
+                "next_cursor": page["next_cursor"],
+                "cursor_reset": page["cursor_reset"],
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -247,11 +259,18 @@ def get_patch_events():
         if not event_logger:
             return jsonify({"error": "Event logging not available"}), 500
 
-        events = event_logger.get_patch_events(limit)
+        page = event_logger.query_events(
+            limit,
+            after=request.args.get("after") or None,
+            type="patch_event",
+            event_type=request.args.get("event_type") or None,
+        )
         return jsonify(
             {
-                "events": events,
-                "count": len(events),
+                "events": page["events"],
+                "count": page["count"],
+                "next_cursor": page["next_cursor"],
+                "cursor_reset": page["cursor_reset"],
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -269,11 +288,18 @@ def get_slack_events():
         if not event_logger:
             return jsonify({"error": "Event logging not available"}), 500
 
-        events = event_logger.get_slack_events(limit)
+        page = event_logger.query_events(
+            limit,
+            after=request.args.get("after") or None,
+            type="slack_event",
+            event_type=request.args.get("event_type") or None,
+        )
         return jsonify(
             {
-                "events": events,
-                "count": len(events),
+                "events": page["events"],
+                "count": page["count"],
+                "next_cursor": page["next_cursor"],
+                "cursor_reset": page["cursor_reset"],
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -298,10 +324,8 @@ def health_check():
         # Ghost runner check
         ghost_found = False
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                if proc.info['cmdline'] and any("ghost-runner.js" in str(arg) for arg in proc.info['cmdline']):
-                    ghost_found = True
-                    break
+            from gpt_cursor_runner.process_table import get_process_table
+            ghost_found = bool(get_process_table().cmdline_contains("ghost-runner.js"))
         except Exception:
             pass
         
@@ -340,36 +364,8 @@ def health_check():
         
         # System metrics
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            network = psutil.net_io_counters()
-            
-            response['system_metrics'] = {
-                'cpu': {
-                    'count': psutil.cpu_count(),
-                    'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0],
-                    'percent': cpu_percent
-                },
-                'memory': {
-                    'total': memory.total,
-                    'available': memory.available,
-                    'percent': memory.percent,
-                    'used': memory.used
-                },
-                'disk': {
-                    'total': disk.total,
-                    'used': disk.used,
-                    'free': disk.free,
-                    'percent': (disk.used / disk.total) * 100
-                },
-                'network': {
-                    'bytes_sent': network.bytes_sent,
-                    'bytes_recv': network.bytes_recv,
-                    'packets_sent': network.packets_sent,
-                    'packets_recv': network.packets_recv
-                }
-            }
+            from gpt_cursor_runner.metrics_sampler import get_metrics_sampler
+            response['system_metrics'] = get_metrics_sampler().get_snapshot().to_dict()
         except Exception as e:
             response['system_metrics'] = {'error': str(e)}
         
@@ -411,8 +407,8 @@ def api_patches():
                 "api_patches_received", {"source": "ghost_bridge", "data": data}
             )
 
-        # Process the patch data
-        result = process_hybrid_block(data)
+        # Process the patch data (get_json cached the body, so this is no copy)
+        result = process_hybrid_block(data, raw_body=request.get_data())
         return jsonify({"status": "success", "result": result})
 
     except Exception as e:
@@ -433,6 +429,110 @@ def api_patches():
         return jsonify({"error": error_msg}), 500
 
 
+@app.route("/api/patches/batch", methods=["POST"])
+def api_patches_batch():
+    """Apply a batch of patches, one read/backup/write per target file.
+
+    Accepts either a JSON list of patches or
+    ``{"patches": [...], "dry_run": false, "force": false}``.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+
+        options = data if isinstance(data, dict) else {}
+        patches = data if isinstance(data, list) else data.get("patches")
+        if not isinstance(patches, list) or not all(isinstance(p, dict) for p in patches):
+            return jsonify({"error": "Expected a list of patch objects"}), 400
+
+        if event_logger:
+            event_logger.log_system_event(
+                "api_patches_batch_received",
+                {"count": len(patches), "patch_ids": [p.get("id") for p in patches]},
+            )
+
+        from gpt_cursor_runner.patch_runner import apply_patches
+
+        results = apply_patches(
+            patches,
+            dry_run=bool(options.get("dry_run", False)),
+            force=bool(options.get("force", False)),
+        )
+        applied = len([r for r in results if r.get("success")])
+        return jsonify(
+            {
+                "status": "success" if applied == len(results) else "partial",
+                "applied": applied,
+                "failed": len(results) - applied,
+                "results": results,
+            }
+        )
+
+    except Exception as e:
+        error_msg = f"Error applying patch batch: {str(e)}"
+        if event_logger:
+            event_logger.log_system_event("api_patches_batch_error", {"error": str(e)})
+        try:
+            from gpt_cursor_runner.slack_proxy import create_slack_proxy
+
+            slack_proxy = create_slack_proxy()
+            slack_proxy.notify_error(error_msg, context="/api/patches/batch endpoint")
+        except Exception:
+            pass
+        return jsonify({"error": error_msg}), 500
+
+
+@app.route("/api/patches/<patch_id>/delivery", methods=["GET"])
+def api_patch_delivery(patch_id):
+    """Delivery status of a patch accepted by the webhook."""
+    try:
+        from gpt_cursor_runner.patch_outbox import get_patch_outbox
+        
+        record = get_patch_outbox().status(patch_id)
+        if record is None:
+            return jsonify({"error": "Patch not found in outbox"}), 404
+        
+        return jsonify(record)
+        
+    except Exception as e:
+        return jsonify({"error": f"Outbox unavailable: {str(e)}"}), 500
+
+
+@app.route("/api/outbox", methods=["GET"])
+def api_outbox():
+    """Outbox statistics and dead letters."""
+    try:
+        from gpt_cursor_runner.patch_outbox import get_outbox_dispatcher
+        
+        dispatcher = get_outbox_dispatcher()
+        return jsonify({
+            "stats": dispatcher.get_stats(),
+            "dead_letters": dispatcher.outbox.dead_letters(request.args.get("limit", 50, type=int)),
+            "timestamp": datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify({"error": f"Outbox unavailable: {str(e)}"}), 500
+
+
+@app.route("/api/outbox/<int:entry_id>/retry", methods=["POST"])
+def api_outbox_retry(entry_id):
+    """Requeue a dead-lettered outbox entry."""
+    try:
+        from gpt_cursor_runner.patch_outbox import get_outbox_dispatcher
+        
+        dispatcher = get_outbox_dispatcher()
+        if not dispatcher.outbox.requeue(entry_id):
+            return jsonify({"error": "Dead letter not found"}), 404
+        dispatcher.start()
+        dispatcher.wake()
+        return jsonify({"id": entry_id, "status": "pending"})
+        
+    except Exception as e:
+        return jsonify({"error": f"Outbox unavailable: {str(e)}"}), 500
+
+
 @app.route("/api/summaries", methods=["POST"])
 def api_summaries():
     """Handle summary data from ghost bridge."""
@@ -480,15 +580,29 @@ def api_status():
             "endpoints": {
                 "webhook": "/webhook",
                 "patches": "/api/patches",
+                "patches_batch": "/api/patches/batch",
+                "patch_delivery": "/api/patches/<patch_id>/delivery",
+                "outbox": "/api/outbox",
                 "summaries": "/api/summaries",
                 "health": "/health",
                 "events": "/events",
                 "resources": "/api/resources",
+                "scheduler": "/api/scheduler",
             },
+            "forwarding": _forwarding_stats(),
         }
     )
 
 
+def _forwarding_stats():
+    """Connection pool and circuit breaker stats for Ghost Runner forwarding."""
+    try:
+        from gpt_cursor_runner.forwarding_client import get_forwarding_client
+        return get_forwarding_client().get_stats()
+    except Exception as e:
+        return {"error": str(e)}
+
+
 @app.route("/api/resources", methods=["GET"])
 def api_resources():
     """Resource monitoring endpoint."""
@@ -513,12 +627,14 @@ def api_processes():
     """Process management endpoint."""
     try:
         from gpt_cursor_runner.process_cleanup import get_process_cleanup
+        from gpt_cursor_runner.process_table import get_process_table
         
         process_cleanup = get_process_cleanup()
         process_data = {
             'processes': process_cleanup.get_process_list(),
             'cleanup_history': process_cleanup.get_cleanup_history(),
-            'stats': process_cleanup.get_stats()
+            'stats': process_cleanup.get_stats(),
+            'process_table': get_process_table().get_stats()
         }
         
         return jsonify(process_data)
@@ -559,7 +675,14 @@ def api_processor():
             except ValueError:
                 return jsonify({"error": f"Invalid request type: {request_type_str}"}), 400
             
-            request_id = processor.submit_request(request_type, request_data)
+            try:
+                request_id = processor.submit_request(
+                    request_type, request_data,
+                    priority=data.get('priority', 1),
+                    timeout=data.get('timeout', 30)
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
             return jsonify({
                 'request_id': request_id,
@@ -576,6 +699,69 @@ def api_processor():
         ), 500
 
 
+@app.route("/api/processor/dead-letters", methods=["GET"])
+def api_processor_dead_letters():
+    """Unified processor requests that failed permanently."""
+    try:
+        from gpt_cursor_runner.unified_processor import get_unified_processor, RequestType
+        
+        request_type = None
+        if request.args.get("type"):
+            try:
+                request_type = RequestType(request.args["type"])
+            except ValueError:
+                return jsonify({"error": f"Invalid request type: {request.args['type']}"}), 400
+        
+        processor = get_unified_processor()
+        return jsonify({
+            'dead_letters': processor.get_dead_letters(request.args.get("limit", 50, type=int), request_type),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify(
+            {
+                "error": f"Unified processor unavailable: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }
+        ), 500
+
+
+# Longest a client may long-poll /api/processor/<request_id>
+PROCESSOR_MAX_WAIT = 30.0
+
+
+@app.route("/api/processor/<request_id>", methods=["GET"])
+def api_processor_result(request_id):
+    """Get a unified processor result; ``?wait=N`` long-polls up to N seconds for completion.
+
+    Results live in the memory of the worker process that accepted the
+    request, so under ``serve --workers N`` a poll landing on another worker
+    gets 404.
+    """
+    try:
+        from gpt_cursor_runner.unified_processor import get_unified_processor
+        
+        wait = min(max(request.args.get("wait", 0.0, type=float), 0.0), PROCESSOR_MAX_WAIT)
+        result = get_unified_processor().get_result(request_id, timeout=wait)
+        
+        if result is None:
+            return jsonify({
+                "error": "Request not found",
+                "hint": "Results are kept by the worker process that accepted the request"
+            }), 404
+        
+        return jsonify(result.to_dict()), 200 if result.finished else 202
+        
+    except Exception as e:
+        return jsonify(
+            {
+                "error": f"Unified processor unavailable: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            }
+        ), 500
+
+
 @app.route("/api/sequential", methods=["GET", "POST"])
 def api_sequential():
     """Sequential processor endpoint."""
@@ -600,7 +786,10 @@ def api_sequential():
             request_data = data.get('data', {})
             priority = data.get('priority', 1)
             
-            request_id = processor.submit_request(workflow_name, request_data, priority)
+            try:
+                request_id = processor.submit_request(workflow_name, request_data, priority)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
             return jsonify({
                 'request_id': request_id,
@@ -645,7 +834,7 @@ def api_sequential_status(request_id):
 def api_errors():
     """Get error recovery information."""
     try:
-        error_recovery = get_error_recovery()
+        error_recovery = get_component("error_recovery")
         stats = error_recovery.get_error_stats()
         recent_errors = error_recovery.get_recent_errors()
         
@@ -661,7 +850,7 @@ def api_errors():
 def api_rate_limits():
     """Get rate limiting information."""
     try:
-        rate_limiter = get_rate_limiter()
+        rate_limiter = get_component("rate_limiter")
         stats = rate_limiter.get_stats()
         
         return jsonify(stats)
@@ -680,7 +869,7 @@ def api_validation():
         request_type = data.get("type", "api")
         request_data = data.get("data", {})
         
-        validator = get_request_validator()
+        validator = get_component("request_validator")
         report = validator.validate_request(request_type, request_data)
         
         return jsonify({
@@ -711,7 +900,7 @@ def api_validation():
 def api_audit():
     """Get audit log information."""
     try:
-        audit_logger = get_audit_logger()
+        audit_logger = get_component("audit_logger")
         stats = audit_logger.get_stats()
         recent_entries = audit_logger.get_entries(limit=50)
         
@@ -727,7 +916,7 @@ def api_audit():
 def api_server_fixes():
     """Get server fixes information."""
     try:
-        server_fixes = get_server_fixes()
+        server_fixes = get_component("server_fixes")
         stats = server_fixes.get_stats()
         issues = server_fixes.get_issues()
         
@@ -743,7 +932,7 @@ def api_server_fixes():
 def api_error_handler():
     """Get error handler information."""
     try:
-        error_handler = get_error_handler()
+        error_handler = get_component("error_handler")
         stats = error_handler.get_stats()
         errors = error_handler.get_errors()
         
@@ -759,7 +948,7 @@ def api_error_handler():
 def api_health_endpoints():
     """Get health endpoints information."""
     try:
-        health_endpoints = get_health_endpoints()
+        health_endpoints = get_component("health_endpoints")
         summary = health_endpoints.get_health_summary()
         history = health_endpoints.get_health_history(hours=1)
         
@@ -775,7 +964,7 @@ def api_health_endpoints():
 def api_cors():
     """Get CORS configuration information."""
     try:
-        cors_manager = get_cors_manager()
+        cors_manager = get_component("cors_manager")
         stats = cors_manager.get_stats()
         history = cors_manager.get_request_history(hours=1)
         
@@ -787,116 +976,103 @@ def api_cors():
         return jsonify({"error": f"Error getting CORS info: {str(e)}"}), 500
 
 
-def main():
-    """Main entry point."""
-    # Start health aggregator
-    try:
-        from gpt_cursor_runner.health_aggregator import get_health_aggregator
-        health_agg = get_health_aggregator()
-        health_agg.start()
-        print("🏥 Health aggregator started")
-    except Exception as e:
-        print(f"⚠️  Health aggregator failed to start: {e}")
-    
-    # Start resource monitor
-    try:
-        from gpt_cursor_runner.resource_monitor import get_resource_monitor
-        resource_monitor = get_resource_monitor()
-        resource_monitor.start()
-        print("📊 Resource monitor started")
-    except Exception as e:
-        print(f"⚠️  Resource monitor failed to start: {e}")
-    
-    # Start process cleanup
-    try:
-        from gpt_cursor_runner.process_cleanup import get_process_cleanup
-        process_cleanup = get_process_cleanup()
-        process_cleanup.start()
-        print("🧹 Process cleanup started")
-    except Exception as e:
-        print(f"⚠️  Process cleanup failed to start: {e}")
-    
-    # Start unified processor
-    try:
-        from gpt_cursor_runner.unified_processor import get_unified_processor
-        unified_processor = get_unified_processor()
-        unified_processor.start()
-        print("⚙️  Unified processor started")
-    except Exception as e:
-        print(f"⚠️  Unified processor failed to start: {e}")
-    
-    # Start sequential processor
-    try:
-        from gpt_cursor_runner.sequential_processor import get_sequential_processor
-        sequential_processor = get_sequential_processor()
-        sequential_processor.start()
-        print("🔄 Sequential processor started")
-    except Exception as e:
-        print(f"⚠️  Sequential processor failed to start: {e}")
-    
-    # Start error recovery
-    try:
-        error_recovery = get_error_recovery()
-        error_recovery.start()
-        print("🛠️  Error recovery started")
-    except Exception as e:
-        print(f"⚠️  Error recovery failed to start: {e}")
-    
-    # Start rate limiter
+@app.route("/api/scheduler", methods=["GET"])
+def api_scheduler():
+    """Background job schedule and per-job run-time histograms."""
     try:
-        rate_limiter = get_rate_limiter()
-        rate_limiter.start()
-        print("🚦 Rate limiter started")
+        from gpt_cursor_runner.scheduler import get_scheduler
+        return jsonify(dict(get_scheduler().get_stats(), timestamp=datetime.now().isoformat()))
     except Exception as e:
-        print(f"⚠️  Rate limiter failed to start: {e}")
+        return jsonify({"error": f"Scheduler unavailable: {str(e)}"}), 500
+
+
+def start_services(worker: bool = True, host_wide: bool = True):
+    """Start the runner's components in this process.
+
+    ``worker`` covers components every serving process needs (processors,
+    rate limiter, audit and error handling); ``host_wide`` covers background
+    loops that must run once per host (monitors, process cleanup, outbox
+    delivery). The dev server starts both; under ``serve`` each worker
+    starts its own components and only the primary worker the host-wide ones.
+    """
+    get_registry().start_manifest(worker=worker, host_wide=host_wide)
+
+
+def stop_services():
+    """Stop started components and drain queued work (events, logs, outbox)."""
+    get_registry().stop_all()
+    from gpt_cursor_runner.scheduler import shutdown_scheduler
+    shutdown_scheduler()
+    # Drain the background event writer so queued events are not lost
+    event_logger.flush()
+    event_logger.close()
+    from gpt_cursor_runner.patch_pool import shutdown_patch_pool
+    shutdown_patch_pool()
+    from gpt_cursor_runner.structured_logging import shutdown_request_logging
+    shutdown_request_logging()
+
+
+def profile_startup() -> int:
+    """Start all components, print where startup time goes, then stop them."""
+    started = time.perf_counter()
+    start_services()
+    startup_ms = (time.perf_counter() - started) * 1000
+    profile = get_registry().get_profile()
+    stop_services()
     
-    # Start request validator
-    try:
-        request_validator = get_request_validator()
-        print("✅ Request validator initialized")
-    except Exception as e:
-        print(f"⚠️  Request validator failed to initialize: {e}")
+    print("\n⏱️  Startup profile (ms)")
+    print(f"{'component':<22}{'import':>10}{'init':>10}{'start':>10}")
+    print(f"{'gpt_cursor_runner.main':<22}{_IMPORT_MS:>10.1f}{'-':>10}{'-':>10}")
+    for name, timing in sorted(profile["components"].items(),
+                               key=lambda item: -sum(v for k, v in item[1].items() if k.endswith("_ms"))):
+        print(f"{name:<22}{timing.get('import_ms', 0):>10.1f}{timing.get('init_ms', 0):>10.1f}"
+              f"{timing.get('start_ms', 0):>10.1f}")
+    print(f"{'total':<22}{_IMPORT_MS + startup_ms:>10.1f}")
+    return 0
+
+
+def main(argv=None):
+    """Main entry point."""
+    import argparse
     
-    # Start audit logger
-    try:
-        audit_logger = get_audit_logger()
-        audit_logger.start()
-        print("📝 Audit logger started")
-    except Exception as e:
-        print(f"⚠️  Audit logger failed to start: {e}")
+    parser = argparse.ArgumentParser(prog="gpt-cursor-runner", description=__doc__)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Start every component, print import/init/start times and exit")
+    subcommands = parser.add_subparsers(dest="command")
+    subcommands.add_parser("dev", help="Run the Flask development server (default)")
+    serve_parser = subcommands.add_parser("serve", help="Run the production server (gunicorn, gthread workers)")
+    serve_parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                              help="Worker processes (default: $WEB_CONCURRENCY or 1)")
+    serve_parser.add_argument("--threads", type=int, default=int(os.getenv("PYTHON_THREADS", "8")),
+                              help="Request threads per worker (default: 8)")
+    serve_parser.add_argument("--bind", default=None,
+                              help="Address to bind (default: 0.0.0.0:$PYTHON_PORT)")
+    serve_parser.add_argument("--timeout", type=int, default=60,
+                              help="Seconds before a silent worker is restarted")
+    serve_parser.add_argument("--graceful-timeout", type=int, default=30,
+                              help="Seconds workers get to drain on SIGTERM")
+    serve_parser.add_argument("--asgi", action="store_true",
+                              help="Serve the async ingestion routes on uvicorn workers")
+    args = parser.parse_args(argv)
     
-    # Start server fixes
-    try:
-        server_fixes = get_server_fixes()
-        server_fixes.start()
-        print("🔧 Server fixes started")
-    except Exception as e:
-        print(f"⚠️  Server fixes failed to start: {e}")
+    port = int(os.getenv("PYTHON_PORT", 5051))
     
-    # Start error handler
-    try:
-        error_handler = get_error_handler()
-        error_handler.start()
-        print("🚨 Error handler started")
-    except Exception as e:
-        print(f"⚠️  Error handler failed to start: {e}")
+    if args.profile_startup:
+        return profile_startup()
     
-    # Start health endpoints
-    try:
-        health_endpoints = get_health_endpoints()
-        health_endpoints.start()
-        print("🏥 Health endpoints started")
-    except Exception as e:
-        print(f"⚠️  Health endpoints failed to start: {e}")
+    if args.command == "serve":
+        from gpt_cursor_runner.server import serve
+        return serve(
+            bind=args.bind or f"0.0.0.0:{port}",
+            workers=args.workers,
+            threads=args.threads,
+            timeout=args.timeout,
+            graceful_timeout=args.graceful_timeout,
+            asgi=args.asgi,
+        )
     
-    # Start CORS manager
-    try:
-        cors_manager = get_cors_manager()
-        print("🌐 CORS manager initialized")
-    except Exception as e:
-        print(f"⚠️  CORS manager failed to initialize: {e}")
+    start_services()
     
-    port = int(os.getenv("PYTHON_PORT", 5051))
     print(f"🚀 Starting GPT-Cursor Runner on port {port}")
     print(f"📡 Webhook endpoint: http://localhost:{port}/webhook")
     print(f"📊 Dashboard: http://localhost:{port}/dashboard")
@@ -907,6 +1083,7 @@ def main():
     print(f"🧹 Processes endpoint: http://localhost:{port}/api/processes")
     print(f"⚙️  Processor endpoint: http://localhost:{port}/api/processor")
     print(f"🔄 Sequential endpoint: http://localhost:{port}/api/sequential")
+    print(f"📮 Outbox endpoint: http://localhost:{port}/api/outbox")
     print(f"🛠️  Errors endpoint: http://localhost:{port}/api/errors")
     print(f"🚦 Rate limits endpoint: http://localhost:{port}/api/rate-limits")
     print(f"✅ Validation endpoint: http://localhost:{port}/api/validation")
@@ -915,9 +1092,15 @@ def main():
     print(f"🚨 Error handler endpoint: http://localhost:{port}/api/error-handler")
     print(f"🏥 Health endpoints: http://localhost:{port}/api/health-endpoints")
     print(f"🌐 CORS endpoint: http://localhost:{port}/api/cors")
+    print(f"⏱️  Scheduler endpoint: http://localhost:{port}/api/scheduler")
     print("🔗 Supports: GPT hybrid blocks + Slack events + GHOST 2.0")
-    app.run(host="0.0.0.0", port=port, debug=True)
+    try:
+        # No reloader: it re-runs main() in a child process, so the watcher parent and
+        # the child would both start the host-wide loops (outbox delivery, monitors)
+        app.run(host="0.0.0.0", port=port, debug=True, use_reloader=False)
+    finally:
+        stop_services()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Metrics Sampler for GPT-Cursor Runner.
+
+Provides one shared, timestamped snapshot of system metrics (CPU, memory,
+disk, network) for the health and monitoring components, refreshed on a
+fixed cadence by the shared scheduler so readers never block on psutil.
+"""
+
+import os
+import time
+import psutil
+import threading
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+from .scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SystemSnapshot:
+    """System metrics captured at one point in time."""
+    timestamp: datetime
+    cpu_percent: float
+    cpu_count: int
+    load_average: Optional[tuple]
+    memory: Dict[str, Any] = field(default_factory=dict)
+    disk: Dict[str, Any] = field(default_factory=dict)
+    network: Dict[str, Any] = field(default_factory=dict)
+
+    def age_seconds(self) -> float:
+        return (datetime.now() - self.timestamp).total_seconds()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The snapshot in the ``system_metrics`` shape used by the health endpoints."""
+        return {
+            'cpu': {
+                'percent': self.cpu_percent,
+                'count': self.cpu_count,
+                'load_average': self.load_average
+            },
+            'memory': dict(self.memory),
+            'disk': dict(self.disk),
+            'network': dict(self.network),
+            'sampled_at': self.timestamp.isoformat(),
+            'age_seconds': round(self.age_seconds(), 1)
+        }
+
+
+class MetricsSampler:
+    """Samples system metrics on a fixed cadence into a shared snapshot.
+
+    CPU usage comes from ``psutil.cpu_percent(None)``, i.e. the utilisation
+    since the previous sample, so a sample costs a few syscalls instead of a
+    one-second sleep. Readers get the latest snapshot; if it is older than
+    ``max_age`` (e.g. the sampler isn't running in this process) it is
+    refreshed inline, which is just as cheap.
+    """
+
+    # Shortest window worth computing a CPU delta over, in seconds
+    MIN_CPU_WINDOW = 0.1
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self.max_age = interval * 2
+        self.cpu_count = psutil.cpu_count()
+        self._lock = threading.Lock()
+        self._snapshot: Optional[SystemSnapshot] = None
+        self._cpu_percent = 0.0
+        # Prime the CPU counters so the first real sample has a baseline
+        psutil.cpu_percent(None)
+        self._cpu_read_at = time.monotonic()
+
+    def start(self):
+        """Schedule sampling on the shared scheduler."""
+        self.sample()
+        get_scheduler().add_job("metrics_sampler", self.sample, self.interval, jitter=0.0)
+        logger.info("Metrics sampler started")
+
+    def stop(self):
+        """Remove sampling from the shared scheduler."""
+        if get_scheduler().remove_job("metrics_sampler"):
+            logger.info("Metrics sampler stopped")
+
+    def _read_cpu_percent(self) -> float:
+        # A delta over a few microseconds is noise; keep the last reading
+        # until the window since the previous one is worth measuring
+        now = time.monotonic()
+        if now - self._cpu_read_at >= self.MIN_CPU_WINDOW:
+            self._cpu_percent = psutil.cpu_percent(None)
+            self._cpu_read_at = now
+        return self._cpu_percent
+
+    def sample(self) -> SystemSnapshot:
+        """Take a new snapshot and publish it."""
+        with self._lock:
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_usage('/')
+            network = psutil.net_io_counters()
+            snapshot = SystemSnapshot(
+                timestamp=datetime.now(),
+                cpu_percent=self._read_cpu_percent(),
+                cpu_count=self.cpu_count,
+                load_average=os.getloadavg() if hasattr(os, 'getloadavg') else None,
+                memory={
+                    'total': memory.total,
+                    'available': memory.available,
+                    'percent': memory.percent,
+                    'used': memory.used,
+                    'free': memory.free
+                },
+                disk={
+                    'total': disk.total,
+                    'used': disk.used,
+                    'free': disk.free,
+                    'percent': (disk.used / disk.total) * 100
+                },
+                network={
+                    'bytes_sent': network.bytes_sent,
+                    'bytes_recv': network.bytes_recv,
+                    'packets_sent': network.packets_sent,
+                    'packets_recv': network.packets_recv
+                }
+            )
+            self._snapshot = snapshot
+            return snapshot
+
+    def get_snapshot(self) -> SystemSnapshot:
+        """The latest snapshot, refreshed first if missing or stale."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.age_seconds() > self.max_age:
+            snapshot = self.sample()
+        return snapshot
+
+
+_metrics_sampler: Optional[MetricsSampler] = None
+_metrics_sampler_lock = threading.Lock()
+
+
+def get_metrics_sampler() -> MetricsSampler:
+    """Get the global metrics sampler (``METRICS_SAMPLE_INTERVAL``, default 5s)."""
+    global _metrics_sampler
+    with _metrics_sampler_lock:
+        if _metrics_sampler is None:
+            _metrics_sampler = MetricsSampler(interval=float(os.getenv("METRICS_SAMPLE_INTERVAL", "5")))
+        return _metrics_sampler
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Scheduler for GPT-Cursor Runner.
+
+Provides one shared scheduler for periodic background jobs (monitoring,
+cleanup, recovery): a timer heap on a single thread that hands due jobs to a
+small worker pool, with per-job jitter, overlap prevention and run-time
+histograms.
+"""
+
+import os
+import heapq
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RunTimeHistogram:
+    """Cumulative run-time histogram with fixed millisecond buckets."""
+
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        index = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if duration_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS_MS, self.counts):
+            cumulative += count
+            buckets[f"le_{bound}ms"] = cumulative
+        buckets["inf"] = self.count
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "buckets": buckets,
+        }
+
+
+class Job:
+    """A periodic (or, with ``once``, one-shot) job and its run statistics."""
+
+    def __init__(self, name: str, func: Callable[[], Any], interval: float, jitter: float,
+                 once: bool = False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.once = once
+        self.next_run = 0.0
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_started: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.histogram = RunTimeHistogram()
+        # Matches the job's live heap entry; bumped when it is removed or replaced
+        self.seq = 0
+
+    def delay(self) -> float:
+        """Interval with +/- ``jitter`` (a fraction of the interval) applied."""
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "jitter": self.jitter,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_overlaps": self.skipped,
+            "last_started": self.last_started.isoformat() if self.last_started else None,
+            "next_run_in": round(max(0.0, self.next_run - time.monotonic()), 1),
+            "last_error": self.last_error,
+            "run_time_ms": self.histogram.to_dict(),
+        }
+
+
+class Scheduler:
+    """Runs periodic jobs from one timer thread and a small worker pool.
+
+    A job that is still running when it comes due again is skipped for that
+    round rather than run concurrently with itself. Jobs are rescheduled
+    from their due time, so a slow run doesn't push later runs back.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+
+    def start(self):
+        """Start the timer thread (idempotent)."""
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler-job")
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="scheduler")
+            self._thread.start()
+            logger.info("Scheduler started")
+
+    def stop(self, wait: bool = True):
+        """Stop the timer thread; with ``wait``, let running jobs finish."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        if thread:
+            thread.join(timeout=5)
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Scheduler stopped")
+
+    def _push(self, job: Job, run_at: float):
+        self._seq += 1
+        job.seq = self._seq
+        job.next_run = run_at
+        heapq.heappush(self._heap, (run_at, self._seq, job))
+        self._cond.notify_all()
+
+    def add_job(self, name: str, func: Callable[[], Any], interval: float, jitter: float = 0.1,
+                initial_delay: Optional[float] = None) -> Job:
+        """Run ``func`` every ``interval`` seconds, replacing any job of the same name.
+
+        The first run happens after ``initial_delay`` seconds (default: a
+        random fraction of ``jitter * interval``, so jobs registered together
+        don't all fire at once). Starts the scheduler if needed.
+        """
+        job = Job(name, func, interval, jitter)
+        if initial_delay is None:
+            initial_delay = random.uniform(0, jitter * interval)
+        with self._cond:
+            previous = self._jobs.get(name)
+            if previous:
+                previous.seq = -1
+            self._jobs[name] = job
+            self._push(job, time.monotonic() + initial_delay)
+        self.start()
+        return job
+
+    def call_later(self, delay: float, func: Callable[[], Any], name: str = "call_later") -> Job:
+        """Run ``func`` once after ``delay`` seconds; ``cancel`` stops it if not yet run.
+
+        One-shot jobs aren't listed in ``get_stats``. Starts the scheduler if needed.
+        """
+        job = Job(name, func, 0.0, 0.0, once=True)
+        with self._cond:
+            self._push(job, time.monotonic() + max(delay, 0.0))
+        self.start()
+        return job
+
+    def cancel(self, job: Job):
+        """Unschedule a job returned by ``call_later`` or ``add_job``."""
+        with self._cond:
+            if self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+            job.seq = -1
+
+    def remove_job(self, name: str) -> bool:
+        """Unschedule a job; a run already in progress is allowed to finish."""
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            job.seq = -1
+            return True
+
+    def _loop(self):
+        with self._cond:
+            while not self._stopping:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                run_at, seq, job = self._heap[0]
+                if seq != job.seq:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = run_at - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                if job.running:
+                    job.skipped += 1
+                    logger.debug(f"Skipping {job.name}: previous run still in progress")
+                else:
+                    job.running = True
+                    self._executor.submit(self._run, job)
+                if job.once:
+                    job.seq = -1
+                else:
+                    self._push(job, max(time.monotonic(), run_at + job.delay()))
+
+    def _run(self, job: Job):
+        started = time.perf_counter()
+        job.last_started = datetime.now()
+        try:
+            job.func()
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+        finally:
+            job.histogram.observe((time.perf_counter() - started) * 1000)
+            job.runs += 1
+            job.running = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            jobs = dict(self._jobs)
+            running = bool(self._thread and self._thread.is_alive())
+        return {
+            "running": running,
+            "workers": self.workers,
+            "jobs": {name: job.get_stats() for name, job in sorted(jobs.items())},
+        }
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Get the global scheduler (``SCHEDULER_WORKERS``, default 2)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler(workers=int(os.getenv("SCHEDULER_WORKERS", "2")))
+        return _scheduler
+
+
+def shutdown_scheduler():
+    """Stop the global scheduler if it was created."""
+    with _scheduler_lock:
+        scheduler = _scheduler
+    if scheduler is not None:
+        scheduler.stop()
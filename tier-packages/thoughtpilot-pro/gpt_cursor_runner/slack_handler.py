@@ -16,11 +16,7 @@ try:
 except ImportError:
     event_logger = None
 
-try:
-    from .slack_proxy import create_slack_proxy
-    slack_proxy = create_slack_proxy()
-except ImportError:
-    slack_proxy = None
+from .slack_proxy import get_slack_proxy
 
 
 def verify_slack_signature(request_body: bytes, signature: str, timestamp: str) -> bool:
@@ -44,8 +40,13 @@ def verify_slack_signature(request_body: bytes, signature: str, timestamp: str)
     return hmac.compare_digest(expected_signature, signature)
 
 
-def handle_slack_command(request_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle Slack slash command."""
+def handle_slack_command(request_data: Dict[str, Any], notifier=None) -> Dict[str, Any]:
+    """Handle Slack slash command.
+
+    ``notifier`` replaces the module's Slack proxy for notifications, e.g. to
+    send them without blocking the caller.
+    """
+    notifier = notifier or get_slack_proxy()
     command = request_data.get("command", "")
     text = request_data.get("text", "")
     user_id = request_data.get("user_id", "")
@@ -66,16 +67,17 @@ def handle_slack_command(request_data: Dict[str, Any]) -> Dict[str, Any]:
     # Handle /status-runner
     if command == "/status-runner":
         response = {"text": "Runner status operational"}
-        if slack_proxy:
-            slack_proxy.notify_status("Runner status operational", health_score=100)
+        if notifier:
+            notifier.notify_status("Runner status operational", health_score=100)
         return response
     
     # Add more command handlers as needed
     return {"text": f"Unknown command: {command}"}
 
 
-def handle_slack_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
+def handle_slack_event(event_data: Dict[str, Any], notifier=None) -> Dict[str, Any]:
     """Handle Slack event (e.g., app_mention, message)."""
+    notifier = notifier or get_slack_proxy()
     event_type = event_data.get("type", "")
     user_id = event_data.get("user", "")
     channel_id = event_data.get("channel", "")
@@ -95,8 +97,8 @@ def handle_slack_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
     # Example: respond to app_mention
     if event_type == "app_mention":
         response = {"text": f"Hello <@{user_id}>! How can I help you?"}
-        if slack_proxy:
-            slack_proxy.notify_command_executed("app_mention", user_id, True)
+        if notifier:
+            notifier.notify_command_executed("app_mention", user_id, True)
         return response
     
     return {"text": "Event received."}
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Worker Pool for GPT-Cursor Runner.
+
+Provides an elastic pool of worker threads for the request processors:
+it starts at a minimum size, adds workers while queued work would wait
+longer than a target (judged from queue depth and observed handler
+latency), and lets workers that sit idle past a timeout exit again.
+"""
+
+import itertools
+import threading
+import time
+import logging
+from typing import Dict, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ElasticWorkerPool:
+    """Worker threads that grow and shrink between ``min_workers`` and ``max_workers``.
+
+    Workers loop on ``fetch(timeout)``, which returns the next item or
+    None when nothing arrived in time, and hand each item to ``process``.
+    ``depth()`` reports how much work is queued. The pool grows by one
+    worker when work is queued, no worker is idle to take it, and the
+    backlog (depth × average handler latency ÷ workers) would take longer
+    than ``scale_up_wait`` to drain; until a latency has been observed any
+    backlog counts. Call ``maybe_grow`` after queueing work; workers also
+    check after every item. A worker above ``min_workers`` that finds no
+    work for ``idle_timeout`` seconds exits.
+    """
+
+    # Weight of the newest latency sample in the moving average
+    LATENCY_ALPHA = 0.2
+
+    def __init__(self, name: str, fetch: Callable[[float], Optional[Any]],
+                 process: Callable[[Any], None], depth: Callable[[], int],
+                 min_workers: int = 1, max_workers: int = 8,
+                 idle_timeout: float = 30.0, scale_up_wait: float = 0.5,
+                 poll_interval: float = 1.0):
+        if min_workers < 1 or max_workers < min_workers:
+            raise ValueError(f"Invalid worker bounds for pool {name}: {min_workers}..{max_workers}")
+        self.name = name
+        self.fetch = fetch
+        self.process = process
+        self.depth = depth
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self.scale_up_wait = scale_up_wait
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._workers: Dict[int, threading.Thread] = {}
+        self._ids = itertools.count()
+        self._idle = 0
+        self._latency: Optional[float] = None
+        self._running = False
+        self._stats = {'spawned': 0, 'reaped': 0, 'processed': 0, 'errors': 0, 'peak_workers': 0}
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return len(self._workers)
+
+    def start(self):
+        """Start the pool with ``min_workers`` workers."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            while len(self._workers) < self.min_workers:
+                self._spawn_locked()
+        logger.info(f"Worker pool {self.name} started ({self.min_workers}-{self.max_workers} workers)")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all workers; each finishes the item it is processing first."""
+        with self._lock:
+            self._running = False
+            workers = list(self._workers.values())
+        for worker in workers:
+            if worker.is_alive() and worker is not threading.current_thread():
+                worker.join(timeout=timeout)
+        logger.info(f"Worker pool {self.name} stopped")
+
+    def maybe_grow(self) -> bool:
+        """Add a worker if queued work would otherwise wait too long; True if one was added."""
+        with self._lock:
+            if not self._running or len(self._workers) >= self.max_workers:
+                return False
+            depth = self.depth()
+            if depth <= self._idle:
+                return False
+            if self._latency is not None:
+                backlog = depth * self._latency / max(len(self._workers), 1)
+                if backlog < self.scale_up_wait:
+                    return False
+            self._spawn_locked()
+            return True
+
+    def _spawn_locked(self):
+        worker_id = next(self._ids)
+        worker = threading.Thread(target=self._worker_loop, args=(worker_id,), daemon=True,
+                                  name=f"{self.name}-{worker_id}")
+        self._workers[worker_id] = worker
+        self._stats['spawned'] += 1
+        self._stats['peak_workers'] = max(self._stats['peak_workers'], len(self._workers))
+        worker.start()
+
+    def _worker_loop(self, worker_id: int):
+        last_work = time.monotonic()
+        try:
+            while self._running:
+                with self._lock:
+                    self._idle += 1
+                try:
+                    item = self.fetch(self.poll_interval)
+                except Exception as e:
+                    logger.error(f"Error fetching work in pool {self.name}: {e}")
+                    item = None
+                finally:
+                    with self._lock:
+                        self._idle -= 1
+
+                if item is None:
+                    with self._lock:
+                        idle_for = time.monotonic() - last_work
+                        if idle_for >= self.idle_timeout and len(self._workers) > self.min_workers:
+                            del self._workers[worker_id]
+                            self._stats['reaped'] += 1
+                            return
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    self.process(item)
+                except Exception as e:
+                    logger.error(f"Error in worker pool {self.name}: {e}")
+                    with self._lock:
+                        self._stats['errors'] += 1
+                finally:
+                    elapsed = time.perf_counter() - started
+                    with self._lock:
+                        self._stats['processed'] += 1
+                        if self._latency is None:
+                            self._latency = elapsed
+                        else:
+                            self._latency += self.LATENCY_ALPHA * (elapsed - self._latency)
+                last_work = time.monotonic()
+                self.maybe_grow()
+        finally:
+            with self._lock:
+                self._workers.pop(worker_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, bounds, busy workers and handler latency."""
+        with self._lock:
+            workers = len(self._workers)
+            return {
+                'workers': workers,
+                'busy': workers - self._idle,
+                'min_workers': self.min_workers,
+                'max_workers': self.max_workers,
+                'avg_latency_ms': round(self._latency * 1000, 2) if self._latency is not None else None,
+                **self._stats
+            }
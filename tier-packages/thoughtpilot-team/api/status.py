@@ -1,7 +1,8 @@
 import os
 import json
 import time
-import subprocess
+import threading
+import psutil
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from flask import Flask, jsonify, request, Response
@@ -14,26 +15,53 @@ CORS(app)
 LOG_DIR = '/Users/sawyer/gitSync/.cursor-cache/CYOPS/logs'
 DAEMON_NAMES = ['ghostSentinelGuard', 'ghostWatchdogLoop', 'ghostExecutorUnifier', 'ghostSelfCheckCore', 'ghostLifecycleGovernor']
 
+class ProcessCommandLines:
+    """Command lines of all running processes, read at most once per TTL for every daemon check"""
+    
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._taken_at = 0.0
+        self._processes: List[tuple] = []
+    
+    def snapshot(self) -> List[tuple]:
+        """(pid, command line) for each process, refreshed if older than the TTL"""
+        with self._lock:
+            if time.monotonic() - self._taken_at >= self.ttl:
+                processes = []
+                for proc in psutil.process_iter(['pid', 'cmdline']):
+                    try:
+                        processes.append((proc.info['pid'], ' '.join(proc.info['cmdline'] or [])))
+                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                        continue
+                self._processes = processes
+                self._taken_at = time.monotonic()
+            return self._processes
+    
+    def find(self, *needles: str) -> Optional[int]:
+        """PID of the first process whose command line contains any of ``needles``, like ``pgrep -f``"""
+        for needle in needles:
+            for pid, command in self.snapshot():
+                if needle in command:
+                    return pid
+        return None
+
+process_command_lines = ProcessCommandLines()
+
 class DaemonMonitor:
     def __init__(self):
         self.last_check = {}
         self.cache_duration = 5  # Cache results for 5 seconds
         
     def is_process_running(self, daemon_name: str) -> Dict[str, Any]:
-        """Check if a daemon process is running using non-blocking patterns"""
+        """Check if a daemon process is running using the cached process command lines"""
         try:
-            # Use non-blocking pattern to check process
-            cmd = f"ps aux | grep -E '{daemon_name}\\.ts|{daemon_name}\\.js' | grep -v grep | head -1"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=5)
+            pid = process_command_lines.find(f"{daemon_name}.ts", f"{daemon_name}.js")
             
-            if result.returncode == 0 and result.stdout.strip():
-                # Extract PID from output
-                parts = result.stdout.strip().split()
-                pid = parts[1] if len(parts) > 1 else 'unknown'
-                
+            if pid is not None:
                 return {
                     'running': True,
-                    'pid': pid,
+                    'pid': str(pid),
                     'error': None,
                     'lastCheck': datetime.now().isoformat()
                 }
@@ -45,13 +73,6 @@ class DaemonMonitor:
                     'lastCheck': datetime.now().isoformat()
                 }
                 
-        except subprocess.TimeoutExpired:
-            return {
-                'running': False,
-                'pid': None,
-                'error': 'Check timeout',
-                'lastCheck': datetime.now().isoformat()
-            }
         except Exception as e:
             return {
                 'running': False,
@@ -11,9 +11,10 @@ import os
 import time
 import requests
 from datetime import datetime
-import subprocess
 import threading
 
+from gpt_cursor_runner.process_table import get_process_table
+
 app = Flask(__name__)
 
 # Configuration
@@ -151,10 +152,10 @@ class DashboardData:
             ]
             
             process_status = {}
+            table = get_process_table().snapshot()
             for process in processes:
                 try:
-                    result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-                    is_running = process in result.stdout
+                    is_running = bool(table.cmdline_contains(process))
                     process_status[process] = {
                         'running': is_running,
                         'status': 'HEALTHY' if is_running else 'STOPPED'
@@ -322,15 +323,12 @@ def get_daemon_status():
         daemon_status = {}
         processes = ['summary-monitor', 'patch-executor', 'doc-daemon', 'dualMonitor', 'ghost-bridge']
         
-        for process in processes:
-            try:
-                result = subprocess.run(['pgrep', '-f', process], 
-                                      capture_output=True, text=True, timeout=5)
-                daemon_status[process] = 'running' if result.returncode == 0 else 'stopped'
-            except subprocess.TimeoutExpired:
-                daemon_status[process] = 'timeout'
-            except Exception:
-                daemon_status[process] = 'unknown'
+        try:
+            table = get_process_table().snapshot()
+            for process in processes:
+                daemon_status[process] = 'running' if table.cmdline_contains(process) else 'stopped'
+        except Exception:
+            daemon_status = {process: 'unknown' for process in processes}
         
         return jsonify({
             'status': 'success',
@@ -430,24 +428,14 @@ def validate_process():
                 'timestamp': datetime.now().isoformat()
             }), 400
         
-        try:
-            result = subprocess.run(['pgrep', '-f', process_name], 
-                                  capture_output=True, text=True, timeout=5)
-            is_running = result.returncode == 0
-            
-            return jsonify({
-                'status': 'success',
-                'timestamp': datetime.now().isoformat(),
-                'running': is_running,
-                'process': process_name
-            })
-        except subprocess.TimeoutExpired:
-            return jsonify({
-                'status': 'success',
-                'timestamp': datetime.now().isoformat(),
-                'running': False,
-                'process': process_name
-            })
+        is_running = bool(get_process_table().cmdline_contains(process_name))
+        
+        return jsonify({
+            'status': 'success',
+            'timestamp': datetime.now().isoformat(),
+            'running': is_running,
+            'process': process_name
+        })
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -3,15 +3,65 @@ GPT-Cursor Runner Package.
 
 A production-ready CLI tool and webhook microservice for handling GPT-generated code patches."""
 
+import importlib
+import sys
+import types
+
 __version__ = "0.2.0"
 __author__ = "GPT-Cursor Runner Team"
 
-# Import main components
-from .main import app, main
-from .patch_runner import apply_patch, load_latest_patch
-from .event_logger import EventLogger, event_logger
-from .patch_viewer import list_patches, view_patch
-from .event_viewer import main as event_viewer_main
+# Main components, imported on first access so that tools using one module
+# (e.g. the event and patch viewers) don't pay for the whole server
+_EXPORTS = {
+    "app": ("main", "app"),
+    "main": ("main", "main"),
+    "apply_patch": ("patch_runner", "apply_patch"),
+    "apply_patches": ("patch_runner", "apply_patches"),
+    "load_latest_patch": ("patch_runner", "load_latest_patch"),
+    "EventLogger": ("event_logger", "EventLogger"),
+    "event_logger": ("event_logger", "event_logger"),
+    "EventStore": ("event_store", "EventStore"),
+    "EventIndex": ("event_index", "EventIndex"),
+    "EventSearchIndex": ("event_search", "EventSearchIndex"),
+    "list_patches": ("patch_viewer", "list_patches"),
+    "view_patch": ("patch_viewer", "view_patch"),
+    "PatchCatalog": ("patch_catalog", "PatchCatalog"),
+    "BackupStore": ("backup_store", "BackupStore"),
+    "event_viewer_main": ("event_viewer", "main"),
+}
+
+__all__ = list(_EXPORTS)
+
+# Exports named like the submodule they come from (``main``, ``event_logger``)
+_SHADOWED = {name for name, (module_name, _) in _EXPORTS.items() if name == module_name}
+
+
+class _Package(types.ModuleType):
+    """Keeps exports that share a submodule's name bound to the exported object.
+
+    Loading a submodule binds it onto the package, which would otherwise
+    replace e.g. the ``event_logger`` instance with the ``event_logger``
+    module depending on import order.
+    """
+
+    def __setattr__(self, name, value):
+        if (name in _SHADOWED and isinstance(value, types.ModuleType)
+                and value.__name__ == f"{self.__name__}.{name}"):
+            value = getattr(value, _EXPORTS[name][1])
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _EXPORTS[name]
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["app","main","apply_patch","load_latest_patch","EventLogger","event_logger","list_patches","view_patch","event_viewer_main",
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+ASGI Application for GPT-Cursor Runner.
+
+Provides async versions of the ingestion routes (``/webhook``,
+``/api/patches`` and ``/slack/test``) that acknowledge immediately, and
+delivers Slack ``response_url`` replies and proxy notifications concurrently
+over a pooled asyncio HTTP client. Every other route is served by the Flask
+app mounted underneath.
+"""
+
+import os
+import json
+import time
+import asyncio
+import contextlib
+import logging
+from datetime import datetime
+from urllib.parse import parse_qsl
+from typing import Dict, Any, Optional, Set
+
+try:
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Mount, Route
+except ImportError:
+    Starlette = None  # type: ignore
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    try:
+        from starlette.middleware.wsgi import WSGIMiddleware
+    except ImportError:
+        WSGIMiddleware = None  # type: ignore
+
+from .event_logger import event_logger
+from .slack_proxy import SlackProxy
+from .slack_handler import verify_slack_signature, handle_slack_command, handle_slack_event
+from .structured_logging import REQUEST_LOGGER, get_request_logging
+from .webhook_handler import process_hybrid_block, process_webhook_request
+
+logger = logging.getLogger(REQUEST_LOGGER)
+
+
+class SlackDelivery:
+    """Concurrent, pooled delivery of Slack messages from the event loop.
+
+    ``submit`` may be called from the loop or from worker threads; messages
+    are posted as independent tasks so a slow Slack endpoint never holds up
+    a request. ``aclose`` waits for pending messages before closing the
+    client.
+    """
+
+    def __init__(self, max_connections: int = 20, timeout: float = 10.0):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"submitted": 0, "delivered": 0, "failed": 0}
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections, max_keepalive_connections=self.max_connections
+            ),
+        )
+
+    def submit(self, url: str, payload: Dict[str, Any], kind: str = "message"):
+        """Schedule a POST of ``payload`` to ``url`` without waiting for it."""
+        if self._loop is None:
+            raise RuntimeError("Slack delivery is not started")
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._schedule(url, payload, kind)
+        else:
+            self._loop.call_soon_threadsafe(self._schedule, url, payload, kind)
+
+    def _schedule(self, url: str, payload: Dict[str, Any], kind: str):
+        self._stats["submitted"] += 1
+        self.spawn(self._post(url, payload, kind))
+
+    def spawn(self, coroutine) -> "asyncio.Task":
+        """Run ``coroutine`` as a background task that ``aclose`` waits for."""
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _post(self, url: str, payload: Dict[str, Any], kind: str):
+        try:
+            response = await self._client.post(url, json=payload)
+            if response.status_code == 200:
+                self._stats["delivered"] += 1
+                return
+            error = f"HTTP {response.status_code}"
+        except Exception as e:
+            error = str(e)
+        self._stats["failed"] += 1
+        logger.warning(f"Slack {kind} delivery failed: {error}", extra={"kind": kind})
+
+    async def aclose(self, timeout: float = 10.0):
+        """Wait up to ``timeout`` seconds for pending messages, then close."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+        if self._client is not None:
+            await self._client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["pending"] = len(self._tasks)
+        stats["max_connections"] = self.max_connections
+        return stats
+
+
+class AsyncSlackProxy(SlackProxy):
+    """Slack proxy whose messages go through ``SlackDelivery`` instead of blocking."""
+
+    def __init__(self, delivery: SlackDelivery):
+        super().__init__()
+        self.delivery = delivery
+
+    def send_message(self, text: str, attachments: Optional[list] = None) -> bool:
+        try:
+            self.delivery.submit(self.webhook_url, self.message_payload(text, attachments), "notification")
+            return True
+        except Exception as e:
+            print(f"Error queueing Slack message: {e}")
+            return False
+
+
+def _json(body: Dict[str, Any], status: int = 200) -> "JSONResponse":
+    return JSONResponse(body, status_code=status)
+
+
+def create_asgi_app(flask_app=None) -> "Starlette":
+    """Create the ASGI app, mounting ``flask_app`` (default: the main app) for other routes."""
+    if Starlette is None:
+        raise ImportError("The ASGI app requires starlette and httpx: pip install starlette httpx")
+
+    if flask_app is None:
+        from .main import app as flask_app
+
+    delivery = SlackDelivery(
+        max_connections=int(os.getenv("SLACK_POOL_SIZE", "20")),
+        timeout=float(os.getenv("SLACK_TIMEOUT", "10")),
+    )
+    notifier = AsyncSlackProxy(delivery)
+
+    def notify_error(message: str, context: str):
+        try:
+            notifier.notify_error(message, context=context)
+        except Exception:
+            pass
+
+    async def run_slack_command(data: Dict[str, Any], response_url: str):
+        try:
+            response = await run_in_threadpool(handle_slack_command, data, notifier)
+            delivery.submit(response_url, response, "response")
+        except Exception as e:
+            logger.error(f"Slack command failed: {e}", exc_info=True, extra={"route": "/webhook"})
+            delivery.submit(response_url, {"text": f"❌ Error: {e}"}, "response")
+
+    async def run_slack_event(event: Dict[str, Any]):
+        try:
+            await run_in_threadpool(handle_slack_event, event, notifier)
+        except Exception as e:
+            logger.error(f"Slack event failed: {e}", exc_info=True, extra={"route": "/webhook"})
+
+    async def slack_webhook(request: "Request", body: bytes) -> "Response":
+        debug_mode = os.getenv("DEBUG_MODE", "false").lower() == "true"
+        if not debug_mode:
+            timestamp = request.headers.get("X-Slack-Request-Timestamp", "")
+            signature = request.headers.get("X-Slack-Signature", "")
+            if not verify_slack_signature(body, signature, timestamp):
+                return _json({"error": "Invalid signature"}, 401)
+
+        if request.headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+            data = dict(parse_qsl(body.decode("utf-8")))
+        else:
+            data = json.loads(body)
+
+        event_logger.log_system_event(
+            "slack_webhook_received",
+            {"data": data, "headers": get_request_logging().headers(request.headers)},
+        )
+
+        if data.get("type") == "url_verification":
+            return _json({"challenge": data.get("challenge", "")})
+
+        if "command" in data:
+            response_url = data.get("response_url")
+            if response_url:
+                # Ack now; the command's reply goes to response_url
+                delivery.spawn(run_slack_command(data, response_url))
+                return Response(status_code=200)
+            return _json(await run_in_threadpool(handle_slack_command, data, notifier))
+
+        if data.get("type") == "event_callback":
+            delivery.spawn(run_slack_event(data.get("event", {})))
+
+        return _json({"status": "ok"})
+
+    async def webhook(request: "Request") -> "Response":
+        started = time.perf_counter()
+        remote_ip = request.client.host if request.client else None
+        context = {"route": "/webhook", "remote_ip": remote_ip}
+
+        body = await request.body()
+        if request.headers.get("X-Slack-Signature"):
+            try:
+                return await slack_webhook(request, body)
+            except Exception as e:
+                error_msg = f"Error processing Slack webhook: {str(e)}"
+                event_logger.log_system_event(
+                    "slack_webhook_error",
+                    {"error": str(e), "headers": get_request_logging().headers(request.headers)},
+                )
+                notify_error(error_msg, "/webhook Slack handler")
+                return _json({"error": error_msg}, 500)
+
+        response, status, level, message = await run_in_threadpool(
+            process_webhook_request, body, request.headers, remote_ip, context
+        )
+        logger.log(
+            level,
+            message,
+            extra=dict(context, status=status, duration_ms=round((time.perf_counter() - started) * 1000, 2)),
+        )
+        return _json(response, status)
+
+    async def api_patches(request: "Request") -> "Response":
+        try:
+            body = await request.body()
+            data = json.loads(body) if body else None
+            if not data:
+                return _json({"error": "No JSON data provided"}, 400)
+
+            event_logger.log_system_event("api_patches_received", {"source": "ghost_bridge", "data": data})
+
+            result = await run_in_threadpool(process_hybrid_block, data, body)
+            return _json({"status": "success", "result": result})
+
+        except Exception as e:
+            error_msg = f"Error processing patch data: {str(e)}"
+            event_logger.log_system_event(
+                "api_patches_error",
+                {"error": str(e), "headers": get_request_logging().headers(request.headers)},
+            )
+            notify_error(error_msg, "/api/patches endpoint")
+            return _json({"error": error_msg}, 500)
+
+    async def slack_test(request: "Request") -> "Response":
+        try:
+            test_patch = {
+                "id": f"slack-test-patch-{int(datetime.now().timestamp())}",
+                "role": "ui_patch",
+                "description": "Test patch triggered by Slack ping",
+                "target_file": (
+                    "mobile-native-fresh/src/components/ui/OnboardingModal_RUNNER-TEST.tsx"
+                ),
+                "patch": {
+                    "pattern": "Test patch",
+                    "replacement": "✅ Test patch applied successfully!",
+                },
+                "metadata": {
+                    "author": "slack-test",
+                    "source": "slack_test_endpoint",
+                    "timestamp": datetime.now().isoformat(),
+                },
+            }
+
+            result = await run_in_threadpool(process_hybrid_block, test_patch)
+            event_logger.log_system_event(
+                "slack_test_triggered", {"patch_id": test_patch["id"], "result": result}
+            )
+            return _json({
+                "status": "success",
+                "message": "Test patch created successfully",
+                "patch_id": test_patch["id"],
+                "result": result,
+            })
+
+        except Exception as e:
+            error_msg = f"Error in Slack test: {str(e)}"
+            event_logger.log_system_event("slack_test_error", {"error": str(e)})
+            notify_error(error_msg, "/slack/test endpoint")
+            return _json({"error": error_msg}, 500)
+
+    async def slack_delivery_stats(request: "Request") -> "Response":
+        return _json({"slack_delivery": delivery.get_stats(), "timestamp": datetime.now().isoformat()})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await delivery.start()
+        try:
+            yield
+        finally:
+            await delivery.aclose(timeout=float(os.getenv("SLACK_DRAIN_TIMEOUT", "10")))
+
+    routes = [
+        Route("/webhook", webhook, methods=["POST"]),
+        Route("/api/patches", api_patches, methods=["POST"]),
+        Route("/slack/test", slack_test, methods=["POST"]),
+        Route("/api/slack-delivery", slack_delivery_stats, methods=["GET"]),
+    ]
+    if WSGIMiddleware is not None:
+        routes.append(Mount("/", app=WSGIMiddleware(flask_app)))
+
+    asgi_app = Starlette(routes=routes, lifespan=lifespan)
+    asgi_app.state.slack_delivery = delivery
+    return asgi_app
@@ -16,6 +16,8 @@ import logging
 import os
 import hashlib
 
+from .scheduler import get_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,17 +79,11 @@ class AuditLogger:
         self.config = config or AuditConfig()
         self.entries: List[AuditEntry] = []
         self._lock = threading.Lock()
-        self._cleanup_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         self._log_file: Optional[str] = None
         self._current_file_size = 0
         
         # Initialize log file
         self._initialize_log_file()
-        
-        # Start cleanup thread
-        if self.config.enabled:
-            self.start()
     
     def _initialize_log_file(self):
         """Initialize the audit log file."""
@@ -106,31 +102,21 @@ class AuditLogger:
                 f.write(f"# Audit Log Started: {datetime.now().isoformat()}\n")
     
     def start(self):
-        """Start the audit logger cleanup thread."""
-        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-            self._stop_event.clear()
-            self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-            self._cleanup_thread.start()
-            logger.info("Audit logger started")
+        """Schedule audit logger cleanup on the shared scheduler."""
+        if not self.config.enabled:
+            return
+        get_scheduler().add_job("audit_logger", self._cleanup_cycle, 3600)  # Run every hour
+        logger.info("Audit logger started")
     
     def stop(self):
-        """Stop the audit logger cleanup thread."""
-        self._stop_event.set()
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        """Remove audit logger cleanup from the shared scheduler."""
+        if get_scheduler().remove_job("audit_logger"):
             logger.info("Audit logger stopped")
     
-    def _cleanup_loop(self):
-        """Background loop for audit log cleanup."""
-        while not self._stop_event.is_set():
-            try:
-                self._cleanup_old_entries()
-                self._rotate_log_file()
-            except Exception as e:
-                logger.error(f"Error in audit logger cleanup loop: {e}")
-            
-            # Wait before next cleanup cycle
-            self._stop_event.wait(3600)  # Run every hour
+    def _cleanup_cycle(self):
+        """Run one cycle of audit log cleanup."""
+        self._cleanup_old_entries()
+        self._rotate_log_file()
     
     def _cleanup_old_entries(self):
         """Clean up old audit entries."""
@@ -368,8 +354,14 @@ class AuditLogger:
 
 
 # Global audit logger instance
-audit_logger = AuditLogger()
+_audit_logger: Optional[AuditLogger] = None
+_audit_logger_lock = threading.Lock()
+
 
 def get_audit_logger() -> AuditLogger:
-    """Get the global audit logger instance."""
-    return audit_logger 
\ No newline at end of file
+    """Get the global audit logger instance, creating it on first use."""
+    global _audit_logger
+    with _audit_logger_lock:
+        if _audit_logger is None:
+            _audit_logger = AuditLogger()
+        return _audit_logger
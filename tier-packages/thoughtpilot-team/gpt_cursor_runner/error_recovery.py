@@ -15,6 +15,8 @@ import logging
 import traceback
 import sys
 
+from .scheduler import get_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,14 +65,15 @@ class RecoveryStrategy:
 
 class ErrorRecovery:
     """Handles error recovery and system resilience."""
+
+    # Seconds between stopping a component and starting it again
+    RESTART_DELAY = 2.0
     
     def __init__(self):
         self.errors: List[ErrorRecord] = []
         self.recovery_strategies: List[RecoveryStrategy] = []
         self.active_recoveries: Dict[str, Dict[str, Any]] = {}
         self._lock = threading.Lock()
-        self._recovery_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         
         # Register default recovery strategies
         self._register_default_strategies()
@@ -113,30 +116,18 @@ class ErrorRecovery:
         ]
     
     def start(self):
-        """Start the error recovery background thread."""
-        if self._recovery_thread is None or not self._recovery_thread.is_alive():
-            self._stop_event.clear()
-            self._recovery_thread = threading.Thread(target=self._recovery_loop, daemon=True)
-            self._recovery_thread.start()
-            logger.info("Error recovery started")
+        """Schedule error recovery on the shared scheduler."""
+        get_scheduler().add_job("error_recovery", self._recovery_cycle, 10)
+        logger.info("Error recovery started")
     
     def stop(self):
-        """Stop the error recovery background thread."""
-        self._stop_event.set()
-        if self._recovery_thread and self._recovery_thread.is_alive():
-            self._recovery_thread.join(timeout=5)
+        """Remove error recovery from the shared scheduler."""
+        if get_scheduler().remove_job("error_recovery"):
             logger.info("Error recovery stopped")
     
-    def _recovery_loop(self):
-        """Background loop for error recovery."""
-        while not self._stop_event.is_set():
-            try:
-                self._process_recoveries()
-            except Exception as e:
-                logger.error(f"Error in recovery loop: {e}")
-            
-            # Wait before next recovery cycle
-            self._stop_event.wait(10)
+    def _recovery_cycle(self):
+        """Run one cycle of error recovery."""
+        self._process_recoveries()
     
     def _process_recoveries(self):
         """Process active error recoveries."""
@@ -182,45 +173,43 @@ class ErrorRecovery:
             logger.error(f"Error during recovery attempt for {error_id}: {e}")
     
     def _restart_component(self, component: str):
-        """Restart a system component."""
+        """Restart a system component.
+
+        The component is stopped now and started again ``RESTART_DELAY``
+        seconds later by the scheduler, so the pause doesn't hold one of its
+        workers.
+        """
         try:
             if component == "health_aggregator":
                 from gpt_cursor_runner.health_aggregator import get_health_aggregator
-                health_agg = get_health_aggregator()
-                health_agg.stop()
-                time.sleep(2)
-                health_agg.start()
-                logger.info("Health aggregator restarted")
+                target, label = get_health_aggregator(), "Health aggregator"
             elif component == "resource_monitor":
                 from gpt_cursor_runner.resource_monitor import get_resource_monitor
-                resource_monitor = get_resource_monitor()
-                resource_monitor.stop()
-                time.sleep(2)
-                resource_monitor.start()
-                logger.info("Resource monitor restarted")
+                target, label = get_resource_monitor(), "Resource monitor"
             elif component == "process_cleanup":
                 from gpt_cursor_runner.process_cleanup import get_process_cleanup
-                process_cleanup = get_process_cleanup()
-                process_cleanup.stop()
-                time.sleep(2)
-                process_cleanup.start()
-                logger.info("Process cleanup restarted")
+                target, label = get_process_cleanup(), "Process cleanup"
             elif component == "unified_processor":
                 from gpt_cursor_runner.unified_processor import get_unified_processor
-                processor = get_unified_processor()
-                processor.stop()
-                time.sleep(2)
-                processor.start()
-                logger.info("Unified processor restarted")
+                target, label = get_unified_processor(), "Unified processor"
             elif component == "sequential_processor":
                 from gpt_cursor_runner.sequential_processor import get_sequential_processor
-                processor = get_sequential_processor()
-                processor.stop()
-                time.sleep(2)
-                processor.start()
-                logger.info("Sequential processor restarted")
+                target, label = get_sequential_processor(), "Sequential processor"
+            else:
+                return
+            target.stop()
+            get_scheduler().call_later(self.RESTART_DELAY, lambda: self._start_component(target, label),
+                                       name=f"restart_{component}")
         except Exception as e:
             logger.error(f"Failed to restart component {component}: {e}")
+
+    def _start_component(self, target: Any, label: str):
+        """Second half of ``_restart_component``."""
+        try:
+            target.start()
+            logger.info(f"{label} restarted")
+        except Exception as e:
+            logger.error(f"Failed to start {label.lower()} after restart: {e}")
     
     def _retry_operation(self, error_id: str, recovery: Dict[str, Any]):
         """Retry a failed operation."""
@@ -363,8 +352,14 @@ class ErrorRecovery:
 
 
 # Global error recovery instance
-error_recovery = ErrorRecovery()
+_error_recovery: Optional[ErrorRecovery] = None
+_error_recovery_lock = threading.Lock()
+
 
 def get_error_recovery() -> ErrorRecovery:
-    """Get the global error recovery instance."""
-    return error_recovery 
\ No newline at end of file
+    """Get the global error recovery instance, creating it on first use."""
+    global _error_recovery
+    with _error_recovery_lock:
+        if _error_recovery is None:
+            _error_recovery = ErrorRecovery()
+        return _error_recovery
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Event Counters for GPT-Cursor Runner.
+
+Provides rolling, time-bucketed event counts maintained at ingest time so
+dashboard statistics are answered from in-memory buckets instead of
+re-reading and re-parsing recent events.
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+# Resolution name -> (bucket width in seconds, number of buckets)
+RESOLUTIONS = {
+    "minute": (60, 60),
+    "hour": (3600, 7 * 24),
+    "day": (86400, 30),
+}
+
+ALL = ("all", "")
+
+
+def event_keys(event: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Counter keys an event contributes to.
+
+    Dimensions are ``type``, ``event_type:<type>`` (event_type scoped to its
+    event type, e.g. ``event_type:slack_event``) and ``command`` for Slack
+    slash commands.
+    """
+    event_kind = event.get("type", "unknown")
+    keys = [ALL, ("type", event_kind)]
+    if event.get("event_type"):
+        keys.append((f"event_type:{event_kind}", event["event_type"]))
+    if event.get("event_type") == "slash_command":
+        keys.append(("command", event.get("command") or "unknown"))
+    return keys
+
+
+class _BucketRing:
+    """Fixed-size ring of counters, one per time bucket."""
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.size = size
+        self.epochs = [-1] * size
+        self.counts: List[Counter] = [Counter() for _ in range(size)]
+
+    def add(self, keys: List[Tuple[str, str]], ts: float):
+        epoch = int(ts // self.width)
+        slot = epoch % self.size
+        if self.epochs[slot] != epoch:
+            if self.epochs[slot] > epoch:
+                return  # older than the ring covers
+            self.epochs[slot] = epoch
+            self.counts[slot] = Counter()
+        counts = self.counts[slot]
+        for key in keys:
+            counts[key] += 1
+
+    def window(self, seconds: float, now: float) -> List[Counter]:
+        """Buckets covering the last ``seconds`` (rounded up to whole buckets)."""
+        current = int(now // self.width)
+        oldest = current - max(1, -(-int(seconds) // self.width)) + 1
+        return [self.counts[slot] for slot, epoch in enumerate(self.epochs)
+                if oldest <= epoch <= current]
+
+
+class EventCounters:
+    """Rolling per-type, per-event_type and per-command event counts.
+
+    Counts are kept at minute, hour and day resolution; a query uses the
+    finest resolution that covers the requested window. The counters are
+    attached to an ``EventStore`` as a listener: on first open they are
+    hydrated from events within the longest window, after that every append
+    increments them.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._rings = {name: _BucketRing(width, size) for name, (width, size) in RESOLUTIONS.items()}
+        self._lock = threading.Lock()
+        self._hydrated = False
+
+    @property
+    def max_window(self) -> int:
+        """Longest window (in seconds) the counters can answer."""
+        return max(width * size for width, size in RESOLUTIONS.values())
+
+    # ------------------------------------------------------------------
+    # Store listener hooks
+    # ------------------------------------------------------------------
+    def on_reload(self, events: List[Dict[str, Any]]):
+        """Hydrate from stored events the first time the store is opened."""
+        if self._hydrated:
+            return
+        self._hydrated = True
+        if self.store is None:
+            for event in events:
+                self.add(event)
+            return
+        since = datetime.fromtimestamp(time.time() - self.max_window).isoformat()
+        for event in self.store.iter_events(since=since):
+            self.add(event)
+
+    def on_append(self, event: Dict[str, Any]):
+        """Count a newly stored event."""
+        self.add(event)
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+    def add(self, event: Dict[str, Any], ts: Optional[float] = None):
+        """Count an event at ``ts`` (defaults to the event's own timestamp)."""
+        if ts is None:
+            try:
+                ts = datetime.fromisoformat(event.get("timestamp", "")).timestamp()
+            except (TypeError, ValueError):
+                ts = time.time()
+        keys = event_keys(event)
+        with self._lock:
+            for ring in self._rings.values():
+                ring.add(keys, ts)
+
+    def _buckets(self, seconds: float, now: Optional[float] = None) -> List[Counter]:
+        now = time.time() if now is None else now
+        for name in ("minute", "hour", "day"):
+            ring = self._rings[name]
+            if seconds <= ring.width * ring.size:
+                return ring.window(seconds, now)
+        ring = self._rings["day"]
+        return ring.window(ring.width * ring.size, now)
+
+    def count(self, seconds: float, dimension: str = "all", value: str = "") -> int:
+        """Number of events for one key within the last ``seconds``."""
+        key = (dimension, value)
+        with self._lock:
+            return sum(bucket.get(key, 0) for bucket in self._buckets(seconds))
+
+    def breakdown(self, dimension: str, seconds: float) -> Dict[str, int]:
+        """Counts per value of ``dimension`` within the last ``seconds``."""
+        totals: Dict[str, int] = {}
+        with self._lock:
+            for bucket in self._buckets(seconds):
+                for (dim, value), count in bucket.items():
+                    if dim == dimension:
+                        totals[value] = totals.get(value, 0) + count
+        return totals
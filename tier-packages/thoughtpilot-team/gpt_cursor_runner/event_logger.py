@@ -6,62 +6,231 @@ Provides logging and event tracking capabilities.
 """
 
 import os
-import json
 import time
-from datetime import datetime
+import random
+import threading
+from collections import deque
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
+from .event_store import EventStore
+from .event_index import EventIndex
+from .event_search import EventSearchIndex
+from .event_counters import EventCounters
+
+
+class AsyncEventSink:
+    """Background writer that moves event persistence off the request path.
+
+    Events are queued in submission order and written by a single dedicated
+    thread, so they reach the store in the same order they were logged. When
+    the queue is full the overflow policy decides what happens:
+
+    - ``block``: the caller waits for room (up to ``block_timeout`` seconds,
+      then the event is dropped).
+    - ``drop_oldest``: the oldest queued event is discarded to make room.
+    - ``sample``: only ``sample_rate`` of the overflowing events are kept,
+      each displacing the oldest queued event; the rest are dropped.
+    """
+
+    POLICIES = ("block", "drop_oldest", "sample")
+
+    def __init__(self, store: EventStore, max_queue: int = 10000, policy: str = "block",
+                 sample_rate: float = 0.1, block_timeout: Optional[float] = 5.0,
+                 batch_size: int = 256):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.store = store
+        self.max_queue = max_queue
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Events ever queued, and those since written or dropped from the queue
+        self._enqueued = 0
+        self._done = 0
+        self._stats = {
+            "queued": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "write_errors": 0,
+        }
+
+    def _ensure_started(self):
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, daemon=True, name="event-writer"
+            )
+            self._writer_thread.start()
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for writing; returns False if it was dropped."""
+        with self._cond:
+            if self._closed:
+                self._stats["dropped"] += 1
+                return False
+            self._ensure_started()
+
+            if len(self._queue) >= self.max_queue:
+                if self.policy == "block":
+                    has_room = self._cond.wait_for(
+                        lambda: len(self._queue) < self.max_queue or self._closed,
+                        timeout=self.block_timeout,
+                    )
+                    if not has_room or self._closed:
+                        self._stats["dropped"] += 1
+                        return False
+                elif self.policy == "sample" and random.random() >= self.sample_rate:
+                    self._stats["dropped"] += 1
+                    return False
+                else:
+                    self._queue.popleft()
+                    self._done += 1
+                    self._stats["dropped"] += 1
+
+            self._queue.append(event)
+            self._enqueued += 1
+            self._stats["queued"] += 1
+            self._cond.notify_all()
+            return True
+
+    def _writer_loop(self):
+        """Drain the queue into the store in batches."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue and self._closed:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._cond.notify_all()
+
+            written = 0
+            for event in batch:
+                try:
+                    self.store.append(event)
+                    written += 1
+                except Exception as e:
+                    print(f"Error writing event to store: {e}")
+                    with self._cond:
+                        self._stats["write_errors"] += 1
+
+            with self._cond:
+                idle = not self._queue
+            if idle:
+                try:
+                    self.store.flush()
+                except Exception as e:
+                    print(f"Error flushing event store: {e}")
+
+            with self._cond:
+                self._stats["flushed"] += written
+                self._done += len(batch)
+                self._cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every event queued before the call has reached the store.
+
+        Events submitted meanwhile aren't waited for, so this returns even
+        under a steady stream of new events.
+        """
+        with self._cond:
+            target = self._enqueued
+            return self._cond.wait_for(lambda: self._done >= target, timeout=timeout)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every event queued so far has been written and synced."""
+        drained = self.drain(timeout)
+        self.store.flush()
+        return drained
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Drain the queue and stop the writer thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer counters."""
+        with self._cond:
+            stats = self._stats.copy()
+            stats["depth"] = len(self._queue)
+            stats["max_queue"] = self.max_queue
+            stats["policy"] = self.policy
+            return stats
+
 
 class EventLogger:
     """Centralized event logging system."""
+
+    # Longest a read waits for queued async writes before answering anyway
+    READ_DRAIN_TIMEOUT = 2.0
+    # Counter reads pick up other processes' events at most this often (seconds)
+    COUNTER_REFRESH_INTERVAL = 1.0
     
-    def __init__(self, log_file: str = "data/event-log.json"):
-        self.log_file = log_file
+    def __init__(self, log_dir: str = "data/events", legacy_log_file: str = "data/event-log.json",
+                 async_writes: bool = False, queue_size: int = 10000,
+                 overflow_policy: str = "block", sample_rate: float = 0.1,
+                 read_only: bool = False):
+        self.log_file = log_dir
+        self.legacy_log_file = legacy_log_file
         self.max_entries = 1000
-        self.ensure_log_file()
-
-    def ensure_log_file(self):
-        """Ensure log file exists with proper structure."""
-        if not os.path.exists(self.log_file):
-            initial_data = {
-                "events": [],
-                "last_updated": datetime.now().isoformat(),
-                "total_events": 0,
-            }
-            self._write_log(initial_data)
-
-    def _write_log(self, data: Dict[str, Any]):
-        """Write log data to file."""
-        try:
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            with open(self.log_file, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
+        self.read_only = read_only
+        self.store = EventStore(log_dir, ring_size=self.max_entries, read_only=read_only)
+        self.index = EventIndex(capacity=self.max_entries)
+        self.store.add_listener(self.index)
+        self.search_index = EventSearchIndex(self.store)
+        self.store.add_listener(self.search_index)
+        self.counters = EventCounters(self.store)
+        self.store.add_listener(self.counters)
+        self.sink: Optional[AsyncEventSink] = None
+        if async_writes and not read_only:
+            self.sink = AsyncEventSink(
+                self.store, max_queue=queue_size, policy=overflow_policy, sample_rate=sample_rate
+            )
+        self._migrated = False
+        self._open_lock = threading.Lock()
+        self._id_lock = threading.Lock()
+        self._last_id_ms = 0
+        self._counters_refreshed = 0.0
 
-    def _read_log(self) -> Dict[str, Any]:
-        """Read log data from file."""
-        try:
-            with open(self.log_file, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error reading log file: {e}")
-            try:
-                from .slack_proxy import create_slack_proxy
-                slack_proxy = create_slack_proxy()
-                slack_proxy.notify_error(f"Error reading log file: {e}", context=self.log_file)
-            except Exception:
-                pass
-            return {
-                "events": [],
-                "last_updated": datetime.now().isoformat(),
-                "total_events": 0,
-            }
+    def _get_store(self) -> EventStore:
+        """Open the backing store, importing the legacy JSON log on first use."""
+        if self._migrated:
+            return self.store
+        with self._open_lock:
+            if not self._migrated:
+                self._migrated = True
+                try:
+                    self.store.open()
+                    self.store.import_legacy_log(self.legacy_log_file)
+                except Exception as e:
+                    print(f"Error opening event store: {e}")
+                    try:
+                        from .slack_proxy import create_slack_proxy
+                        slack_proxy = create_slack_proxy()
+                        slack_proxy.notify_error(f"Error opening event store: {e}", context=self.log_file)
+                    except Exception:
+                        pass
+        return self.store
+
+    def _next_id(self, prefix: str) -> str:
+        """Millisecond-based event id, bumped when needed so ids stay unique and usable as cursors."""
+        with self._id_lock:
+            now_ms = int(time.time() * 1000)
+            self._last_id_ms = max(now_ms, self._last_id_ms + 1)
+            return f"{prefix}_{self._last_id_ms}"
 
     def log_patch_event(self, event_type: str, patch_data: Dict[str, Any], result: Optional[Dict[str, Any]] = None):
         """Log patch-related events."""
         event = {
-            "id": f"patch_{int(time.time() * 1000)}",
+            "id": self._next_id("patch"),
             "type": "patch_event",
             "event_type": event_type,
             "timestamp": datetime.now().isoformat(),
@@ -77,7 +246,7 @@ class EventLogger:
     def log_slack_event(self, event_type: str, slack_data: Dict[str, Any], result: Optional[Dict[str, Any]] = None):
         """Log Slack-related events."""
         event = {
-            "id": f"slack_{int(time.time() * 1000)}",
+            "id": self._next_id("slack"),
             "type": "slack_event",
             "event_type": event_type,
             "timestamp": datetime.now().isoformat(),
@@ -92,7 +261,7 @@ class EventLogger:
     def log_system_event(self, event_type: str, data: Optional[Dict[str, Any]] = None):
         """Log system events."""
         event = {
-            "id": f"system_{int(time.time() * 1000)}",
+            "id": self._next_id("system"),
             "type": "system_event",
             "event_type": event_type,
             "timestamp": datetime.now().isoformat(),
@@ -102,75 +271,133 @@ class EventLogger:
 
     def _add_event(self, event: Dict[str, Any]):
         """Add event to log."""
-        log_data = self._read_log()
-        log_data["events"].append(event)
-        log_data["last_updated"] = datetime.now().isoformat()
-        log_data["total_events"] = len(log_data["events"])
-        if len(log_data["events"]) > self.max_entries:
-            log_data["events"] = log_data["events"][-self.max_entries:]
-        self._write_log(log_data)
+        try:
+            store = self._get_store()
+            if self.sink:
+                self.sink.submit(event)
+            else:
+                store.append(event)
+        except Exception as e:
+            print(f"Error writing to event store: {e}")
 
     def get_recent_events(self, limit: int = 50, event_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get recent events, optionally filtered by type."""
-        log_data = self._read_log()
-        events = log_data.get("events", [])
-        
-        if event_type:
-            events = [e for e in events if e.get("event_type") == event_type]
-        
-        return events[-limit:]
+        """Get recent events, optionally filtered by event_type."""
+        return self.query_events(limit, event_type=event_type)["events"]
+
+    def _catch_up(self):
+        """Let queued async writes reach the store, and pick up events other
+        processes stored, so reads include them."""
+        if self.sink:
+            self.sink.drain(self.READ_DRAIN_TIMEOUT)
+        self.store.refresh()
+
+    def query_events(self, limit: int = 50, after: Optional[str] = None,
+                     since: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """Query recent events through the secondary indexes.
+
+        ``filters`` may be any of ``type``, ``event_type``, ``patch_id`` and
+        ``target_file``; ``after`` is an event id cursor (see ``EventIndex.query``).
+        Includes every event logged before the call.
+        """
+        self._get_store()
+        self._catch_up()
+        return self.index.query(limit, after=after, since=since, **filters)
+
+    def get_counters(self) -> EventCounters:
+        """Rolling event counters, hydrated from the store on first use.
+
+        Answered from memory: this doesn't wait for queued async writes, and
+        events other processes stored are picked up at most every
+        ``COUNTER_REFRESH_INTERVAL`` seconds (and whenever this process
+        writes), so dashboard polls in between do no file I/O.
+        """
+        self._get_store()
+        now = time.monotonic()
+        if now - self._counters_refreshed >= self.COUNTER_REFRESH_INTERVAL:
+            self._counters_refreshed = now
+            self.store.refresh()
+        return self.counters
+
+    def search_events(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Full-text search over the whole event history, newest first.
+
+        Raises ``SearchUnavailable`` if the search index cannot be used.
+        """
+        self._get_store()
+        if self.sink:
+            # Make sure everything logged so far is searchable
+            self.sink.flush()
+        self.store.refresh()
+        return self.search_index.search(query, limit)
 
     def get_event_summary(self) -> Dict[str, Any]:
         """Get event summary statistics."""
-        log_data = self._read_log()
-        events = log_data.get("events", [])
-        
-        # Count events by type
-        event_counts = {}
-        for event in events:
-            event_type = event.get("type", "unknown")
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        store = self._get_store()
+        self._catch_up()
+        event_counts = self.index.counts("type")
         
         return {
-            "total_events": len(events),
+            "total_events": self.index.get_stats()["window_events"],
+            "stored_events": store.count(),
             "event_counts": event_counts,
-            "last_updated": log_data.get("last_updated", ""),
+            "last_updated": store.last_updated,
+            "writer": self.sink.get_stats() if self.sink else None,
         }
 
     def get_patch_events(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent patch events."""
-        return self.get_recent_events(limit, "patch_event")
+        return self.query_events(limit, type="patch_event")["events"]
 
     def get_slack_events(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent Slack events."""
-        return self.get_recent_events(limit, "slack_event")
+        return self.query_events(limit, type="slack_event")["events"]
 
     def clear_old_events(self, days: int = 30):
         """Clear events older than specified days."""
-        cutoff_time = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        log_data = self._read_log()
-        events = log_data.get("events", [])
-        filtered_events = []
-        
-        for event in events:
+        cutoff_time = datetime.now() - timedelta(days=days)
+        try:
+            self._get_store().compact(cutoff_time)
+        except Exception as e:
+            print(f"Error compacting event store: {e}")
             try:
-                event_time = datetime.fromisoformat(event.get("timestamp", "")).timestamp()
-                if event_time > cutoff_time:
-                    filtered_events.append(event)
-            except Exception as e:
-                filtered_events.append(event)
-                try:
-                    from .slack_proxy import create_slack_proxy
-                    slack_proxy = create_slack_proxy()
-                    slack_proxy.notify_error(f"Error parsing event timestamp: {e}", context=self.log_file)
-                except Exception:
-                    pass
-        
-        log_data["events"] = filtered_events
-        log_data["total_events"] = len(filtered_events)
-        log_data["last_updated"] = datetime.now().isoformat()
-        self._write_log(log_data)
+                from .slack_proxy import create_slack_proxy
+                slack_proxy = create_slack_proxy()
+                slack_proxy.notify_error(f"Error compacting event store: {e}", context=self.log_file)
+            except Exception:
+                pass
+
+    def flush(self):
+        """Force queued and buffered events to disk."""
+        if self.sink:
+            self.sink.flush()
+        else:
+            self.store.flush()
+        self.search_index.flush()
+
+    def close(self):
+        """Drain the writer and close the event store."""
+        if self.sink:
+            self.sink.close()
+        self.store.close()
+        self.search_index.close()
+
+
+def open_event_reader() -> EventLogger:
+    """A read-only view of the global event log, for tools that inspect it
+    while a server may be writing it (see ``EventStore``'s ``read_only``)."""
+    return EventLogger(
+        log_dir=os.getenv("EVENT_LOG_DIR", "data/events"),
+        legacy_log_file=os.getenv("EVENT_LOG_LEGACY_FILE", "data/event-log.json"),
+        read_only=True,
+    )
 
 
 # Global event logger instance
-event_logger = EventLogger()
\ No newline at end of file
+event_logger = EventLogger(
+    log_dir=os.getenv("EVENT_LOG_DIR", "data/events"),
+    legacy_log_file=os.getenv("EVENT_LOG_LEGACY_FILE", "data/event-log.json"),
+    async_writes=os.getenv("EVENT_LOG_ASYNC", "true").lower() == "true",
+    queue_size=int(os.getenv("EVENT_LOG_QUEUE_SIZE", "10000")),
+    overflow_policy=os.getenv("EVENT_LOG_OVERFLOW_POLICY", "block"),
+    sample_rate=float(os.getenv("EVENT_LOG_SAMPLE_RATE", "0.1")),
+)
\ No newline at end of file
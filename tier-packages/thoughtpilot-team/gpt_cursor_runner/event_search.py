@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Event Search for GPT-Cursor Runner.
+
+Provides a persistent full-text index over the event history (SQLite FTS5)
+with prefix and field-scoped queries, kept current as events are appended.
+
+Query syntax::
+
+    deploy                  token anywhere in the searchable fields
+    depl*                   token prefix
+    patch_id:foo            token within one field
+    target_file:*.tsx       glob over the whole field value
+    "src/app.tsx"           phrase
+
+Terms are ANDed together. A query with no term the full-text index can
+look up (e.g. only ``target_file:*tsx``) is checked against the newest
+``glob_scan_window`` events only, not the whole history.
+"""
+
+import os
+import re
+import json
+import shlex
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = (
+    "id", "type", "event_type", "patch_id", "target_file",
+    "description", "user_id", "command", "text",
+)
+
+_GLOB_CHARS = re.compile(r"(\*|\?|\[[^\]]*\])")
+# Matches the tokens produced by FTS5's unicode61 tokenizer (underscore is a separator)
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+class SearchUnavailable(Exception):
+    """Raised when SQLite was built without FTS5."""
+
+
+class EventSearchIndex:
+    """Full-text index over every stored event.
+
+    Events are mirrored into ``search.db`` next to the event segments. Rows
+    are keyed by event ``seq`` so indexing is idempotent; on first open the
+    index catches up from the store, after that it is fed by the store's
+    ``on_append`` listener hook and commits in small batches.
+    """
+
+    def __init__(self, store, db_path: Optional[str] = None,
+                 commit_batch: int = 64, commit_interval: float = 1.0,
+                 glob_scan_window: int = 10000):
+        self.store = store
+        self.db_path = db_path or os.path.join(store.directory, "search.db")
+        self.commit_batch = commit_batch
+        self.commit_interval = commit_interval
+        self.glob_scan_window = glob_scan_window
+        self.available = True
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._pending: List[Dict[str, Any]] = []
+        self._last_commit = time.time()
+        self._caught_up = False
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        if not self.available:
+            raise SearchUnavailable("Event search index is unavailable")
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            columns = ", ".join(f"{field} TEXT" for field in SEARCH_FIELDS)
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS events ("
+                f"seq INTEGER PRIMARY KEY, timestamp TEXT, {columns}, body TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS events_timestamp ON events(timestamp)")
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+                f"{', '.join(SEARCH_FIELDS)}, content='events', content_rowid='seq')"
+            )
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            conn.close()
+            self.available = False
+            raise SearchUnavailable(f"SQLite FTS5 not available: {e}")
+        self._conn = conn
+        return conn
+
+    def _catch_up(self):
+        """Index events the store holds beyond what search.db has seen."""
+        conn = self._connect()
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+        batch = []
+        for event in self.store.iter_events(after_seq=last_seq):
+            batch.append(event)
+            if len(batch) >= 1000:
+                self._insert(batch)
+                batch = []
+        self._insert(batch)
+        conn.commit()
+        self._caught_up = True
+
+    # ------------------------------------------------------------------
+    # Store listener hooks
+    # ------------------------------------------------------------------
+    def on_reload(self, events: List[Dict[str, Any]]):
+        """Catch up with the store the first time it is opened."""
+        if self._caught_up:
+            return
+        with self._lock:
+            try:
+                self._catch_up()
+            except SearchUnavailable as e:
+                logger.warning(str(e))
+            except Exception as e:
+                logger.error(f"Error building event search index: {e}")
+
+    def on_append(self, event: Dict[str, Any]):
+        """Queue an appended event for indexing."""
+        if not self.available or not self._caught_up:
+            return
+        with self._lock:
+            self._pending.append(event)
+            if (len(self._pending) >= self.commit_batch
+                    or time.time() - self._last_commit >= self.commit_interval):
+                self._commit_pending()
+
+    def on_compact(self, cutoff: str):
+        """Drop events removed from the store."""
+        if not self.available:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                self._commit_pending()
+                columns = ", ".join(SEARCH_FIELDS)
+                conn.execute(
+                    f"INSERT INTO events_fts(events_fts, rowid, {columns}) "
+                    f"SELECT 'delete', seq, {columns} FROM events WHERE timestamp < ?",
+                    (cutoff,),
+                )
+                conn.execute("DELETE FROM events WHERE timestamp < ?", (cutoff,))
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Error compacting event search index: {e}")
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _insert(self, events: List[Dict[str, Any]]):
+        conn = self._connect()
+        placeholders = ", ".join("?" for _ in SEARCH_FIELDS)
+        columns = ", ".join(SEARCH_FIELDS)
+        for event in events:
+            values = tuple(str(event.get(field, "") or "") for field in SEARCH_FIELDS)
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO events(seq, timestamp, {columns}, body) "
+                f"VALUES (?, ?, {placeholders}, ?)",
+                (event.get("seq"), event.get("timestamp", ""), *values,
+                 json.dumps(event, separators=(",", ":"), default=str)),
+            )
+            if cursor.rowcount:
+                conn.execute(
+                    f"INSERT INTO events_fts(rowid, {columns}) VALUES (?, {placeholders})",
+                    (event.get("seq"), *values),
+                )
+
+    def _commit_pending(self):
+        if self._pending:
+            try:
+                self._insert(self._pending)
+                self._conn.commit()
+            except Exception as e:
+                logger.error(f"Error indexing events for search: {e}")
+            self._pending = []
+        self._last_commit = time.time()
+
+    def flush(self):
+        """Commit any queued index updates."""
+        with self._lock:
+            if self._conn is not None:
+                self._commit_pending()
+
+    def close(self):
+        """Commit and close the index database."""
+        with self._lock:
+            if self._conn is not None:
+                self._commit_pending()
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _phrase(text: str, prefix: bool = False) -> str:
+        quoted = '"' + text.replace('"', '""') + '"'
+        return quoted + "*" if prefix else quoted
+
+    @staticmethod
+    def _glob_tokens(pattern: str) -> List[Tuple[str, bool]]:
+        """Tokens a glob value is guaranteed to contain, as (token, is_prefix).
+
+        A token glued to a wildcard on its left could be the tail of a longer
+        token, so it cannot be looked up and is left to the glob check.
+        """
+        tokens = []
+        pieces = _GLOB_CHARS.split(pattern)
+        # split() with a capture group alternates literal pieces and wildcards
+        for i in range(0, len(pieces), 2):
+            piece = pieces[i]
+            glob_before = i > 0
+            glob_after = i + 1 < len(pieces)
+            for match in _TOKEN.finditer(piece):
+                if match.start() == 0 and glob_before:
+                    continue
+                tokens.append((match.group(), match.end() == len(piece) and glob_after))
+        return tokens
+
+    def parse_query(self, query: str) -> Tuple[str, List[Tuple[Optional[str], str]]]:
+        """Split a query into an FTS5 MATCH expression and glob filters."""
+        try:
+            terms = shlex.split(query)
+        except ValueError:
+            terms = query.split()
+
+        match_terms: List[str] = []
+        globs: List[Tuple[Optional[str], str]] = []
+        for term in terms:
+            field = None
+            if ":" in term:
+                name, value = term.split(":", 1)
+                if name in SEARCH_FIELDS:
+                    field, term = name, value
+            if not term:
+                continue
+            scope = f"{field} : " if field else ""
+
+            wildcards = _GLOB_CHARS.findall(term)
+            if wildcards == ["*"] and term.endswith("*") and len(term) > 1:
+                # Plain prefix query
+                match_terms.append(scope + self._phrase(term[:-1], prefix=True))
+            elif wildcards:
+                globs.append((field, term.lower()))
+                for token, is_prefix in self._glob_tokens(term):
+                    match_terms.append(scope + self._phrase(token, prefix=is_prefix))
+            elif _TOKEN.search(term):
+                match_terms.append(scope + self._phrase(term))
+
+        return " AND ".join(match_terms), globs
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` matching events, newest first."""
+        if not self._caught_up:
+            # Opening the store runs on_reload, which catches up under the
+            # store lock so no concurrent append is missed.
+            self.store.open()
+            if not self._caught_up:
+                raise SearchUnavailable("Event search index is not ready")
+
+        with self._lock:
+            conn = self._connect()
+            self._commit_pending()
+
+            match, globs = self.parse_query(query)
+            where: List[str] = []
+            params: List[Any] = []
+            for field, pattern in globs:
+                fields = [field] if field else list(SEARCH_FIELDS)
+                where.append("(" + " OR ".join(f"lower(e.{f}) GLOB ?" for f in fields) + ")")
+                params.extend([pattern] * len(fields))
+
+            if match:
+                sql = ("SELECT e.body FROM events_fts JOIN events e ON e.seq = events_fts.rowid "
+                       "WHERE events_fts MATCH ?")
+                params.insert(0, match)
+            elif where:
+                # Nothing to look up in the index; glob only the newest rows
+                sql = ("SELECT e.body FROM events e "
+                       "WHERE e.seq > (SELECT COALESCE(MAX(seq), 0) FROM events) - ?")
+                params.insert(0, self.glob_scan_window)
+            else:
+                return []
+            for clause in where:
+                sql += f" AND {clause}"
+            # Ordering by the FTS rowid lets FTS5 walk matches newest-first and
+            # stop at the limit instead of sorting every match.
+            sql += " ORDER BY events_fts.rowid DESC LIMIT ?" if match else " ORDER BY e.seq DESC LIMIT ?"
+            params.append(limit)
+
+            rows = conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            if not self.available:
+                return {"available": False}
+            conn = self._connect()
+            indexed, last_seq = conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM events"
+            ).fetchone()
+            return {
+                "available": True,
+                "db_path": self.db_path,
+                "indexed_events": indexed,
+                "last_seq": last_seq,
+                "pending": len(self._pending),
+            }
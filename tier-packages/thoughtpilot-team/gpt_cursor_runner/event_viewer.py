@@ -12,15 +12,14 @@ from typing import Dict, Any, List, Optional
 
 # Import dependencies
 try:
-    from .event_logger import event_logger
+    from .event_logger import open_event_reader
+    from .event_search import SearchUnavailable
+    # The viewer only reads; never repair or append to a log a server may be writing
+    event_logger = open_event_reader()
 except ImportError:
     event_logger = None
 
-try:
-    from .slack_proxy import create_slack_proxy
-    slack_proxy = create_slack_proxy()
-except ImportError:
-    slack_proxy = None
+from .slack_proxy import get_slack_proxy
 
 
 def format_timestamp(timestamp_str: str) -> str:
@@ -30,10 +29,9 @@ def format_timestamp(timestamp_str: str) -> str:
         return dt.strftime("%Y-%m-%d %H:%M:%S")
     except Exception as e:
         try:
-            if slack_proxy:
-                slack_proxy.notify_error(
-                    f"Error formatting timestamp: {e}", context=timestamp_str
-                )
+            get_slack_proxy().notify_error(
+                f"Error formatting timestamp: {e}", context=timestamp_str
+            )
         except Exception:
             pass
     return timestamp_str
@@ -115,12 +113,31 @@ def list_events(limit: int = 50, event_type: Optional[str] = None, show_details:
     except Exception as e:
         print(f"❌ Error listing events: {e}")
         try:
-            if slack_proxy:
-                slack_proxy.notify_error(f"Error listing events: {e}")
+            get_slack_proxy().notify_error(f"Error listing events: {e}")
         except Exception:
             pass
 
 
+def _scan_recent_events(query: str) -> List[Dict[str, Any]]:
+    """Substring scan of the recent-event window, used when the search index is unavailable."""
+    query_lower = query.lower()
+    matching_events = []
+    for event in event_logger.get_recent_events(1000):
+        searchable_text = " ".join([
+            str(event.get("id", "")),
+            str(event.get("type", "")),
+            str(event.get("patch_id", "")),
+            str(event.get("target_file", "")),
+            str(event.get("description", "")),
+            str(event.get("user_id", "")),
+            str(event.get("command", "")),
+            str(event.get("text", "")),
+        ])
+        if query_lower in searchable_text.lower():
+            matching_events.append(event)
+    return matching_events
+
+
 def search_events(query: str, limit: int = 50, show_details: bool = False):
     """Search events by query string."""
     if not event_logger:
@@ -128,47 +145,25 @@ def search_events(query: str, limit: int = 50, show_details: bool = False):
         return
 
     try:
-        events = event_logger.get_recent_events(1000)  # Get more events for searching
-        
-        if not events:
-            print("📭 No events found")
-            return
-        
-        # Filter events by query
-        query_lower = query.lower()
-        matching_events = []
-        
-        for event in events:
-            # Search in various fields
-            searchable_text = " ".join([
-                str(event.get("id", "")),
-                str(event.get("type", "")),
-                str(event.get("patch_id", "")),
-                str(event.get("target_file", "")),
-                str(event.get("description", "")),
-                str(event.get("user_id", "")),
-                str(event.get("command", "")),
-                str(event.get("text", "")),
-            ])
-            
-            if query_lower in searchable_text.lower():
-                matching_events.append(event)
+        try:
+            matching_events = event_logger.search_events(query, limit)
+        except SearchUnavailable:
+            matching_events = _scan_recent_events(query)[-limit:][::-1]
         
         if not matching_events:
             print(f"🔍 No events found matching '{query}'")
             return
         
-        print(f"🔍 Found {len(matching_events)} events matching '{query}'")
+        print(f"🔍 Showing {len(matching_events)} most recent events matching '{query}'")
         print("=" * 80)
         
-        for event in matching_events[:limit]:
+        for event in matching_events:
             display_event(event, show_details)
             
     except Exception as e:
         print(f"❌ Error searching events: {e}")
         try:
-            if slack_proxy:
-                slack_proxy.notify_error(f"Error searching events: {e}")
+            get_slack_proxy().notify_error(f"Error searching events: {e}")
         except Exception:
             pass
 
@@ -196,8 +191,7 @@ def get_event_summary():
     except Exception as e:
         print(f"❌ Error getting event summary: {e}")
         try:
-            if slack_proxy:
-                slack_proxy.notify_error(f"Error getting event summary: {e}")
+            get_slack_proxy().notify_error(f"Error getting event summary: {e}")
         except Exception:
             pass
 
@@ -262,8 +256,7 @@ def get_event_analytics():
     except Exception as e:
         print(f"❌ Error getting event analytics: {e}")
         try:
-            if slack_proxy:
-                slack_proxy.notify_error(f"Error getting event analytics: {e}")
+            get_slack_proxy().notify_error(f"Error getting event analytics: {e}")
         except Exception:
             pass
 
@@ -275,7 +268,7 @@ def main():
     parser = argparse.ArgumentParser(description="Event Viewer for GPT-Cursor Runner")
     parser.add_argument("--limit", type=int, default=20, help="Limit number of events")
     parser.add_argument("--type", help="Filter by event type")
-    parser.add_argument("--search", help="Search events by content")
+    parser.add_argument("--search", help="Search events (e.g. 'deploy', 'depl*', 'target_file:*.tsx')")
     parser.add_argument("--details", action="store_true", help="Show detailed information")
     parser.add_argument("--summary", action="store_true", help="Show event summary")
     parser.add_argument("--analytics", action="store_true", help="Show event analytics")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Patch Catalog for GPT-Cursor Runner.
+
+Provides a persistent SQLite index of the patches directory so patch lookups
+by ID are a single indexed query and listings never re-parse unchanged files.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = ".patch-catalog.db"
+
+_COLUMNS = (
+    "filename", "filepath", "patch_id", "target_file", "description",
+    "author", "source", "status", "size", "mtime_ns", "error",
+)
+
+
+class PatchCatalog:
+    """Index of patch files keyed by filename and patch ID.
+
+    Freshness is kept by stat diffing: a refresh lists the directory with
+    ``os.scandir`` and re-parses only files whose size or mtime changed, so
+    an unchanged directory costs one stat per file and no JSON parsing.
+    Refreshes are throttled to ``refresh_interval`` seconds; ID lookups
+    stat-check the indexed file, so a stale hit is never returned. Writers
+    in this process call ``invalidate`` after saving a patch so the next
+    listing sees it, and ``latest`` always rescans.
+    """
+
+    def __init__(self, patches_dir: str, db_path: Optional[str] = None,
+                 refresh_interval: float = 2.0):
+        self.patches_dir = patches_dir
+        self.db_path = db_path or os.path.join(patches_dir, CATALOG_FILE)
+        self.refresh_interval = refresh_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._last_refresh = 0.0
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        try:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            # Read-only or missing patches directory: keep the index in memory
+            logger.warning(f"Patch catalog falling back to memory ({self.db_path}): {e}")
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS patches ("
+            "filename TEXT PRIMARY KEY, filepath TEXT, patch_id TEXT, target_file TEXT, "
+            "description TEXT, author TEXT, source TEXT, status TEXT, size INTEGER, "
+            "mtime_ns INTEGER, error TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS patches_id ON patches(patch_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS patches_mtime ON patches(mtime_ns)")
+        conn.execute("CREATE INDEX IF NOT EXISTS patches_target ON patches(target_file)")
+        conn.commit()
+        self._stats = {
+            row["filename"]: (row["size"], row["mtime_ns"])
+            for row in conn.execute("SELECT filename, size, mtime_ns FROM patches")
+        }
+        self._conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    def _parse(self, filename: str, size: int, mtime_ns: int) -> Dict[str, Any]:
+        filepath = os.path.join(self.patches_dir, filename)
+        row = {column: None for column in _COLUMNS}
+        row.update(filename=filename, filepath=filepath, size=size, mtime_ns=mtime_ns)
+        try:
+            with open(filepath, "r") as f:
+                patch_data = json.load(f)
+            metadata = patch_data.get("metadata") or {}
+            row.update(
+                patch_id=patch_data.get("id", "unknown"),
+                target_file=patch_data.get("target_file", ""),
+                description=patch_data.get("description", ""),
+                author=metadata.get("author", "unknown"),
+                source=metadata.get("source", "unknown"),
+                status=patch_data.get("status", "unknown"),
+            )
+        except Exception as e:
+            row.update(status="error", error=str(e))
+        return row
+
+    def _upsert(self, conn: sqlite3.Connection, row: Dict[str, Any]):
+        conn.execute(
+            f"INSERT OR REPLACE INTO patches ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+            tuple(row[column] for column in _COLUMNS),
+        )
+        self._stats[row["filename"]] = (row["size"], row["mtime_ns"])
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """Bring the index in line with the directory; returns change counts."""
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            if not force and time.time() - self._last_refresh < self.refresh_interval:
+                return changes
+            conn = self._connect()
+            self._last_refresh = time.time()
+
+            seen: Dict[str, Tuple[int, int]] = {}
+            try:
+                with os.scandir(self.patches_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".json") or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        seen[entry.name] = (stat.st_size, stat.st_mtime_ns)
+            except FileNotFoundError:
+                pass
+
+            for filename, (size, mtime_ns) in seen.items():
+                known = self._stats.get(filename)
+                if known == (size, mtime_ns):
+                    continue
+                self._upsert(conn, self._parse(filename, size, mtime_ns))
+                changes["updated" if known else "added"] += 1
+
+            removed = [name for name in self._stats if name not in seen]
+            for filename in removed:
+                conn.execute("DELETE FROM patches WHERE filename = ?", (filename,))
+                del self._stats[filename]
+            changes["removed"] = len(removed)
+
+            if any(changes.values()):
+                conn.commit()
+        return changes
+
+    def invalidate(self):
+        """Make the next refresh rescan the directory regardless of the throttle."""
+        with self._lock:
+            self._last_refresh = 0.0
+
+    def _verify(self, conn: sqlite3.Connection, row: sqlite3.Row) -> Optional[Dict[str, Any]]:
+        """Re-stat an indexed file, re-parsing it if it changed."""
+        try:
+            stat = os.stat(row["filepath"])
+        except FileNotFoundError:
+            conn.execute("DELETE FROM patches WHERE filename = ?", (row["filename"],))
+            conn.commit()
+            self._stats.pop(row["filename"], None)
+            return None
+        if (stat.st_size, stat.st_mtime_ns) == (row["size"], row["mtime_ns"]):
+            return dict(row)
+        fresh = self._parse(row["filename"], stat.st_size, stat.st_mtime_ns)
+        self._upsert(conn, fresh)
+        conn.commit()
+        return fresh
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def find(self, patch_id: str) -> Optional[Dict[str, Any]]:
+        """Catalog entry for a patch ID (newest file wins), or None."""
+        with self._lock:
+            conn = self._connect()
+            for attempt in range(2):
+                rows = conn.execute(
+                    "SELECT * FROM patches WHERE patch_id = ? ORDER BY mtime_ns DESC", (patch_id,)
+                ).fetchall()
+                for row in rows:
+                    entry = self._verify(conn, row)
+                    if entry and entry["patch_id"] == patch_id:
+                        return entry
+                if attempt == 0:
+                    # Not indexed (yet): pick up new files and retry once
+                    self.refresh(force=True)
+        return None
+
+    def find_path(self, patch_id: str) -> Optional[str]:
+        """Path of the patch file with the given ID, or None."""
+        entry = self.find(patch_id)
+        return entry["filepath"] if entry else None
+
+    def entries(self, limit: Optional[int] = None, target_file: Optional[str] = None,
+                fresh: bool = False) -> List[Dict[str, Any]]:
+        """Catalog entries, newest first; ``fresh`` skips the refresh throttle."""
+        self.refresh(force=fresh)
+        with self._lock:
+            conn = self._connect()
+            sql = "SELECT * FROM patches"
+            params: List[Any] = []
+            if target_file:
+                sql += " WHERE target_file = ?"
+                params.append(target_file)
+            sql += " ORDER BY mtime_ns DESC"
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recently modified patch entry."""
+        # Callers apply "the patch just received"; a throttled view could
+        # hand them the one before it
+        entries = self.entries(limit=1, fresh=True)
+        return entries[0] if entries else None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def to_patch_info(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an entry to the ``patch_viewer.list_patches`` record format."""
+        if entry.get("status") == "error":
+            return {
+                "filename": entry["filename"],
+                "filepath": entry["filepath"],
+                "error": entry.get("error", ""),
+                "status": "error",
+            }
+        return {
+            "filename": entry["filename"],
+            "filepath": entry["filepath"],
+            "size": entry["size"],
+            "modified": datetime.fromtimestamp(entry["mtime_ns"] / 1e9).isoformat(),
+            "patch_id": entry["patch_id"],
+            "target_file": entry["target_file"],
+            "description": entry["description"],
+            "author": entry["author"],
+            "source": entry["source"],
+            "status": entry["status"],
+        }
+
+
+_catalogs: Dict[str, PatchCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_patch_catalog(patches_dir: Optional[str] = None) -> PatchCatalog:
+    """Get the shared catalog for a patches directory."""
+    if patches_dir is None:
+        patches_dir = os.getenv("PATCHES_DIRECTORY", "patches")
+    key = os.path.abspath(patches_dir)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = PatchCatalog(patches_dir)
+        return _catalogs[key]
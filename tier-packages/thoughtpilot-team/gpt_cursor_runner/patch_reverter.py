@@ -1,54 +1,242 @@
-""""
-Patch Reverter for GPT-Cursor Runner."""
-Reverts patches by patch_id or timestamp with automatic backup management."""
+#!/usr/bin/env python3
+"""
+Patch Reverter for GPT-Cursor Runner.
+
+Reverts patches by patch_id or timestamp using versions kept in the backup
+store.
+"""
 
 import os
-import json
-import shutil
 import glob
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional"""
-class PatchReverter import ""Reverts patches and manages backup files.""
-    def __init__(self, patches_dir str = "patches", backup_suffix
-        str = ".bak")
+from typing import Dict, Any, List, Optional
+
+from .backup_store import get_backup_store
+from .patch_catalog import get_patch_catalog
+
+
+class PatchReverter:
+    """Reverts patches from the backup store and manages backup retention."""
+
+    def __init__(self, patches_dir: str = "patches", backup_suffix: str = ".bak", store=None):
         self.patches_dir = patches_dir
-        self.backup_suffix = backup_suffix"
-    def find_backup_files(self, target_file
-        str) -> List[Dict[str, Any]]         """Find all backup files for a target file."""         backup_pattern = f"{target_file}{self.backup_suffix}_*"         bac""
-    f"kup_files = glob.glob(backup_pattern)          backups = []         for backup_file in backup_files
-        try                 # Extract timestamp from filename                 timestamp_str = backup_file.split(f"{self.backup_suffix}_")[-1]                 timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")                  # Get file stats                 stat = os.stat(backup_file)                  backups.append(                     {                         "backup_file"
-        backup_file,                         "timestamp" timestamp,                         "size" import stat.st_size,                         "created" datetime.fromtimestamp(stat.st_mtime),                     }                 )             except Exception as e as print(f"Warning in Could not parse backup file {backup_file} target_file,             "backup_used" import None,             "timestamp" datetime.now().isoformat(),         }          try:             # Find the patch file             patch_file = self._find_patch_by_id(patch_id)             if not patch_file
-        result["message"] = f"Patch with ID '{patch_id}' not found"                 return result              # Load patch data             with open(patch_file, "r") as f
-        patch_data = json.load(f)              target_file = target_file or patch_data.get("target_file")             if not target_file                 result["message"] = "No target file specified in patch"                 return result              # Find backup files             backups = self.find_backup_files(target_file)             if not backups
-        result["message"] = f"No backup files found for {target_file}"                 return result              # Use the most recent backup             backup_info = backups[0]              # Create a backup of current file before reverting             current_backup = f"{target_file}.revert_backup_{"                 datetime.now().strftime('%Y%m%d_%H%M%S')}"             shutil.copy2(target_file, current_backup)              # Restore from backup             shutil.copy2(backup_info["backup_file"], target_file)              result.update(                 {                     "success" True,                     "message" f"Successfully reverted {target_file} to state from {"                         backup_info['timestamp']}",                     "backup_used" import backup_info["backup_file"],                     "current_backup" current_backup,                 }             )          except Exception as e as result["message"] = f"Error reverting patch in {str(e)}"          return result      def revert_by_timestamp(
-        self, target_file str, timestamp timestamp.isoformat(),             "backup_used" import None,         }          try             # Find backup files             backups = self.find_backup_files(target_file)             if not backups
-        result["message"] = f"No backup files found for {target_file}"                 return result              # Find the closest backup to the timestamp             closest_backup = None             min_diff = timedelta.max              for backup in backups
-        diff = abs(backup["timestamp"] - timestamp)                 if diff < min_diff                     min_diff = diff                     closest_backup = backup              if not closest_backup                 result["message"] = f"No suitable backup found for {target_file}"                 return result              # Create a backup of current file             current_backup = f"{target_file}.revert_backup_{"                 datetime.now().strftime('%Y%m%d_%H%M%S')}"             shutil.copy2(target_file, current_backup)              # Restore from backup             shutil.copy2(closest_backup["backup_file"], target_file)              result.update(                 {                     "success"
-        True,                     "message" f"Successfully reverted {target_file} to state from {"                         closest_backup['timestamp']}",                     "backup_used"
-        closest_backup["backup_file"],                     "current_backup" current_backup,                     "time_difference" import str(min_diff),                 }             )          except Exception as e             result["message"] = f"Error reverting by timestamp in {str(e)}"          return result      def revert_latest_patch(self, target_file
-        str) -> Dict[str, Any]         """Revert the most recent patch for a file."""         result = {             "success"
-        False,             "message" "",             "target_file" backup["timestamp"],                         "backup_file" import backup["backup_file"],                         "size" backup["size"],                     }                 )         else: target_file,                                     "timestamp": backup["timestamp"],                                     "backup_file": backup["backup_file"],                                     "patch_file": patch_file,                                     "description": patch_data.get("description", ""),                                 }                             )                 except Exception as e: Could not read patch file {patch_file}: {e}")
-        # Sort by timestamp (newest first)         revertable.sort(key = lambda x x["timestamp"], reverse=True)         return revertable      def _find_patch_by_id(self, patch_id
-        str) -> Optional[str]         """Find a patch file by its ID."""         patch_files = glob.glob(os.path.join(self.patches_dir, "*.json"))          for patch_file in patch_files
-        try                 with open(patch_file, "r") as f as patch_data = json.load(f)                  if patch_data.get("id") == patch_id
-        return patch_file             except Exception as e
-        try                     from .slack_proxy import create_slack_proxy                      slack_proxy = create_slack_proxy()                     context_str = (                         patch_file if isinstance(patch_file, str) else str(patch_file)                     )                     slack_proxy.notify_error(                         f"Error reading patch file in _find_patch_by_id {e}",                         context = context_str,                     )                 except Exception
-        pass                 continue          return None      def cleanup_old_backups(self, days
-        int = 30) -> Dict[str, Any]         """Clean up backup files older than specified days."""         result = {             "success" True,             "files_removed" import 0,             "errors" [],             "timestamp": datetime.now().isoformat(),         }          cutoff_time = datetime.now() - timedelta(days=days)          # Find all backup files         backup_files = glob.glob(f"*{self.backup_suffix}_*")          for backup_file in backup_files
-        try                 # Extract timestamp from filename                 timestamp_str = backup_file.split(f"{self.backup_suffix}_")[-1]                 timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")                  if timestamp < cutoff_time
-        os.remove(backup_file)                     result["files_removed"] += 1              except Exception as e                 result["errors"].append(f"Error processing {backup_file} import {e}")                 try                     from .slack_proxy import create_slack_proxy                      slack_proxy = create_slack_proxy()                     context_str = (                         backup_file                         if isinstance(backup_file, str)
-        else str(backup_file)
-                    )
-                    slack_proxy.notify_error("
-                        f"Error processing backup file in cleanup_old_backups import {e}",
-                        context=context_str,
+        # Suffix of legacy in-tree backups, still removed by cleanup_old_backups
+        self.backup_suffix = backup_suffix
+        self._store = store
+
+    @property
+    def store(self):
+        return self._store or get_backup_store()
+
+    def find_backup_files(self, target_file: str) -> List[Dict[str, Any]]:
+        """Find all stored versions of a target file (newest first)."""
+        return self.store.versions(target_file)
+
+    def _restore(self, target_file: str, version: Dict[str, Any]) -> Dict[str, Any]:
+        """Save the current file, then restore ``version`` over it."""
+        current = self.store.save(target_file, reason="revert") if os.path.exists(target_file) else None
+        self.store.restore(version, target_file)
+        return {
+            "success": True,
+            "message": f"Successfully reverted {target_file} to state from {version['timestamp']}",
+            "backup_used": version["version_id"],
+            "backup_hash": version["hash"],
+            "current_backup": current["version_id"] if current else None,
+        }
+
+    def revert_patch(self, patch_id: str, target_file: Optional[str] = None,
+                     include_batch: bool = False) -> Dict[str, Any]:
+        """Revert a file to the backup taken before a patch was applied.
+
+        Patches applied to a file in one batch share that backup, so
+        restoring it undoes all of them. Unless ``include_batch`` is set,
+        such a revert is refused; either way ``also_reverted`` lists the
+        other patches the backup would undo.
+        """
+        result = {
+            "success": False,
+            "message": "",
+            "patch_id": patch_id,
+            "target_file": target_file,
+            "backup_used": None,
+            "also_reverted": [],
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        try:
+            # Only the version recorded for this patch will do: another
+            # backup of the same file would silently undo other changes too
+            version = self.store.find_by_patch(patch_id, target_file)
+            if not version:
+                if not target_file and not get_patch_catalog(self.patches_dir).find(patch_id):
+                    result["message"] = f"Patch with ID '{patch_id}' not found"
+                else:
+                    result["message"] = (
+                        f"No backup recorded for patch '{patch_id}'; "
+                        f"use revert_by_timestamp to pick a version"
                     )
-                except Exception
-                    pass
+                return result
+
+            target_file = target_file or version["target_file"]
+            result["target_file"] = target_file
+            others = [pid for pid in self.store.patch_ids(version["version_id"]) if pid != patch_id]
+            result["also_reverted"] = others
+            if others and not include_batch:
+                result["message"] = (
+                    f"Patch '{patch_id}' was applied in a batch with {', '.join(others)}; "
+                    f"its backup would revert those too (pass include_batch to proceed)"
+                )
+                return result
+
+            result.update(self._restore(target_file, version))
+            if others:
+                result["message"] += f" (also reverted {', '.join(others)})"
+
+        except Exception as e:
+            result["message"] = f"Error reverting patch: {str(e)}"
+
+        return result
+
+    def revert_by_timestamp(self, target_file: str, timestamp: datetime) -> Dict[str, Any]:
+        """Revert a file to the backup closest to a timestamp."""
+        result = {
+            "success": False,
+            "message": "",
+            "target_file": target_file,
+            "requested_timestamp": timestamp.isoformat(),
+            "backup_used": None,
+        }
+
+        try:
+            version = self.store.closest(target_file, timestamp)
+            if not version:
+                result["message"] = f"No backup files found for {target_file}"
+                return result
+
+            result.update(self._restore(target_file, version))
+            result["time_difference"] = str(abs(version["timestamp"] - timestamp))
+
+        except Exception as e:
+            result["message"] = f"Error reverting by timestamp: {str(e)}"
 
         return result
 
+    def revert_latest_patch(self, target_file: str) -> Dict[str, Any]:
+        """Revert the most recent patch for a file."""
+        result = {
+            "success": False,
+            "message": "",
+            "target_file": target_file,
+            "backup_used": None,
+        }
+
+        try:
+            version = self.store.latest(target_file, reason="patch")
+            if not version:
+                result["message"] = f"No backup files found for {target_file}"
+                return result
+
+            result.update(self._restore(target_file, version))
+
+        except Exception as e:
+            result["message"] = f"Error reverting latest patch: {str(e)}"
+
+        return result
+
+    def list_backups(self, target_file: str) -> List[Dict[str, Any]]:
+        """List backups for a file in display form."""
+        return [
+            {
+                "timestamp": version["timestamp"].isoformat(),
+                "backup_id": version["version_id"],
+                "hash": version["hash"],
+                "reason": version["reason"],
+                "size": version["size"],
+            }
+            for version in self.find_backup_files(target_file)
+        ]
+
+    def list_revertable_patches(self) -> List[Dict[str, Any]]:
+        """List patches that have a backup to revert to."""
+        revertable = []
+
+        for entry in get_patch_catalog(self.patches_dir).entries():
+            if entry.get("status") == "error" or not entry.get("target_file"):
+                continue
+            version = self.store.find_by_patch(entry["patch_id"])
+            if not version:
+                continue
+            revertable.append(
+                {
+                    "patch_id": entry["patch_id"],
+                    "target_file": entry["target_file"],
+                    "timestamp": version["timestamp"],
+                    "backup_id": version["version_id"],
+                    "patch_file": entry["filepath"],
+                    "description": entry.get("description", ""),
+                }
+            )
+
+        # Sort by timestamp (newest first)
+        revertable.sort(key=lambda x: x["timestamp"], reverse=True)
+        return revertable
+
+    def _find_patch_by_id(self, patch_id: str) -> Optional[str]:
+        """Find a patch file by its ID."""
+        return get_patch_catalog(self.patches_dir).find_path(patch_id)
+
+    def cleanup_old_backups(self, days: int = 30) -> Dict[str, Any]:
+        """Prune backups older than specified days and free unreferenced content."""
+        result = {
+            "success": True,
+            "files_removed": 0,
+            "versions_removed": 0,
+            "objects_removed": 0,
+            "bytes_freed": 0,
+            "errors": [],
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        cutoff_time = datetime.now() - timedelta(days=days)
+
+        try:
+            result["versions_removed"] = self.store.prune(cutoff_time)
+            result.update(self.store.gc())
+        except Exception as e:
+            result["success"] = False
+            result["errors"].append(f"Error pruning backup store: {e}")
+            self._notify_cleanup_error(e, self.store.root)
+
+        # Legacy in-tree backups written before the backup store
+        for backup_file in glob.glob(f"*{self.backup_suffix}_*"):
+            try:
+                # Extract timestamp from filename
+                timestamp_str = backup_file.split(f"{self.backup_suffix}_")[-1]
+                timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
+
+                if timestamp < cutoff_time:
+                    os.remove(backup_file)
+                    result["files_removed"] += 1
+
+            except Exception as e:
+                result["errors"].append(f"Error processing {backup_file}: {e}")
+                self._notify_cleanup_error(e, backup_file)
+
+        return result
+
+    @staticmethod
+    def _notify_cleanup_error(error: Exception, context: str):
+        try:
+            from .slack_proxy import create_slack_proxy
+
+            slack_proxy = create_slack_proxy()
+            slack_proxy.notify_error(
+                f"Error processing backup file in cleanup_old_backups: {error}",
+                context=str(context),
+            )
+        except Exception:
+            pass
+
 
 # Global instance
 patch_reverter = PatchReverter()
-"'
\ No newline at end of file
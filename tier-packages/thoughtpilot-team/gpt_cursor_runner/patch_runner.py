@@ -9,20 +9,24 @@ import os
 import re
 import json
 import shutil
+import tempfile
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, List
 
+from .backup_store import get_backup_store
+from .patch_catalog import get_patch_catalog
+from .patch_engine import (
+    PATCH_MODES, MODE_REGEX, find_overlap, resolve_mode, shift_regions,
+)
+from .patch_pool import PatchTimeout, run_pattern
+
 # Import dependencies
 try:
     from .event_logger import event_logger as EVENT_LOGGER
 except ImportError:
     EVENT_LOGGER = None
 
-try:
-    from .slack_proxy import create_slack_proxy
-    slack_proxy = create_slack_proxy()
-except ImportError:
-    slack_proxy = None
+from .slack_proxy import get_slack_proxy
 
 
 def validate_patch_schema(patch_data: Dict[str, Any]) -> Tuple[bool, str]:
@@ -43,6 +47,16 @@ def validate_patch_schema(patch_data: Dict[str, Any]) -> Tuple[bool, str]:
     if "replacement" not in patch_info:
         return False, "Patch must contain 'replacement' field"
     
+    mode = patch_info.get("mode")
+    if mode is not None and mode not in PATCH_MODES:
+        return False, f"Patch mode must be one of: {', '.join(PATCH_MODES)}"
+    
+    timeout_ms = patch_info.get("timeout_ms")
+    if timeout_ms is not None and (
+        isinstance(timeout_ms, bool) or not isinstance(timeout_ms, int) or timeout_ms <= 0
+    ):
+        return False, "Patch timeout_ms must be a positive integer"
+    
     return True, ""
 
 
@@ -54,147 +68,230 @@ def log_patch_event(event_type: str, patch_data: Dict[str, Any], result: Optiona
 
 def notify_patch_event(event_type: str, patch_data: Dict[str, Any], result: Optional[Dict[str, Any]] = None):
     """Notify Slack of patch events."""
-    if slack_proxy:
-        try:
-            if event_type == "patch_applied" and result and result.get("success"):
-                slack_proxy.notify_patch_applied(
-                    patch_data.get("id", "unknown"),
-                    patch_data.get("target_file", "unknown"),
-                    True,
-                )
-            elif event_type in ["validation_failed", "application_error", "dangerous_pattern"]:
-                error_msg = (
-                    result.get("message", "Unknown error")
-                    if result
-                    else "Unknown error"
-                )
-                slack_proxy.notify_error(
-                    f"Patch {event_type}: {error_msg}",
-                    context=patch_data.get("target_file", ""),
-                )
-        except Exception as e:
-            print(f"Error notifying Slack: {e}")
+    try:
+        if event_type == "patch_applied" and result and result.get("success"):
+            get_slack_proxy().notify_patch_applied(
+                patch_data.get("id", "unknown"),
+                patch_data.get("target_file", "unknown"),
+                True,
+            )
+        elif event_type in ["validation_failed", "application_error", "dangerous_pattern", "patch_timeout"]:
+            error_msg = (
+                result.get("message", "Unknown error")
+                if result
+                else "Unknown error"
+            )
+            get_slack_proxy().notify_error(
+                f"Patch {event_type}: {error_msg}",
+                context=patch_data.get("target_file", ""),
+            )
+    except Exception as e:
+        print(f"Error notifying Slack: {e}")
 
 
-def apply_patch(patch_data: Dict[str, Any], dry_run: bool = False, force: bool = False) -> Dict[str, Any]:
-    """Apply a patch to a target file."""
-    result = {
-        "success": False,
-        "message": "",
-        "changes_made": False,
-        "backup_created": False,
-        "patch_id": patch_data.get("id", ""),
-        "target_file": patch_data.get("target_file", ""),
-        "timestamp": datetime.now().isoformat(),
-    }
+def _fail(result: Dict[str, Any], event_type: str, message: str, patch_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Record a failed patch result and report it."""
+    result["message"] = message
+    log_patch_event(event_type, patch_data, result)
+    notify_patch_event(event_type, patch_data, result)
+    return result
+
 
+def _check_patch(patch_data: Dict[str, Any], result: Dict[str, Any], force: bool) -> bool:
+    """Run the pre-application checks; on failure fills in ``result`` and returns False."""
     # Validate patch schema
     is_valid, error_msg = validate_patch_schema(patch_data)
     if not is_valid:
-        result["message"] = f"Schema validation failed: {error_msg}"
-        log_patch_event("validation_failed", patch_data, result)
-        notify_patch_event("validation_failed", patch_data, result)
-        return result
+        _fail(result, "validation_failed", f"Schema validation failed: {error_msg}", patch_data)
+        return False
 
     target_file = patch_data.get("target_file")
     if not target_file:
-        result["message"] = "No target file specified"
-        log_patch_event("missing_target", patch_data, result)
-        notify_patch_event("missing_target", patch_data, result)
-        return result
+        _fail(result, "missing_target", "No target file specified", patch_data)
+        return False
 
     if not os.path.exists(target_file):
-        result["message"] = f"Target file not found: {target_file}"
-        log_patch_event("file_not_found", patch_data, result)
-        notify_patch_event("file_not_found", patch_data, result)
-        return result
+        _fail(result, "file_not_found", f"Target file not found: {target_file}", patch_data)
+        return False
 
     patch_info = patch_data.get("patch", {})
     pattern = patch_info.get("pattern")
-    replacement = patch_info.get("replacement")
 
     if not pattern:
-        result["message"] = "No pattern specified"
-        log_patch_event("missing_pattern", patch_data, result)
-        notify_patch_event("missing_pattern", patch_data, result)
-        return result
+        _fail(result, "missing_pattern", "No pattern specified", patch_data)
+        return False
 
-    if not replacement:
-        result["message"] = "No replacement specified"
-        log_patch_event("missing_replacement", patch_data, result)
-        notify_patch_event("missing_replacement", patch_data, result)
-        return result
+    if not patch_info.get("replacement"):
+        _fail(result, "missing_replacement", "No replacement specified", patch_data)
+        return False
 
     # Check for dangerous patterns
     if is_dangerous_pattern(pattern) and not force:
-        result["message"] = f"Dangerous pattern detected: {pattern}"
-        log_patch_event("dangerous_pattern", patch_data, result)
-        notify_patch_event("dangerous_pattern", patch_data, result)
-        return result
+        _fail(result, "dangerous_pattern", f"Dangerous pattern detected: {pattern}", patch_data)
+        return False
+
+    return True
+
 
+def _write_atomic(target_file: str, content: str):
+    """Replace a file's content via a temp file and ``os.replace``."""
+    directory = os.path.dirname(os.path.abspath(target_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(target_file)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(target_file, tmp_path)
+        os.replace(tmp_path, target_file)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _apply_file_group(target_file: str, group: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                      dry_run: bool):
+    """Apply patches for one target file: one read, one backup, one write.
+
+    Patches are applied in order to an in-memory buffer. A patch whose
+    matches touch text rewritten by an earlier patch in the group is
+    rejected as a conflict instead of being applied on top of it.
+    """
     try:
         with open(target_file, "r", encoding="utf-8") as f:
             content = f.read()
-
-        # Check if pattern is a regex (contains special regex characters)
-        is_regex = any(char in pattern for char in r'^$.*+?{}[]()|\\')
-
-        if is_regex:
-            # Use regex matching
-            if not re.search(pattern, content, re.DOTALL):
-                result["message"] = f"Regex pattern not found in file: {pattern}"
-                log_patch_event("pattern_not_found", patch_data, result)
-                notify_patch_event("pattern_not_found", patch_data, result)
-                return result
-
-            # Apply regex replacement
-            new_content = re.sub(pattern, replacement, content, flags=re.DOTALL)
-        else:
-            # Use simple string matching
-            if pattern not in content:
-                result["message"] = f"Pattern not found in file: {pattern}"
-                log_patch_event("pattern_not_found", patch_data, result)
-                notify_patch_event("pattern_not_found", patch_data, result)
-                return result
-
-            # Apply simple string replacement
-            new_content = content.replace(pattern, replacement)
-
-        if new_content == content:
-            result["message"] = "No changes made (replacement identical)"
-            log_patch_event("no_changes", patch_data, result)
-            notify_patch_event("no_changes", patch_data, result)
-            return result
-
-        # Create backup if not dry run
-        if not dry_run:
-            backup_file = f"{target_file}.bak_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            shutil.copy2(target_file, backup_file)
-            result["backup_created"] = True
-            result["backup_file"] = backup_file
-
-        # Write changes if not dry run
-        if not dry_run:
-            with open(target_file, "w", encoding="utf-8") as f:
-                f.write(new_content)
-            result["changes_made"] = True
-            result["success"] = True
-            result["message"] = f"Successfully applied patch to {target_file}"
-            log_patch_event("patch_applied", patch_data, result)
-            notify_patch_event("patch_applied", patch_data, result)
-        else:
+    except Exception as e:
+        for patch_data, result in group:
+            _fail(result, "application_error", f"Error applying patch: {str(e)}", patch_data)
+        return
+
+    original = content
+    # Ranges of the buffer rewritten by patches applied so far
+    regions: List[Tuple[int, int]] = []
+    applied: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+
+    for patch_data, result in group:
+        patch_info = patch_data.get("patch", {})
+        pattern = patch_info.get("pattern")
+        mode = resolve_mode(patch_info)
+        try:
+            match = run_pattern(
+                content, pattern, patch_info.get("replacement"), mode, patch_info.get("timeout_ms")
+            )
+        except PatchTimeout as e:
+            _fail(result, "patch_timeout", f"Patch timed out: {e}", patch_data)
+            continue
+        except re.error as e:
+            _fail(result, "validation_failed", f"Invalid regex pattern: {e}", patch_data)
+            continue
+        except Exception as e:
+            _fail(result, "application_error", f"Error applying patch: {str(e)}", patch_data)
+            continue
+
+        result.update(match.to_dict())
+        if not match.matched:
+            label = "Regex pattern" if mode == MODE_REGEX else "Pattern"
+            _fail(result, "pattern_not_found", f"{label} not found in file: {pattern}", patch_data)
+            continue
+
+        overlap = find_overlap(match.edits, regions)
+        if overlap:
+            result["conflict_span"] = list(overlap)
+            _fail(
+                result,
+                "patch_conflict",
+                f"Patch overlaps text changed by an earlier patch in this batch at {overlap[0]}-{overlap[1]}",
+                patch_data,
+            )
+            continue
+
+        if match.new_content == content:
+            _fail(result, "no_changes", "No changes made (replacement identical)", patch_data)
+            continue
+
+        content = match.new_content
+        regions = shift_regions(regions, match.edits)
+        applied.append((patch_data, result))
+
+    if not applied:
+        return
+
+    if dry_run:
+        for patch_data, result in applied:
             result["message"] = f"Dry run: Would apply patch to {target_file}"
             result["success"] = True
             log_patch_event("dry_run", patch_data, result)
             notify_patch_event("dry_run", patch_data, result)
+        return
 
-        return result
-
+    try:
+        if content != original:
+            store = get_backup_store()
+            backup = store.save(
+                target_file, patch_ids=[patch_data.get("id") for patch_data, _ in applied]
+            )
+            # Kept for callers of the old copy-based backups; the object is
+            # compressed, so restore through the backup store by backup_id
+            backup_file = store.object_path(backup)
+            for _, result in applied:
+                result["backup_created"] = True
+                result["backup_id"] = backup["version_id"]
+                result["backup_hash"] = backup["hash"]
+                result["backup_file"] = backup_file
+            _write_atomic(target_file, content)
     except Exception as e:
-        result["message"] = f"Error applying patch: {str(e)}"
-        log_patch_event("application_error", patch_data, result)
-        notify_patch_event("application_error", patch_data, result)
-        return result
+        for patch_data, result in applied:
+            _fail(result, "application_error", f"Error applying patch: {str(e)}", patch_data)
+        return
+
+    for patch_data, result in applied:
+        result["changes_made"] = True
+        result["success"] = True
+        result["message"] = f"Successfully applied patch to {target_file}"
+        if len(group) > 1:
+            result["batch_size"] = len(group)
+        log_patch_event("patch_applied", patch_data, result)
+        notify_patch_event("patch_applied", patch_data, result)
+
+
+def apply_patches(batch: List[Dict[str, Any]], dry_run: bool = False, force: bool = False) -> List[Dict[str, Any]]:
+    """Apply a batch of patches, returning one result per patch in input order.
+
+    Patches are grouped by target file; each file is read once, backed up
+    once and written once (atomically), with its patches applied in order.
+    """
+    results: List[Dict[str, Any]] = []
+    groups: Dict[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]] = {}
+    targets: Dict[str, str] = {}
+
+    for patch_data in batch:
+        result = {
+            "success": False,
+            "message": "",
+            "changes_made": False,
+            "backup_created": False,
+            "patch_id": patch_data.get("id", ""),
+            "target_file": patch_data.get("target_file", ""),
+            "timestamp": datetime.now().isoformat(),
+        }
+        results.append(result)
+        if _check_patch(patch_data, result, force):
+            key = os.path.realpath(patch_data["target_file"])
+            targets.setdefault(key, patch_data["target_file"])
+            groups.setdefault(key, []).append((patch_data, result))
+
+    for key, group in groups.items():
+        _apply_file_group(targets[key], group, dry_run)
+
+    return results
+
+
+def apply_patch(patch_data: Dict[str, Any], dry_run: bool = False, force: bool = False) -> Dict[str, Any]:
+    """Apply a patch to a target file."""
+    return apply_patches([patch_data], dry_run=dry_run, force=force)[0]
 
 
 def is_dangerous_pattern(pattern: str) -> bool:
@@ -220,21 +317,12 @@ def load_latest_patch() -> Optional[Dict[str, Any]]:
     if not os.path.exists(patches_dir):
         return None
     
-    patch_files = []
-    for file in os.listdir(patches_dir):
-        if file.endswith(".json"):
-            filepath = os.path.join(patches_dir, file)
-            patch_files.append((filepath, os.path.getmtime(filepath)))
-    
-    if not patch_files:
+    latest = get_patch_catalog(patches_dir).latest()
+    if not latest:
         return None
     
-    # Sort by modification time (newest first)
-    patch_files.sort(key=lambda x: x[1], reverse=True)
-    latest_file = patch_files[0][0]
-    
     try:
-        with open(latest_file, "r") as f:
+        with open(latest["filepath"], "r") as f:
             return json.load(f)
     except Exception as e:
         print(f"Error loading latest patch: {e}")
@@ -7,78 +7,31 @@ Provides patch viewing and management capabilities.
 
 import os
 import json
-import glob
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from .patch_catalog import get_patch_catalog
+
 # Import dependencies
 try:
     from .event_logger import event_logger
 except ImportError:
     event_logger = None
 
-try:
-    from .slack_proxy import create_slack_proxy
-    slack_proxy = create_slack_proxy()
-except ImportError:
-    slack_proxy = None
+from .slack_proxy import get_slack_proxy
 
 
 def list_patches(patches_dir: Optional[str] = None) -> List[Dict[str, Any]]:
-    """List all patches with metadata."""
+    """List all patches with metadata (newest first)."""
     if patches_dir is None:
         # Try to get patches directory from environment or config
         patches_dir = os.getenv("PATCHES_DIRECTORY", "patches")
 
-    patches: List[Dict[str, Any]] = []
-    
     if not os.path.exists(patches_dir):
-        return patches
-    
-    patch_files = glob.glob(os.path.join(patches_dir, "*.json"))
+        return []
     
-    for filepath in patch_files:
-        try:
-            with open(filepath, "r") as f:
-                patch_data = json.load(f)
-
-            # Get file metadata
-            stat = os.stat(filepath)
-            
-            patch_info = {
-                "filename": os.path.basename(filepath),
-                "filepath": filepath,
-                "size": stat.st_size,
-                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "patch_id": patch_data.get("id", "unknown"),
-                "target_file": patch_data.get("target_file", ""),
-                "description": patch_data.get("description", ""),
-                "author": patch_data.get("metadata", {}).get("author", "unknown"),
-                "source": patch_data.get("metadata", {}).get("source", "unknown"),
-                "status": patch_data.get("status", "unknown"),
-            }
-
-            patches.append(patch_info)
-
-        except Exception as e:
-            error_info = {
-                "filename": os.path.basename(filepath),
-                "filepath": filepath,
-                "error": str(e),
-                "status": "error",
-            }
-            patches.append(error_info)
-
-            try:
-                if slack_proxy:
-                    slack_proxy.notify_error(f"Error reading patch file: {e}", context=filepath)
-            except Exception:
-                pass
-
-    # Sort by modification time (newest first)
-    patches.sort(key=lambda x: x.get("modified", ""), reverse=True)
-    
-    return patches
+    catalog = get_patch_catalog(patches_dir)
+    return [catalog.to_patch_info(entry) for entry in catalog.entries()]
 
 
 def view_patch(patch_id: str, patches_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -89,32 +42,28 @@ def view_patch(patch_id: str, patches_dir: Optional[str] = None) -> Optional[Dic
     if not os.path.exists(patches_dir):
         return None
     
-    patch_files = glob.glob(os.path.join(patches_dir, "*.json"))
-    
-    for filepath in patch_files:
+    entry = get_patch_catalog(patches_dir).find(patch_id)
+    if not entry:
+        return None
+
+    filepath = entry["filepath"]
+    try:
+        with open(filepath, "r") as f:
+            patch_data = json.load(f)
+        
+        return {
+            "filename": entry["filename"],
+            "filepath": filepath,
+            "size": entry["size"],
+            "modified": datetime.fromtimestamp(entry["mtime_ns"] / 1e9).isoformat(),
+            "patch_data": patch_data,
+        }
+
+    except Exception as e:
         try:
-            with open(filepath, "r") as f:
-                patch_data = json.load(f)
-            
-            if patch_data.get("id") == patch_id:
-                # Get file metadata
-                stat = os.stat(filepath)
-                
-                return {
-                    "filename": os.path.basename(filepath),
-                    "filepath": filepath,
-                    "size": stat.st_size,
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "patch_data": patch_data,
-                }
-
-        except Exception as e:
-            try:
-                if slack_proxy:
-                    slack_proxy.notify_error(f"Error reading patch file: {e}", context=filepath)
-            except Exception:
-                pass
-            continue
+            get_slack_proxy().notify_error(f"Error reading patch file: {e}", context=filepath)
+        except Exception:
+            pass
 
     return None
 
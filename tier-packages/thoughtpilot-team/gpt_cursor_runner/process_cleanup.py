@@ -13,20 +13,10 @@ from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass
 import logging
 
-logger = logging.getLogger(__name__)
-
+from .scheduler import get_scheduler
+from .process_table import ProcessInfo, get_process_table
 
-@dataclass
-class ProcessInfo:
-    """Information about a process."""
-    pid: int
-    name: str
-    cmdline: List[str]
-    cpu_percent: float
-    memory_percent: float
-    create_time: float
-    status: str
-    parent_pid: Optional[int] = None
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -48,8 +38,6 @@ class ProcessCleanup:
         self.rules: List[CleanupRule] = []
         self.whitelist: Set[str] = set()
         self.cleaned_processes: List[Dict[str, Any]] = []
-        self._stop_event = threading.Event()
-        self._cleanup_thread: Optional[threading.Thread] = None
         
         # Set default cleanup rules
         self._setup_default_rules()
@@ -105,49 +93,25 @@ class ProcessCleanup:
         }
     
     def start(self):
-        """Start the process cleanup background thread."""
-        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-            self._stop_event.clear()
-            self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-            self._cleanup_thread.start()
-            logger.info("Process cleanup started")
+        """Schedule process cleanup on the shared scheduler."""
+        get_scheduler().add_job("process_cleanup", self._cleanup_cycle, self.check_interval)
+        logger.info("Process cleanup started")
     
     def stop(self):
-        """Stop the process cleanup background thread."""
-        self._stop_event.set()
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        """Remove process cleanup from the shared scheduler."""
+        if get_scheduler().remove_job("process_cleanup"):
             logger.info("Process cleanup stopped")
     
-    def _cleanup_loop(self):
-        """Background loop for process cleanup."""
-        while not self._stop_event.is_set():
-            try:
-                self._check_and_cleanup_processes()
-            except Exception as e:
-                logger.error(f"Error in process cleanup loop: {e}")
-            
-            # Wait for next cleanup cycle
-            self._stop_event.wait(self.check_interval)
+    def _cleanup_cycle(self):
+        """Run one cycle of process cleanup."""
+        self._check_and_cleanup_processes()
     
     def _check_and_cleanup_processes(self):
         """Check processes against cleanup rules and take action."""
         current_time = time.time()
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 
-                                       'memory_percent', 'create_time', 'status', 'ppid']):
+        for process_info in get_process_table().snapshot().processes:
             try:
-                process_info = ProcessInfo(
-                    pid=proc.info['pid'],
-                    name=proc.info['name'] or '',
-                    cmdline=proc.info['cmdline'] or [],
-                    cpu_percent=proc.info['cpu_percent'] or 0.0,
-                    memory_percent=proc.info['memory_percent'] or 0.0,
-                    create_time=proc.info['create_time'] or 0.0,
-                    status=proc.info['status'] or '',
-                    parent_pid=proc.info['ppid']
-                )
-                
                 # Skip whitelisted processes
                 if process_info.name in self.whitelist:
                     continue
@@ -158,10 +122,8 @@ class ProcessCleanup:
                         self._cleanup_process(process_info, rule)
                         break
                         
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
             except Exception as e:
-                logger.error(f"Error checking process {proc.pid}: {e}")
+                logger.error(f"Error checking process {process_info.pid}: {e}")
     
     def _should_cleanup_process(self, process_info: ProcessInfo, rule: CleanupRule, 
                                current_time: float) -> bool:
@@ -242,20 +204,8 @@ class ProcessCleanup:
         processes = []
         current_time = time.time()
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 
-                                       'memory_percent', 'create_time', 'status', 'ppid']):
+        for process_info in get_process_table().snapshot().processes:
             try:
-                process_info = ProcessInfo(
-                    pid=proc.info['pid'],
-                    name=proc.info['name'] or '',
-                    cmdline=proc.info['cmdline'] or [],
-                    cpu_percent=proc.info['cpu_percent'] or 0.0,
-                    memory_percent=proc.info['memory_percent'] or 0.0,
-                    create_time=proc.info['create_time'] or 0.0,
-                    status=proc.info['status'] or '',
-                    parent_pid=proc.info['ppid']
-                )
-                
                 processes.append({
                     'pid': process_info.pid,
                     'name': process_info.name,
@@ -268,8 +218,6 @@ class ProcessCleanup:
                     'whitelisted': process_info.name in self.whitelist
                 })
                 
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
             except Exception as e:
                 logger.error(f"Error getting process info: {e}")
         
@@ -301,8 +249,9 @@ class ProcessCleanup:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cleanup statistics."""
-        total_processes = len(self.get_process_list())
-        whitelisted_processes = len([p for p in self.get_process_list() if p['whitelisted']])
+        processes = self.get_process_list()
+        total_processes = len(processes)
+        whitelisted_processes = len([p for p in processes if p['whitelisted']])
         cleaned_count = len(self.cleaned_processes)
         
         return {
@@ -315,8 +264,14 @@ class ProcessCleanup:
 
 
 # Global process cleanup instance
-process_cleanup = ProcessCleanup()
+_process_cleanup: Optional[ProcessCleanup] = None
+_process_cleanup_lock = threading.Lock()
+
 
 def get_process_cleanup() -> ProcessCleanup:
-    """Get the global process cleanup instance."""
-    return process_cleanup 
\ No newline at end of file
+    """Get the global process cleanup instance, creating it on first use."""
+    global _process_cleanup
+    with _process_cleanup_lock:
+        if _process_cleanup is None:
+            _process_cleanup = ProcessCleanup()
+        return _process_cleanup
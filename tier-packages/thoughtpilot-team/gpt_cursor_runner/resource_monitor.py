@@ -5,7 +5,6 @@ Resource Monitoring Module for GHOST 2.0.
 Monitors system resources and provides alerts for resource constraints.
 """
 
-import psutil
 import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
@@ -13,6 +12,10 @@ from dataclasses import dataclass
 import logging
 from collections import deque
 
+from .scheduler import get_scheduler
+from .metrics_sampler import get_metrics_sampler
+from .process_table import get_process_table
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,8 +58,6 @@ class ResourceMonitor:
         self.thresholds: Dict[str, ResourceThreshold] = {}
         self.alerts: deque = deque(maxlen=100)  # Keep last 100 alerts
         self.metrics_history: deque = deque(maxlen=50)  # Keep last 50 metrics
-        self._stop_event = threading.Event()
-        self._monitor_thread: Optional[threading.Thread] = None
         self._alert_callbacks: List[Callable[[ResourceAlert], None]] = []
         
         # Set default thresholds
@@ -72,64 +73,36 @@ class ResourceMonitor:
         }
     
     def start(self):
-        """Start the resource monitoring background thread."""
-        if self._monitor_thread is None or not self._monitor_thread.is_alive():
-            self._stop_event.clear()
-            self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-            self._monitor_thread.start()
-            logger.info("Resource monitor started")
+        """Schedule resource monitoring on the shared scheduler."""
+        get_scheduler().add_job("resource_monitor", self._monitor_cycle, self.check_interval)
+        logger.info("Resource monitor started")
     
     def stop(self):
-        """Stop the resource monitoring background thread."""
-        self._stop_event.set()
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=5)
+        """Remove resource monitoring from the shared scheduler."""
+        if get_scheduler().remove_job("resource_monitor"):
             logger.info("Resource monitor stopped")
     
-    def _monitor_loop(self):
-        """Background loop for resource monitoring."""
-        while not self._stop_event.is_set():
-            try:
-                metrics = self._collect_metrics()
-                self.metrics_history.append(metrics)
-                self._check_thresholds(metrics)
-            except Exception as e:
-                logger.error(f"Error in resource monitoring loop: {e}")
-            
-            # Wait for next check cycle
-            self._stop_event.wait(self.check_interval)
+    def _monitor_cycle(self):
+        """Run one cycle of resource monitoring."""
+        metrics = self._collect_metrics()
+        self.metrics_history.append(metrics)
+        self._check_thresholds(metrics)
     
     def _collect_metrics(self) -> ResourceMetrics:
         """Collect current resource metrics."""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            # Memory metrics
-            memory = psutil.virtual_memory()
-            
-            # Disk metrics
-            disk = psutil.disk_usage('/')
-            
-            # Network metrics
-            network = psutil.net_io_counters()
-            network_io = {
-                'bytes_sent': network.bytes_sent,
-                'bytes_recv': network.bytes_recv,
-                'packets_sent': network.packets_sent,
-                'packets_recv': network.packets_recv
-            }
+            snapshot = get_metrics_sampler().get_snapshot()
             
             # Process count
-            process_count = len(psutil.pids())
+            process_count = len(get_process_table().snapshot())
             
             return ResourceMetrics(
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                disk_percent=(disk.used / disk.total) * 100,
-                network_io=network_io,
+                cpu_percent=snapshot.cpu_percent,
+                memory_percent=snapshot.memory['percent'],
+                disk_percent=snapshot.disk['percent'],
+                network_io=dict(snapshot.network),
                 process_count=process_count,
-                timestamp=datetime.now()
+                timestamp=snapshot.timestamp
             )
         except Exception as e:
             logger.error(f"Error collecting metrics: {e}")
@@ -264,8 +237,14 @@ class ResourceMonitor:
 
 
 # Global resource monitor instance
-resource_monitor = ResourceMonitor()
+_resource_monitor: Optional[ResourceMonitor] = None
+_resource_monitor_lock = threading.Lock()
+
 
 def get_resource_monitor() -> ResourceMonitor:
-    """Get the global resource monitor instance."""
-    return resource_monitor 
\ No newline at end of file
+    """Get the global resource monitor instance, creating it on first use."""
+    global _resource_monitor
+    with _resource_monitor_lock:
+        if _resource_monitor is None:
+            _resource_monitor = ResourceMonitor()
+        return _resource_monitor
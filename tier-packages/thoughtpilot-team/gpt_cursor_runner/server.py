@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Production Server for GPT-Cursor Runner.
+
+Provides the ``gpt-cursor-runner serve`` mode: the Flask app under gunicorn
+with threaded (gthread) workers, or the ASGI app under uvicorn workers, with
+per-worker initialization after fork, one primary worker for host-wide
+background services and a graceful drain on SIGTERM.
+
+All workers share one event store (see ``EventStore``), so every worker
+serves the same event history and cursors. Request processor state is
+per worker: a request submitted to ``/api/processor`` can only be polled
+on the worker that accepted it.
+"""
+
+import os
+import fcntl
+import threading
+from typing import Dict, Any, Optional
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None  # type: ignore
+
+PRIMARY_LOCK_FILE = "data/runner-primary.lock"
+
+# How often non-primary workers try to take over a vacated primary role
+PRIMARY_RETRY_SECONDS = 5.0
+
+
+class PrimaryElection:
+    """Host-wide primary role held through an exclusive file lock.
+
+    The lock is released by the OS when the holding process exits, so a
+    crashed or recycled primary is replaced by whichever worker next
+    polls the lock.
+    """
+
+    def __init__(self, lock_file: str = PRIMARY_LOCK_FILE):
+        self.lock_file = lock_file
+        self._fd: Optional[int] = None
+
+    @property
+    def is_primary(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        directory = os.path.dirname(self.lock_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+_election = PrimaryElection()
+_stop_event = threading.Event()
+
+
+def _become_primary():
+    from gpt_cursor_runner.main import start_services
+    from gpt_cursor_runner.patch_outbox import set_local_dispatch
+
+    set_local_dispatch(True)
+    start_services(worker=False, host_wide=True)
+
+
+def _watch_primary(interval: float):
+    while not _stop_event.wait(interval):
+        if _election.try_acquire():
+            print(f"👑 Worker {os.getpid()} took over host-wide services")
+            _become_primary()
+            return
+
+
+# Gunicorn server hooks
+
+
+def pre_fork(server, worker):
+    """Give the new worker the lowest free slot (runs in the master)."""
+    used = {w.slot for w in server.WORKERS.values() if hasattr(w, "slot")}
+    worker.slot = next(slot for slot in range(len(used) + 1) if slot not in used)
+
+
+def post_fork(server, worker):
+    """Per-worker setup before the app's singletons are first used."""
+    os.environ["RUNNER_WORKER_SLOT"] = str(worker.slot)
+    if server.cfg.workers > 1:
+        # Entries accepted by other workers reach the primary's dispatcher by polling
+        os.environ.setdefault("OUTBOX_POLL_INTERVAL", "1")
+
+
+def post_worker_init(worker):
+    """Start this worker's services once the app is loaded."""
+    from gpt_cursor_runner.main import start_services
+    from gpt_cursor_runner.patch_outbox import set_local_dispatch
+
+    primary = _election.try_acquire()
+    set_local_dispatch(primary)
+    start_services(worker=True, host_wide=primary)
+    if primary:
+        print(f"👑 Worker {os.getpid()} (slot {worker.slot}) runs host-wide services")
+    else:
+        threading.Thread(
+            target=_watch_primary, args=(PRIMARY_RETRY_SECONDS,), daemon=True, name="primary-election"
+        ).start()
+
+
+def worker_exit(server, worker):
+    """Drain and stop this worker's services after in-flight requests finish."""
+    from gpt_cursor_runner.main import stop_services
+
+    _stop_event.set()
+    stop_services()
+    _election.release()
+
+
+if BaseApplication is not None:
+
+    class RunnerApplication(BaseApplication):
+        """Gunicorn application serving the runner's Flask or ASGI app."""
+
+        def __init__(self, options: Dict[str, Any], asgi: bool = False):
+            self.options = options
+            self.asgi = asgi
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+            for hook in (pre_fork, post_fork, post_worker_init, worker_exit):
+                self.cfg.set(hook.__name__, hook)
+
+        def load(self):
+            if self.asgi:
+                from gpt_cursor_runner.asgi_app import create_asgi_app
+
+                return create_asgi_app()
+            from gpt_cursor_runner.main import app
+
+            return app
+
+
+def _uvicorn_worker_class() -> Optional[str]:
+    try:
+        import uvicorn_worker  # noqa: F401
+
+        return "uvicorn_worker.UvicornWorker"
+    except ImportError:
+        pass
+    try:
+        import uvicorn  # noqa: F401
+
+        return "uvicorn.workers.UvicornWorker"
+    except ImportError:
+        return None
+
+
+def serve(bind: str, workers: int = 1, threads: int = 8, timeout: int = 60,
+          graceful_timeout: int = 30, asgi: bool = False) -> int:
+    """Run the app under gunicorn until it is stopped.
+
+    With ``asgi`` the async ingestion routes run on uvicorn workers, one
+    event loop per worker (``threads`` does not apply); otherwise the Flask
+    app runs on gthread workers.
+    """
+    if BaseApplication is None:
+        print("❌ Serve mode requires gunicorn: pip install gunicorn")
+        return 1
+    worker_class = "gthread"
+    if asgi:
+        worker_class = _uvicorn_worker_class()
+        if worker_class is None:
+            print("❌ ASGI serve mode requires uvicorn: pip install uvicorn starlette httpx")
+            return 1
+
+    concurrency = f"{workers} uvicorn workers" if asgi else f"{workers} workers x {threads} threads"
+    print(f"🚀 Serving GPT-Cursor Runner on {bind} ({concurrency})")
+    RunnerApplication({
+        "bind": bind,
+        "workers": workers,
+        "threads": threads,
+        "worker_class": worker_class,
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        # Import the app in each worker so singletons are built after fork
+        "preload_app": False,
+        "accesslog": "-",
+    }, asgi=asgi).run()
+    return 0
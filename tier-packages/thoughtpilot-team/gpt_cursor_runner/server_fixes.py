@@ -9,7 +9,6 @@ import threading
 import time
 import socket
 import subprocess
-import psutil
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
@@ -18,6 +17,10 @@ import logging
 import os
 import signal
 
+from .scheduler import get_scheduler
+from .metrics_sampler import get_metrics_sampler
+from .process_table import get_process_table
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,8 +79,6 @@ class ServerFixes:
         self.fix_strategies: List[FixStrategy] = []
         self.active_fixes: Dict[str, Dict[str, Any]] = {}
         self._lock = threading.Lock()
-        self._fix_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         
         # Register default fix strategies
         self._register_default_strategies()
@@ -152,31 +153,19 @@ class ServerFixes:
         ]
     
     def start(self):
-        """Start the server fixes background thread."""
-        if self._fix_thread is None or not self._fix_thread.is_alive():
-            self._stop_event.clear()
-            self._fix_thread = threading.Thread(target=self._fix_loop, daemon=True)
-            self._fix_thread.start()
-            logger.info("Server fixes started")
+        """Schedule server fixes on the shared scheduler."""
+        get_scheduler().add_job("server_fixes", self._fix_cycle, 60)  # Check every minute
+        logger.info("Server fixes started")
     
     def stop(self):
-        """Stop the server fixes background thread."""
-        self._stop_event.set()
-        if self._fix_thread and self._fix_thread.is_alive():
-            self._fix_thread.join(timeout=5)
+        """Remove server fixes from the shared scheduler."""
+        if get_scheduler().remove_job("server_fixes"):
             logger.info("Server fixes stopped")
     
-    def _fix_loop(self):
-        """Background loop for server fixes."""
-        while not self._stop_event.is_set():
-            try:
-                self._check_for_issues()
-                self._apply_fixes()
-            except Exception as e:
-                logger.error(f"Error in server fixes loop: {e}")
-            
-            # Wait before next check cycle
-            self._stop_event.wait(60)  # Check every minute
+    def _fix_cycle(self):
+        """Run one cycle of server fixes."""
+        self._check_for_issues()
+        self._apply_fixes()
     
     def _check_for_issues(self):
         """Check for common server issues."""
@@ -210,18 +199,18 @@ class ServerFixes:
     
     def _check_memory_usage(self):
         """Check memory usage."""
-        memory = psutil.virtual_memory()
-        if memory.percent > 90:
+        memory_percent = get_metrics_sampler().get_snapshot().memory['percent']
+        if memory_percent > 90:
             self._record_issue(
                 ServerIssue.MEMORY_LEAK,
-                f"High memory usage: {memory.percent}%",
+                f"High memory usage: {memory_percent}%",
                 ["system", "memory"],
                 "critical"
             )
     
     def _check_cpu_usage(self):
         """Check CPU usage."""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = get_metrics_sampler().get_snapshot().cpu_percent
         if cpu_percent > 80:
             self._record_issue(
                 ServerIssue.HIGH_CPU,
@@ -232,11 +221,11 @@ class ServerFixes:
     
     def _check_disk_space(self):
         """Check disk space."""
-        disk = psutil.disk_usage('/')
-        if disk.percent > 90:
+        disk_percent = get_metrics_sampler().get_snapshot().disk['percent']
+        if disk_percent > 90:
             self._record_issue(
                 ServerIssue.DISK_FULL,
-                f"Low disk space: {disk.percent}% used",
+                f"Low disk space: {disk_percent:.1f}% used",
                 ["system", "disk"],
                 "critical"
             )
@@ -244,18 +233,15 @@ class ServerFixes:
     def _check_process_health(self):
         """Check process health."""
         # Check for hanging processes
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-            try:
-                if proc.info['cpu_percent'] > 50:
-                    # Process might be hanging
-                    self._record_issue(
-                        ServerIssue.PROCESS_HANG,
-                        f"High CPU process: {proc.info['name']} (PID: {proc.info['pid']})",
-                        ["process", "cpu"],
-                        "medium"
-                    )
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        for process in get_process_table().snapshot().processes:
+            if process.cpu_percent > 50:
+                # Process might be hanging
+                self._record_issue(
+                    ServerIssue.PROCESS_HANG,
+                    f"High CPU process: {process.name} (PID: {process.pid})",
+                    ["process", "cpu"],
+                    "medium"
+                )
     
     def _is_port_available(self, port: int) -> bool:
         """Check if a port is available."""
@@ -494,8 +480,14 @@ class ServerFixes:
 
 
 # Global server fixes instance
-server_fixes = ServerFixes()
+_server_fixes: Optional[ServerFixes] = None
+_server_fixes_lock = threading.Lock()
+
 
 def get_server_fixes() -> ServerFixes:
-    """Get the global server fixes instance."""
-    return server_fixes 
\ No newline at end of file
+    """Get the global server fixes instance, creating it on first use."""
+    global _server_fixes
+    with _server_fixes_lock:
+        if _server_fixes is None:
+            _server_fixes = ServerFixes()
+        return _server_fixes
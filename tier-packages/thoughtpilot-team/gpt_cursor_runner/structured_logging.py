@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Structured Logging for GPT-Cursor Runner.
+
+Provides JSON request logging for the webhook path: leveled records with
+structured fields, per-route sampling, payload hashing/truncation, header
+redaction and a bounded, non-blocking queue handler so request threads never
+wait on stdout.
+"""
+
+import sys
+import json
+import queue
+import random
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional, Union
+
+REQUEST_LOGGER = "gpt_cursor_runner.requests"
+
+PAYLOAD_TRUNCATE = "truncate"
+PAYLOAD_HASH = "hash"
+PAYLOAD_OMIT = "omit"
+
+REDACTED = "[redacted]"
+
+_STANDARD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and fields."""
+
+    def __init__(self, max_field_length: int = 256):
+        super().__init__()
+        self.max_field_length = max_field_length
+
+    def _clip(self, value: Any) -> Any:
+        if isinstance(value, str) and len(value) > self.max_field_length:
+            return value[:self.max_field_length] + f"...(+{len(value) - self.max_field_length})"
+        return value
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key not in entry and not key.startswith("_"):
+                entry[key] = self._clip(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RouteSampler(logging.Filter):
+    """Keep a fraction of sub-warning records per ``route`` field."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.default_rate = float(self.rates.pop("default", 1.0))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "route", None), self.default_rate)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when full."""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RequestLogging:
+    """Owns the request logger's queue, listener and settings."""
+
+    def __init__(self, settings: Dict[str, Any], stream=None):
+        self.settings = settings
+        self.payload_mode = settings.get("payload_mode", PAYLOAD_HASH)
+        self.max_field_length = int(settings.get("max_field_length", 256))
+        self.redact_headers = {name.lower() for name in settings.get("redact_headers", [])}
+
+        self.queue: "queue.Queue" = queue.Queue(maxsize=int(settings.get("queue_size", 10000)))
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.handler.addFilter(RouteSampler(settings.get("sample_rates")))
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        if settings.get("format", "json") == "json":
+            output.setFormatter(JsonFormatter(self.max_field_length))
+        else:
+            output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        self.listener = QueueListener(self.queue, output, respect_handler_level=False)
+
+        self.logger = logging.getLogger(REQUEST_LOGGER)
+        self.logger.setLevel(str(settings.get("level", "INFO")).upper())
+        self.logger.propagate = False
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self.handler)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        self.listener.stop()
+        self.logger.removeHandler(self.handler)
+
+    def payload(self, body: Union[bytes, str, None]) -> Dict[str, Any]:
+        """Loggable summary of a request payload."""
+        if body is None:
+            return {"size": 0}
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        summary: Dict[str, Any] = {"size": len(data)}
+        if self.payload_mode == PAYLOAD_HASH:
+            summary["sha256"] = hashlib.sha256(data).hexdigest()[:16]
+        elif self.payload_mode == PAYLOAD_TRUNCATE:
+            summary["preview"] = data[:self.max_field_length].decode("utf-8", "replace")
+        return summary
+
+    def headers(self, headers) -> Dict[str, str]:
+        """Headers with secrets redacted."""
+        return {
+            name: REDACTED if name.lower() in self.redact_headers else value
+            for name, value in dict(headers).items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "level": logging.getLevelName(self.logger.level),
+            "payload_mode": self.payload_mode,
+        }
+
+
+_request_logging: Optional[RequestLogging] = None
+_request_logging_lock = threading.Lock()
+
+
+def get_request_logging() -> RequestLogging:
+    """Get the request logging pipeline, configuring it on first use."""
+    global _request_logging
+    with _request_logging_lock:
+        if _request_logging is None:
+            from .config_manager import config_manager
+            _request_logging = RequestLogging(config_manager.get_logging_config())
+        return _request_logging
+
+
+def shutdown_request_logging():
+    """Flush and stop the request logging pipeline if it was configured."""
+    global _request_logging
+    with _request_logging_lock:
+        request_logging, _request_logging = _request_logging, None
+    if request_logging is not None:
+        request_logging.stop()
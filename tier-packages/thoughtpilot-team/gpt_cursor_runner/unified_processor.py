@@ -5,14 +5,24 @@ Unified Processor Module for GHOST 2.0.
 Handles different types of requests through a unified processing interface.
 """
 
+import os
+import asyncio
+import heapq
+import itertools
+import math
+import random
 import threading
 import time
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, FrozenSet, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from queue import Queue, Empty
+from queue import Full
+
+from .worker_pool import ElasticWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +54,20 @@ class ProcessingRequest:
     request_id: str
     request_type: RequestType
     data: Dict[str, Any]
+    # When the request was last queued; reset on each retry
     timestamp: datetime
     priority: int = 1
-    timeout: int = 30
+    timeout: float = 30
     retry_count: int = 0
     max_retries: int = 3
+    # time.monotonic() after which the request is dropped if still queued
+    deadline: Optional[float] = None
+    # When the request was first submitted (defaults to ``timestamp``)
+    submitted_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.submitted_at is None:
+            self.submitted_at = self.timestamp
 
 
 @dataclass
@@ -61,22 +80,431 @@ class ProcessingResult:
     processing_time: float = 0.0
     timestamp: datetime = None
 
+    @property
+    def finished(self) -> bool:
+        return self.status in (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED, ProcessingStatus.TIMEOUT)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'request_id': self.request_id,
+            'status': self.status.value,
+            'result': self.result,
+            'error': self.error,
+            'processing_time': self.processing_time,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+        }
+
+
+class ResultStore:
+    """Request results kept for ``ttl`` seconds since last use, at most ``max_results``.
+
+    Entries are kept in least-recently-used order, so both limits evict
+    from the front.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_results: int = 1000):
+        self.ttl = ttl
+        self.max_results = max_results
+        self._entries: "OrderedDict[str, Tuple[float, ProcessingResult]]" = OrderedDict()
+        self.evicted = 0
+
+    def put(self, result: ProcessingResult):
+        self._entries[result.request_id] = (time.monotonic(), result)
+        self._entries.move_to_end(result.request_id)
+        self._evict()
+
+    def get(self, request_id: str) -> Optional[ProcessingResult]:
+        self._evict()
+        entry = self._entries.get(request_id)
+        if entry is None:
+            return None
+        self._entries[request_id] = (time.monotonic(), entry[1])
+        self._entries.move_to_end(request_id)
+        return entry[1]
+
+    def _evict(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            request_id, (touched, _) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_results and touched >= cutoff:
+                break
+            del self._entries[request_id]
+            self.evicted += 1
+
+    def values(self) -> List[ProcessingResult]:
+        return [result for _, result in self._entries.values()]
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RequestError(Exception):
+    """A request failure, flagged as worth retrying or not."""
+    
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+# Exceptions that mean the request itself is bad, so retrying can't help
+TERMINAL_ERRORS = (ValueError, TypeError, KeyError, NotImplementedError)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed request may succeed if tried again."""
+    if isinstance(error, RequestError):
+        return error.retryable
+    return not isinstance(error, TERMINAL_ERRORS)
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how soon failed requests of one type are retried."""
+    max_retries: int = 3
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+
+    def delay(self, attempt: int) -> float:
+        """Jittered exponential backoff before retry number ``attempt`` (1-based)."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempt - 1)))
+        return random.uniform(delay / 2, delay)
+
+
+DEFAULT_RETRY_POLICIES: Dict[RequestType, RetryPolicy] = {
+    RequestType.WEBHOOK: RetryPolicy(max_retries=3, backoff_base=2.0, backoff_max=60.0),
+    RequestType.PATCH: RetryPolicy(max_retries=3, backoff_base=2.0, backoff_max=60.0),
+    RequestType.SUMMARY: RetryPolicy(max_retries=3, backoff_base=2.0, backoff_max=60.0),
+    # Slack wants an answer within seconds, so retry quickly or not at all
+    RequestType.SLACK_COMMAND: RetryPolicy(max_retries=2, backoff_base=0.5, backoff_max=2.0),
+    RequestType.SLACK_EVENT: RetryPolicy(max_retries=2, backoff_base=0.5, backoff_max=2.0),
+    # Checks are re-run on their own schedule anyway
+    RequestType.HEALTH_CHECK: RetryPolicy(max_retries=0),
+    RequestType.RESOURCE_CHECK: RetryPolicy(max_retries=0),
+    RequestType.PROCESS_CHECK: RetryPolicy(max_retries=0),
+}
+
+
+# Relative share of workers each request type gets when several are queued
+DEFAULT_TYPE_WEIGHTS: Dict[RequestType, float] = {
+    RequestType.WEBHOOK: 4,
+    RequestType.PATCH: 4,
+    RequestType.SUMMARY: 2,
+    RequestType.SLACK_COMMAND: 2,
+    RequestType.SLACK_EVENT: 1,
+    RequestType.HEALTH_CHECK: 1,
+    RequestType.RESOURCE_CHECK: 1,
+    RequestType.PROCESS_CHECK: 1,
+}
+
+# Maximum requests of a type in flight at once (types not listed are bounded by the workers)
+DEFAULT_TYPE_CONCURRENCY: Dict[RequestType, int] = {
+    RequestType.HEALTH_CHECK: 1,
+    RequestType.RESOURCE_CHECK: 1,
+    RequestType.PROCESS_CHECK: 1,
+}
+
+
+# Handlers that mostly burn CPU (patch matching and application); the rest
+# mostly wait on I/O (Slack, forwarding, summary writes) and get their own pool
+CPU_BOUND_TYPES: FrozenSet[RequestType] = frozenset({RequestType.PATCH, RequestType.WEBHOOK})
+IO_BOUND_TYPES: FrozenSet[RequestType] = frozenset(set(RequestType) - CPU_BOUND_TYPES)
+
+
+def _coerce_limits(priority: Any, timeout: Any) -> Tuple[int, float]:
+    """Validate a request's priority and timeout (e.g. from JSON) as an int and a positive float.
+    
+    Raises ValueError for anything else, so no request with incomparable
+    values ever reaches a queue heap.
+    """
+    if isinstance(priority, bool) or isinstance(timeout, bool):
+        raise ValueError("priority and timeout must be numbers")
+    try:
+        priority = int(priority)
+        timeout = float(timeout)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid priority/timeout: {priority!r}/{timeout!r}")
+    if not math.isfinite(timeout) or timeout <= 0:
+        raise ValueError(f"Timeout must be a positive number of seconds, got {timeout!r}")
+    return priority, timeout
+
+
+def _concurrency_key(request: ProcessingRequest) -> Optional[Tuple[str, str]]:
+    """Resource a request needs exclusively; patches to the same file never run concurrently."""
+    if request.request_type in (RequestType.PATCH, RequestType.WEBHOOK):
+        target_file = request.data.get('target_file')
+        if target_file:
+            return ('target_file', target_file)
+    return None
+
+
+class FairRequestQueue:
+    """Bounded request queue with priorities, weighted fairness and concurrency caps.
+
+    Each request type has its own heap ordered by ``(priority, deadline)``:
+    lower priority numbers first, then earliest deadline. ``get`` serves the
+    lowest priority band queued; within a band, types take turns in
+    proportion to their weight (stride scheduling). Types at their
+    concurrency cap are passed over, as are requests whose concurrency key
+    (e.g. a patch's ``target_file``) is held by a running request. Requests
+    whose deadline passes while queued are dropped and handed to
+    ``on_expired``.
+
+    Workers must call ``done`` for every request returned by ``get``.
+    """
+
+    def __init__(self, maxsize: int = 100, weights: Optional[Dict[RequestType, float]] = None,
+                 concurrency: Optional[Dict[RequestType, int]] = None,
+                 on_expired: Optional[Callable[[ProcessingRequest], None]] = None):
+        self.maxsize = maxsize
+        self.weights = {**DEFAULT_TYPE_WEIGHTS, **(weights or {})}
+        self.concurrency = {**DEFAULT_TYPE_CONCURRENCY, **(concurrency or {})}
+        self.on_expired = on_expired
+        self._heaps: Dict[RequestType, list] = defaultdict(list)
+        self._pass: Dict[RequestType, float] = defaultdict(float)
+        self._virtual_time = 0.0
+        self._running: Dict[RequestType, int] = defaultdict(int)
+        self._busy_keys: Set[Tuple[str, str]] = set()
+        self._size = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stats: Dict[RequestType, Dict[str, float]] = defaultdict(
+            lambda: {'enqueued': 0, 'dequeued': 0, 'expired': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+        )
+
+    def qsize(self) -> int:
+        with self._cond:
+            return self._size
+    
+    def depth(self, types: Optional[FrozenSet[RequestType]] = None) -> int:
+        """Requests queued, optionally only those of the given types."""
+        with self._cond:
+            if types is None:
+                return self._size
+            return sum(len(heap) for request_type, heap in self._heaps.items() if request_type in types)
+
+    def put(self, request: ProcessingRequest, block: bool = True, timeout: Optional[float] = None):
+        """Queue a request; raises ``queue.Full`` if there's no room in time.
+        
+        Raises ValueError if the request's priority or timeout isn't numeric.
+        """
+        request.priority, request.timeout = _coerce_limits(request.priority, request.timeout)
+        if request.deadline is not None:
+            request.deadline = float(request.deadline)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._size < self.maxsize, timeout if block else 0):
+                raise Full
+            now = time.monotonic()
+            if request.deadline is None:
+                request.deadline = now + request.timeout
+            request_type = request.request_type
+            heap = self._heaps[request_type]
+            if not heap:
+                # A type coming back from idle doesn't get credit for the time it was away
+                self._pass[request_type] = max(self._pass[request_type], self._virtual_time)
+            heapq.heappush(heap, (request.priority, request.deadline, next(self._seq), now, request))
+            self._size += 1
+            self._stats[request_type]['enqueued'] += 1
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None,
+            types: Optional[FrozenSet[RequestType]] = None) -> Optional[ProcessingRequest]:
+        """The next request to run, or None if none became runnable within ``timeout``.
+        
+        With ``types``, only requests of those types are considered.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            expired: List[ProcessingRequest] = []
+            with self._cond:
+                request = self._pick(expired, types)
+                if request is None and not expired:
+                    remaining = None if end is None else end - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+                    continue
+            for expired_request in expired:
+                if self.on_expired:
+                    self.on_expired(expired_request)
+            if request is not None:
+                return request
+
+    def done(self, request: ProcessingRequest):
+        """Release the concurrency slot (and key) held by a request from ``get``."""
+        with self._cond:
+            self._running[request.request_type] -= 1
+            key = _concurrency_key(request)
+            if key is not None:
+                self._busy_keys.discard(key)
+            self._cond.notify_all()
+
+    def _pick(self, expired: List[ProcessingRequest],
+              types: Optional[FrozenSet[RequestType]] = None) -> Optional[ProcessingRequest]:
+        now = time.monotonic()
+        candidates = []
+        for request_type, heap in self._heaps.items():
+            while heap and heap[0][1] <= now:
+                expired.append(heapq.heappop(heap)[-1])
+                self._size -= 1
+                self._stats[request_type]['expired'] += 1
+            if not heap or (types is not None and request_type not in types):
+                continue
+            limit = self.concurrency.get(request_type)
+            if limit is not None and self._running[request_type] >= limit:
+                continue
+            candidates.append(request_type)
+        if expired:
+            self._cond.notify_all()
+        
+        for request_type in sorted(candidates, key=lambda t: (self._heaps[t][0][0], self._pass[t])):
+            entry = self._pop_runnable(self._heaps[request_type])
+            if entry is None:
+                continue
+            request = entry[-1]
+            self._size -= 1
+            self._running[request_type] += 1
+            key = _concurrency_key(request)
+            if key is not None:
+                self._busy_keys.add(key)
+            self._virtual_time = max(self._virtual_time, self._pass[request_type])
+            self._pass[request_type] += 1.0 / self.weights.get(request_type, 1)
+            
+            stats = self._stats[request_type]
+            wait = now - entry[3]
+            stats['dequeued'] += 1
+            stats['wait_total'] += wait
+            stats['wait_max'] = max(stats['wait_max'], wait)
+            self._cond.notify_all()
+            return request
+        return None
+
+    def _pop_runnable(self, heap: list):
+        """Pop the best entry whose concurrency key is free, leaving the rest queued."""
+        skipped = []
+        found = None
+        while heap:
+            entry = heapq.heappop(heap)
+            key = _concurrency_key(entry[-1])
+            if key is None or key not in self._busy_keys:
+                found = entry
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and queue wait time per request type."""
+        with self._cond:
+            result = {}
+            for request_type in RequestType:
+                stats = self._stats[request_type]
+                dequeued = stats['dequeued']
+                result[request_type.value] = {
+                    'depth': len(self._heaps[request_type]),
+                    'in_flight': self._running[request_type],
+                    'weight': self.weights.get(request_type, 1),
+                    'max_concurrent': self.concurrency.get(request_type),
+                    'enqueued': stats['enqueued'],
+                    'dequeued': dequeued,
+                    'expired': stats['expired'],
+                    'avg_wait_ms': round(stats['wait_total'] / dequeued * 1000, 2) if dequeued else 0.0,
+                    'max_wait_ms': round(stats['wait_max'] * 1000, 2)
+                }
+            return result
+
+
+class DelayedRetryQueue:
+    """Timer heap that hands requests back to the request queue once their backoff expires."""
+    
+    def __init__(self, target: FairRequestQueue):
+        self.target = target
+        self._heap: List[Tuple[float, int, ProcessingRequest]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+    
+    def start(self):
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="processor-retries")
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the timer thread; retries still waiting are dropped."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread:
+            thread.join(timeout=5)
+    
+    def schedule(self, request: ProcessingRequest, delay: float):
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), request))
+            self._cond.notify_all()
+    
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+    
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    delay = self._heap[0][0] - time.monotonic() if self._heap else None
+                    if delay is not None and delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._stopping:
+                    return
+                _, _, request = heapq.heappop(self._heap)
+            try:
+                self.target.put(request, timeout=1)
+            except Full:
+                # Queue is saturated; try again shortly rather than block the timer
+                self.schedule(request, 1.0)
+
 
 class UnifiedProcessor:
     """Unified processor for handling different types of requests."""
     
-    def __init__(self, max_workers: int = 4, queue_size: int = 100):
-        self.max_workers = max_workers
-        self.request_queue: Queue = Queue(maxsize=queue_size)
-        self.results: Dict[str, ProcessingResult] = {}
-        self.workers: List[threading.Thread] = []
-        self._stop_event = threading.Event()
+    def __init__(self, io_workers: Tuple[int, int] = (2, 16),
+                 cpu_workers: Optional[Tuple[int, int]] = None,
+                 worker_idle_timeout: float = 30.0, queue_size: int = 100,
+                 result_ttl: float = 3600.0, max_results: int = 1000,
+                 retry_policies: Optional[Dict[RequestType, RetryPolicy]] = None,
+                 dead_letter_size: int = 200):
+        self.request_queue = FairRequestQueue(maxsize=queue_size, on_expired=self._expire_request)
+        self.retry_queue = DelayedRetryQueue(self.request_queue)
+        self.retry_policies = {**DEFAULT_RETRY_POLICIES, **(retry_policies or {})}
+        self.dead_letters: deque = deque(maxlen=dead_letter_size)
+        self.results = ResultStore(ttl=result_ttl, max_results=max_results)
+        # Completion futures for requests that haven't finished yet
+        self._futures: Dict[str, Future] = {}
+        self._request_ids = itertools.count(1)
+        cpu_workers = cpu_workers or (1, os.cpu_count() or 2)
+        self.pools: Dict[str, ElasticWorkerPool] = {
+            'io': self._make_pool('io', IO_BOUND_TYPES, io_workers, worker_idle_timeout),
+            'cpu': self._make_pool('cpu', CPU_BOUND_TYPES, cpu_workers, worker_idle_timeout)
+        }
+        self._running = False
         self._lock = threading.Lock()
         self._request_handlers: Dict[RequestType, Callable] = {}
         self._stats = {
             'total_requests': 0,
             'completed_requests': 0,
             'failed_requests': 0,
+            'timed_out_requests': 0,
+            'retried_requests': 0,
+            'dead_lettered_requests': 0,
             'average_processing_time': 0.0
         }
         
@@ -96,37 +524,83 @@ class UnifiedProcessor:
             RequestType.PROCESS_CHECK: self._handle_process_check
         }
     
+    def _make_pool(self, name: str, types: FrozenSet[RequestType],
+                   bounds: Tuple[int, int], idle_timeout: float) -> ElasticWorkerPool:
+        """A worker pool serving the given request types from the shared queue."""
+        min_workers, max_workers = bounds
+        return ElasticWorkerPool(
+            f"processor-{name}",
+            fetch=lambda timeout: self.request_queue.get(timeout=timeout, types=types),
+            process=self._run_request,
+            depth=lambda: self.request_queue.depth(types),
+            min_workers=min_workers,
+            max_workers=max_workers,
+            idle_timeout=idle_timeout
+        )
+    
+    def _pool_for(self, request_type: RequestType) -> ElasticWorkerPool:
+        return self.pools['cpu' if request_type in CPU_BOUND_TYPES else 'io']
+    
     def start(self):
-        """Start the unified processor workers."""
-        if not self.workers:
-            self._stop_event.clear()
-            for i in range(self.max_workers):
-                worker = threading.Thread(target=self._worker_loop, daemon=True, name=f"processor-{i}")
-                worker.start()
-                self.workers.append(worker)
-            logger.info(f"Unified processor started with {self.max_workers} workers")
+        """Start the unified processor worker pools."""
+        if self._running:
+            return
+        self._running = True
+        for pool in self.pools.values():
+            pool.start()
+        self.retry_queue.start()
+        logger.info("Unified processor started (" + ", ".join(
+            f"{name}: {pool.min_workers}-{pool.max_workers} workers" for name, pool in self.pools.items()) + ")")
+        self._start_patch_pool()
     
     def stop(self):
-        """Stop the unified processor workers."""
-        self._stop_event.set()
-        for worker in self.workers:
-            if worker.is_alive():
-                worker.join(timeout=5)
-        self.workers.clear()
+        """Stop the unified processor worker pools."""
+        self._running = False
+        self.retry_queue.stop()
+        for pool in self.pools.values():
+            pool.stop()
+        try:
+            from gpt_cursor_runner.patch_pool import shutdown_patch_pool
+            shutdown_patch_pool()
+        except Exception as e:
+            logger.error(f"Error stopping patch pool: {e}")
         logger.info("Unified processor stopped")
     
-    def _worker_loop(self):
-        """Worker thread loop for processing requests."""
-        while not self._stop_event.is_set():
-            try:
-                # Get request from queue with timeout
-                request = self.request_queue.get(timeout=1)
-                self._process_request(request)
-                self.request_queue.task_done()
-            except Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error in worker loop: {e}")
+    def _start_patch_pool(self):
+        """Pre-warm the patch process pool when patches run out of process."""
+        try:
+            from gpt_cursor_runner.patch_pool import EXECUTION_PROCESS, execution_mode, get_patch_pool
+            if execution_mode() == EXECUTION_PROCESS:
+                threading.Thread(target=get_patch_pool().start, daemon=True, name="patch-pool-warmup").start()
+        except Exception as e:
+            logger.error(f"Error starting patch pool: {e}")
+    
+    def _run_request(self, request: ProcessingRequest):
+        """Process a request taken from the queue and release its slot."""
+        try:
+            self._process_request(request)
+        finally:
+            self.request_queue.done(request)
+    
+    def _expire_request(self, request: ProcessingRequest):
+        """Record a request that passed its deadline before a worker picked it up."""
+        with self._lock:
+            self._stats['timed_out_requests'] += 1
+        self._finish(ProcessingResult(
+            request_id=request.request_id,
+            status=ProcessingStatus.TIMEOUT,
+            error=f"Not started within {request.timeout}s",
+            timestamp=datetime.now()
+        ))
+        logger.warning(f"Request {request.request_id} timed out in queue")
+    
+    def _finish(self, result: ProcessingResult):
+        """Store a result and, once it is final, resolve the request's future."""
+        with self._lock:
+            self.results.put(result)
+            future = self._futures.pop(result.request_id, None) if result.finished else None
+        if future is not None and not future.done():
+            future.set_result(result)
     
     def _process_request(self, request: ProcessingRequest):
         """Process a single request."""
@@ -134,12 +608,11 @@ class UnifiedProcessor:
         
         try:
             # Update request status
-            with self._lock:
-                self.results[request.request_id] = ProcessingResult(
-                    request_id=request.request_id,
-                    status=ProcessingStatus.PROCESSING,
-                    timestamp=datetime.now()
-                )
+            self._finish(ProcessingResult(
+                request_id=request.request_id,
+                status=ProcessingStatus.PROCESSING,
+                timestamp=datetime.now()
+            ))
             
             # Get handler for request type
             handler = self._request_handlers.get(request.request_type)
@@ -148,45 +621,92 @@ class UnifiedProcessor:
             
             # Process request
             result = handler(request.data)
+            if isinstance(result, dict) and result.get('status') == 'error':
+                raise RequestError(result.get('error') or "Handler reported an error",
+                                   retryable=result.get('retryable', True))
             
             # Update result
             processing_time = time.time() - start_time
             with self._lock:
-                self.results[request.request_id] = ProcessingResult(
-                    request_id=request.request_id,
-                    status=ProcessingStatus.COMPLETED,
-                    result=result,
-                    processing_time=processing_time,
-                    timestamp=datetime.now()
-                )
                 self._stats['completed_requests'] += 1
                 self._update_average_processing_time(processing_time)
+            self._finish(ProcessingResult(
+                request_id=request.request_id,
+                status=ProcessingStatus.COMPLETED,
+                result=result,
+                processing_time=processing_time,
+                timestamp=datetime.now()
+            ))
             
             logger.info(f"Request {request.request_id} completed in {processing_time:.2f}s")
             
         except Exception as e:
             processing_time = time.time() - start_time
             error_msg = str(e)
+            retryable = is_retryable(e)
             
-            # Handle retries
-            if request.retry_count < request.max_retries:
+            # Handle retries: back off before trying again so a failing
+            # handler doesn't spin through its retries and crowd out other work
+            if retryable and request.retry_count < request.max_retries:
                 request.retry_count += 1
                 request.timestamp = datetime.now()
-                self.request_queue.put(request)
-                logger.warning(f"Request {request.request_id} failed, retrying ({request.retry_count}/{request.max_retries})")
+                # The retry gets a fresh queue deadline once it is re-queued
+                request.deadline = None
+                delay = self._retry_policy(request.request_type).delay(request.retry_count)
+                with self._lock:
+                    self._stats['retried_requests'] += 1
+                self._finish(ProcessingResult(
+                    request_id=request.request_id,
+                    status=ProcessingStatus.PENDING,
+                    error=error_msg,
+                    processing_time=processing_time,
+                    timestamp=datetime.now()
+                ))
+                self.retry_queue.schedule(request, delay)
+                logger.warning(f"Request {request.request_id} failed, retry {request.retry_count}/{request.max_retries} in {delay:.1f}s: {error_msg}")
             else:
                 # Final failure
                 with self._lock:
-                    self.results[request.request_id] = ProcessingResult(
-                        request_id=request.request_id,
-                        status=ProcessingStatus.FAILED,
-                        error=error_msg,
-                        processing_time=processing_time,
-                        timestamp=datetime.now()
-                    )
                     self._stats['failed_requests'] += 1
+                self._dead_letter(request, error_msg, retryable)
+                self._finish(ProcessingResult(
+                    request_id=request.request_id,
+                    status=ProcessingStatus.FAILED,
+                    error=error_msg,
+                    processing_time=processing_time,
+                    timestamp=datetime.now()
+                ))
                 
-                logger.error(f"Request {request.request_id} failed after {request.max_retries} retries: {error_msg}")
+                if retryable:
+                    logger.error(f"Request {request.request_id} failed after {request.retry_count} retries: {error_msg}")
+                else:
+                    logger.error(f"Request {request.request_id} failed with a non-retryable error: {error_msg}")
+    
+    def _retry_policy(self, request_type: RequestType) -> RetryPolicy:
+        return self.retry_policies.get(request_type) or RetryPolicy()
+    
+    def _dead_letter(self, request: ProcessingRequest, error: str, retryable: bool):
+        """Keep a request that failed for good so it can be inspected later."""
+        with self._lock:
+            self.dead_letters.append({
+                'request_id': request.request_id,
+                'request_type': request.request_type.value,
+                'data': request.data,
+                'priority': request.priority,
+                'attempts': request.retry_count + 1,
+                'error': error,
+                'retryable': retryable,
+                'submitted_at': request.submitted_at.isoformat(),
+                'failed_at': datetime.now().isoformat()
+            })
+            self._stats['dead_lettered_requests'] += 1
+    
+    def get_dead_letters(self, limit: int = 50, request_type: Optional[RequestType] = None) -> List[Dict[str, Any]]:
+        """Requests that failed permanently, newest first."""
+        with self._lock:
+            entries = [entry for entry in reversed(self.dead_letters)
+                       if request_type is None or entry['request_type'] == request_type.value]
+        return entries[:limit]
     
     def _update_average_processing_time(self, new_time: float):
         """Update average processing time."""
@@ -195,10 +715,18 @@ class UnifiedProcessor:
             current_avg = self._stats['average_processing_time']
             self._stats['average_processing_time'] = (current_avg * (completed - 1) + new_time) / completed
     
-    def submit_request(self, request_type: RequestType, data: Dict[str, Any], 
-                      priority: int = 1, timeout: int = 30) -> str:
-        """Submit a request for processing."""
-        request_id = f"{request_type.value}_{int(time.time() * 1000)}"
+    def submit(self, request_type: RequestType, data: Dict[str, Any],
+               priority: int = 1, timeout: float = 30) -> Future:
+        """Submit a request for processing and return a future for its final result.
+        
+        Lower ``priority`` values run first. A request not picked up by a
+        worker within ``timeout`` seconds is dropped with status TIMEOUT.
+        The future resolves to the final ``ProcessingResult`` (completed,
+        failed or timed out) and carries the request's ``request_id``.
+        Raises ValueError if ``priority`` or ``timeout`` isn't numeric.
+        """
+        priority, timeout = _coerce_limits(priority, timeout)
+        request_id = f"{request_type.value}_{int(time.time() * 1000)}_{next(self._request_ids)}"
         
         request = ProcessingRequest(
             request_id=request_id,
@@ -206,41 +734,97 @@ class UnifiedProcessor:
             data=data,
             timestamp=datetime.now(),
             priority=priority,
-            timeout=timeout
+            timeout=timeout,
+            max_retries=self._retry_policy(request_type).max_retries
         )
+        future: Future = Future()
+        future.request_id = request_id
         
+        with self._lock:
+            self._futures[request_id] = future
+            self.results.put(ProcessingResult(
+                request_id=request_id,
+                status=ProcessingStatus.PENDING,
+                timestamp=datetime.now()
+            ))
         try:
             self.request_queue.put(request, timeout=5)
+            self._pool_for(request_type).maybe_grow()
             with self._lock:
                 self._stats['total_requests'] += 1
             logger.info(f"Submitted request {request_id} of type {request_type.value}")
-            return request_id
+            return future
         except Exception as e:
+            with self._lock:
+                self._futures.pop(request_id, None)
             logger.error(f"Failed to submit request {request_id}: {e}")
             raise
     
+    def submit_request(self, request_type: RequestType, data: Dict[str, Any], 
+                      priority: int = 1, timeout: float = 30) -> str:
+        """Submit a request for processing and return its ID (see ``submit``)."""
+        return self.submit(request_type, data, priority, timeout).request_id
+    
+    def get_future(self, request_id: str) -> Optional[Future]:
+        """A future for a request's final result, or None if the request is unknown."""
+        with self._lock:
+            future = self._futures.get(request_id)
+            if future is not None:
+                return future
+            result = self.results.get(request_id)
+        if result is None or not result.finished:
+            return None
+        future = Future()
+        future.request_id = request_id
+        future.set_result(result)
+        return future
+    
     def get_result(self, request_id: str, timeout: float = 10.0) -> Optional[ProcessingResult]:
-        """Get the result of a request."""
-        start_time = time.time()
+        """Wait up to ``timeout`` seconds for a request's final result.
         
-        while time.time() - start_time < timeout:
-            with self._lock:
-                if request_id in self.results:
-                    return self.results[request_id]
-            
-            time.sleep(0.1)
-        
-        return None
+        Returns the latest known result (e.g. still PROCESSING) if the
+        request hasn't finished in time, or None for unknown requests.
+        """
+        future = self.get_future(request_id)
+        if future is not None:
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                pass
+        with self._lock:
+            return self.results.get(request_id)
+    
+    async def get_result_async(self, request_id: str, timeout: float = 10.0) -> Optional[ProcessingResult]:
+        """``get_result`` for coroutines; waits without blocking the event loop."""
+        future = self.get_future(request_id)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                pass
+        with self._lock:
+            return self.results.get(request_id)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get processing statistics."""
         with self._lock:
             stats = self._stats.copy()
             stats['queue_size'] = self.request_queue.qsize()
-            stats['active_workers'] = len([w for w in self.workers if w.is_alive()])
+            stats['queues'] = self.request_queue.get_stats()
+            stats['scheduled_retries'] = len(self.retry_queue)
+            stats['active_workers'] = sum(pool.size for pool in self.pools.values())
+            stats['worker_pools'] = {name: pool.get_stats() for name, pool in self.pools.items()}
             stats['pending_requests'] = len([r for r in self.results.values() 
                                            if r.status == ProcessingStatus.PENDING])
-            return stats
+            stats['retained_results'] = len(self.results)
+            stats['evicted_results'] = self.results.evicted
+        try:
+            from gpt_cursor_runner.patch_pool import EXECUTION_PROCESS, execution_mode, get_patch_pool
+            if execution_mode() == EXECUTION_PROCESS:
+                stats['patch_pool'] = get_patch_pool().get_stats()
+        except Exception:
+            pass
+        return stats
     
     # Request handlers
     def _handle_webhook(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -250,7 +834,7 @@ class UnifiedProcessor:
             result = process_hybrid_block(data)
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_patch(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle patch requests."""
@@ -259,7 +843,7 @@ class UnifiedProcessor:
             result = process_hybrid_block(data)
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_summary(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle summary requests."""
@@ -268,7 +852,7 @@ class UnifiedProcessor:
             result = process_summary(data)
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_slack_command(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle Slack command requests."""
@@ -277,7 +861,7 @@ class UnifiedProcessor:
             result = handle_slack_command(data)
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_slack_event(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle Slack event requests."""
@@ -286,7 +870,7 @@ class UnifiedProcessor:
             result = handle_slack_event(data)
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_health_check(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle health check requests."""
@@ -296,7 +880,7 @@ class UnifiedProcessor:
             result = health_agg.get_health_json()
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_resource_check(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle resource check requests."""
@@ -306,7 +890,7 @@ class UnifiedProcessor:
             result = resource_monitor.get_alerts_json()
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def _handle_process_check(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle process check requests."""
@@ -320,7 +904,7 @@ class UnifiedProcessor:
             }
             return {"status": "success", "result": result}
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "retryable": is_retryable(e)}
     
     def register_handler(self, request_type: RequestType, handler: Callable):
         """Register a custom handler for a request type."""
@@ -329,8 +913,30 @@ class UnifiedProcessor:
 
 
 # Global unified processor instance
-unified_processor = UnifiedProcessor()
+_unified_processor: Optional[UnifiedProcessor] = None
+_unified_processor_lock = threading.Lock()
+
 
 def get_unified_processor() -> UnifiedProcessor:
-    """Get the global unified processor instance."""
-    return unified_processor 
\ No newline at end of file
+    """Get the global unified processor instance, creating it on first use.
+    
+    Results are kept for ``PROCESSOR_RESULT_TTL`` seconds (default 3600)
+    since last use, at most ``PROCESSOR_MAX_RESULTS`` (default 1000).
+    The I/O pool runs ``PROCESSOR_IO_WORKERS_MIN``-``PROCESSOR_IO_WORKERS_MAX``
+    workers (default 2-16), the CPU pool ``PROCESSOR_CPU_WORKERS_MIN``-
+    ``PROCESSOR_CPU_WORKERS_MAX`` (default 1-CPU count); extra workers exit
+    after ``PROCESSOR_WORKER_IDLE_TIMEOUT`` idle seconds (default 30).
+    """
+    global _unified_processor
+    with _unified_processor_lock:
+        if _unified_processor is None:
+            _unified_processor = UnifiedProcessor(
+                io_workers=(int(os.getenv("PROCESSOR_IO_WORKERS_MIN", "2")),
+                            int(os.getenv("PROCESSOR_IO_WORKERS_MAX", "16"))),
+                cpu_workers=(int(os.getenv("PROCESSOR_CPU_WORKERS_MIN", "1")),
+                             int(os.getenv("PROCESSOR_CPU_WORKERS_MAX", str(os.cpu_count() or 2)))),
+                worker_idle_timeout=float(os.getenv("PROCESSOR_WORKER_IDLE_TIMEOUT", "30")),
+                result_ttl=float(os.getenv("PROCESSOR_RESULT_TTL", "3600")),
+                max_results=int(os.getenv("PROCESSOR_MAX_RESULTS", "1000"))
+            )
+        return _unified_processor